@@ -8,14 +8,22 @@
  * Results: 1-3 = Failure, 4-5 = Mixed Success, 6 = Success, Multiple 6s = Critical Success
  */
 
-import { rollSingleDie } from './DiceLibrary.js';
+import {
+    rollSingleDie,
+    dieDistribution,
+    extremeValueDistribution,
+    successCountDistribution,
+    getProbability
+} from './DiceLibrary.js';
+import { getDefaultRng } from './Random.js';
 
 /**
  * Roll a Blades in the Dark dice pool
  * @param {number} numDice - Number of dice to roll (0-6 typically)
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { rolls: number[], result: number, outcome: string, isZeroDice: boolean, isCritical: boolean }
  */
-export function rollBladesDice(numDice) {
+export function rollBladesDice(numDice, rng = getDefaultRng()) {
     if (!Number.isInteger(numDice) || numDice < 0) {
         throw new Error(`Invalid number of dice: ${numDice}. Must be a non-negative integer.`);
     }
@@ -28,14 +36,14 @@ export function rollBladesDice(numDice) {
     if (numDice === 0) {
         // Special case: 0 dice - roll 2 dice and take the lowest
         isZeroDice = true;
-        rolls = [rollSingleDie(6), rollSingleDie(6)];
+        rolls = [rollSingleDie(6, rng), rollSingleDie(6, rng)];
         result = Math.min(...rolls);
         // 0 dice can never be a critical success
         isCritical = false;
     } else {
         // Normal case: roll the specified number of dice and take highest
         for (let i = 0; i < numDice; i++) {
-            rolls.push(rollSingleDie(6));
+            rolls.push(rollSingleDie(6, rng));
         }
         result = Math.max(...rolls);
 
@@ -107,26 +115,38 @@ export function formatBladesRoll(result) {
 
 /**
  * Calculate success probabilities for Blades dice pools
+ * Exact, for any pool size: the highest die decides failure/mixed, the number
+ * of sixes decides success/critical. 0 dice takes the lowest of 2d6 and can
+ * never crit.
  * @param {number} numDice - Number of dice in the pool
  * @returns {Object} - { failure: number, mixed: number, success: number, critical: number }
  */
 export function getBladesProbabilities(numDice) {
-    if (!Number.isInteger(numDice) || numDice < 0 || numDice > 6) {
-        throw new Error(`Invalid number of dice: ${numDice}. Must be 0-6.`);
+    if (!Number.isInteger(numDice) || numDice < 0) {
+        throw new Error(`Invalid number of dice: ${numDice}. Must be a non-negative integer.`);
     }
 
-    // Pre-calculated probabilities (approximate percentages)
-    const probabilities = {
-        0: { failure: 0.75, mixed: 0.22, success: 0.03, critical: 0.00 },
-        1: { failure: 0.50, mixed: 0.33, success: 0.17, critical: 0.00 },
-        2: { failure: 0.25, mixed: 0.44, success: 0.28, critical: 0.03 },
-        3: { failure: 0.13, mixed: 0.45, success: 0.35, critical: 0.07 },
-        4: { failure: 0.06, mixed: 0.42, success: 0.39, critical: 0.13 },
-        5: { failure: 0.03, mixed: 0.37, success: 0.40, critical: 0.20 },
-        6: { failure: 0.02, mixed: 0.33, success: 0.40, critical: 0.25 }
-    };
+    const d6 = dieDistribution(6);
 
-    return probabilities[numDice] || { failure: 1, mixed: 0, success: 0, critical: 0 };
+    if (numDice === 0) {
+        const lowest = extremeValueDistribution(d6, 2, 'lowest');
+        return {
+            failure: getProbability(lowest, 1) + getProbability(lowest, 2) + getProbability(lowest, 3),
+            mixed: getProbability(lowest, 4) + getProbability(lowest, 5),
+            success: getProbability(lowest, 6),
+            critical: 0
+        };
+    }
+
+    const highest = extremeValueDistribution(d6, numDice, 'highest');
+    const sixes = successCountDistribution(d6, numDice, 6, '==');
+
+    return {
+        failure: getProbability(highest, 1) + getProbability(highest, 2) + getProbability(highest, 3),
+        mixed: getProbability(highest, 4) + getProbability(highest, 5),
+        success: getProbability(sixes, 1),
+        critical: Math.max(0, 1 - getProbability(sixes, 0) - getProbability(sixes, 1))
+    };
 }
 
 /**
@@ -7,6 +7,8 @@
  * Provides shuffle, draw, and deck management mechanics.
  */
 
+import { getDefaultRng } from './Random.js';
+
 /**
  * Create a fresh deck from a card array
  * Returns a copy to avoid mutating the original
@@ -24,15 +26,16 @@ export function createDeck(cards) {
  * Shuffle a deck using Fisher-Yates algorithm
  * Mutates the deck array in place for performance
  * @param {Array} deck - Array of cards to shuffle
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Array} - The shuffled deck (same reference, mutated)
  */
-export function shuffleDeck(deck) {
+export function shuffleDeck(deck, rng = getDefaultRng()) {
     if (!Array.isArray(deck)) {
         throw new Error('Deck must be an array');
     }
 
     for (let i = deck.length - 1; i > 0; i--) {
-        const j = Math.floor(Math.random() * (i + 1));
+        const j = rng.nextInt(i + 1);
         [deck[i], deck[j]] = [deck[j], deck[i]];
     }
 
@@ -172,9 +175,10 @@ export function addCardToTop(deck, card) {
  * @param {Array} deck - The deck to add to
  * @param {Array} cards - The cards to add back
  * @param {boolean} [shuffle=true] - Whether to shuffle after adding
+ * @param {Object} [rng] - Random number generator for the shuffle (see Random.js)
  * @returns {Array} - The deck (mutated)
  */
-export function returnCards(deck, cards, shuffle = true) {
+export function returnCards(deck, cards, shuffle = true, rng = getDefaultRng()) {
     if (!Array.isArray(deck)) {
         throw new Error('Deck must be an array');
     }
@@ -185,7 +189,7 @@ export function returnCards(deck, cards, shuffle = true) {
     deck.push(...cards);
 
     if (shuffle) {
-        shuffleDeck(deck);
+        shuffleDeck(deck, rng);
     }
 
     return deck;
@@ -249,3 +253,268 @@ export function dealHands(deck, numHands, cardsPerHand) {
 
     return hands;
 }
+
+// ============================================================================
+// INDEXED DECKS
+// ============================================================================
+//
+// An indexed deck keeps card identity in a shared, frozen card table and only
+// tracks positions:
+//   order    - Uint8Array (up to 256 cards) or Uint16Array permutation of table indices
+//   cursor   - order[cursor] is the top card; order[0..cursor) have been drawn
+//   reversed - Uint32Array bitset by table index (reversible decks only), or null
+// Shuffling k cards, drawing and dealing are O(k) and allocate nothing per card,
+// so millions of shuffle-and-draw simulations are not bound by garbage collection.
+
+/**
+ * Largest card table an indexed deck can use
+ * @type {number}
+ */
+export const MAX_INDEXED_DECK_SIZE = 65536;
+
+/**
+ * Create a shared, immutable card table for indexed decks
+ * @param {Array} cards - Array of card objects
+ * @returns {Array} - Frozen copy of the card array
+ */
+export function createCardTable(cards) {
+    if (!Array.isArray(cards)) {
+        throw new Error('Cards must be an array');
+    }
+    return Object.freeze([...cards]);
+}
+
+/**
+ * Create an indexed deck over a card table, in table order
+ * @param {Array} table - Card table (see createCardTable())
+ * @param {boolean} [reversible=false] - Whether shuffles also pick card orientations
+ * @returns {Object} - { table, order, cursor, reversed }
+ */
+export function createIndexedDeck(table, reversible = false) {
+    if (!Array.isArray(table)) {
+        throw new Error('Card table must be an array');
+    }
+    if (table.length > MAX_INDEXED_DECK_SIZE) {
+        throw new Error(`Too many cards: ${table.length}. Maximum is ${MAX_INDEXED_DECK_SIZE}.`);
+    }
+
+    const Order = table.length <= 256 ? Uint8Array : Uint16Array;
+    const deck = {
+        table,
+        order: new Order(table.length),
+        cursor: 0,
+        reversed: reversible ? new Uint32Array(Math.ceil(table.length / 32)) : null
+    };
+    return resetIndexedDeck(deck);
+}
+
+/**
+ * Put every card back in table order, upright
+ * @param {Object} deck - Indexed deck
+ * @returns {Object} - The deck (mutated)
+ */
+export function resetIndexedDeck(deck) {
+    for (let i = 0; i < deck.order.length; i++) {
+        deck.order[i] = i;
+    }
+    deck.cursor = 0;
+    if (deck.reversed) {
+        deck.reversed.fill(0);
+    }
+    return deck;
+}
+
+/**
+ * Get the number of cards left to draw
+ * @param {Object} deck - Indexed deck
+ * @returns {number} - Remaining cards
+ */
+export function getIndexedDeckSize(deck) {
+    return deck.order.length - deck.cursor;
+}
+
+/**
+ * Shuffle the top count cards: each becomes a uniformly random pick from the
+ * remaining cards (forward Fisher-Yates, stopped after count steps)
+ * Enough for any draw of up to count cards; reversible decks also pick the
+ * orientation of each shuffled card.
+ * @param {Object} deck - Indexed deck
+ * @param {number} count - Number of cards to shuffle onto the top
+ * @param {Object} [rng] - Random number generator (see Random.js)
+ * @returns {Object} - The deck (mutated)
+ */
+export function partialShuffleIndexedDeck(deck, count, rng = getDefaultRng()) {
+    const { order, reversed } = deck;
+    const size = order.length;
+
+    if (!Number.isInteger(count) || count < 0 || count > size - deck.cursor) {
+        throw new Error(`Invalid count: ${count}. Must be between 0 and ${size - deck.cursor}.`);
+    }
+
+    const end = deck.cursor + count;
+    for (let i = deck.cursor; i < end; i++) {
+        const j = i + rng.nextInt(size - i);
+        const card = order[j];
+        order[j] = order[i];
+        order[i] = card;
+
+        if (reversed) {
+            const mask = 1 << (card & 31);
+            if (rng.nextUint32() & 1) {
+                reversed[card >>> 5] |= mask;
+            } else {
+                reversed[card >>> 5] &= ~mask;
+            }
+        }
+    }
+
+    return deck;
+}
+
+/**
+ * Shuffle every remaining card
+ * @param {Object} deck - Indexed deck
+ * @param {Object} [rng] - Random number generator (see Random.js)
+ * @returns {Object} - The deck (mutated)
+ */
+export function shuffleIndexedDeck(deck, rng = getDefaultRng()) {
+    return partialShuffleIndexedDeck(deck, getIndexedDeckSize(deck), rng);
+}
+
+/**
+ * Draw the top card's table index
+ * @param {Object} deck - Indexed deck
+ * @returns {number} - Table index, or -1 if the deck is empty
+ */
+export function drawIndex(deck) {
+    return deck.cursor < deck.order.length ? deck.order[deck.cursor++] : -1;
+}
+
+/**
+ * Look at the top card's table index without drawing it
+ * @param {Object} deck - Indexed deck
+ * @returns {number} - Table index, or -1 if the deck is empty
+ */
+export function peekIndex(deck) {
+    return deck.cursor < deck.order.length ? deck.order[deck.cursor] : -1;
+}
+
+/**
+ * Draw the top card
+ * @param {Object} deck - Indexed deck
+ * @returns {Object|null} - The card from the table, or null if the deck is empty
+ */
+export function drawIndexedCard(deck) {
+    const index = drawIndex(deck);
+    return index === -1 ? null : deck.table[index];
+}
+
+/**
+ * Draw several table indices into a typed array
+ * @param {Object} deck - Indexed deck
+ * @param {number} count - Number of cards to draw
+ * @param {Uint16Array} [out] - Buffer to fill (at least count long)
+ * @returns {Uint16Array} - View of the drawn indices (shorter than count if the deck runs out)
+ */
+export function drawIndices(deck, count, out = null) {
+    if (!Number.isInteger(count) || count < 0) {
+        throw new Error(`Invalid count: ${count}. Must be a non-negative integer.`);
+    }
+
+    out = out || new Uint16Array(count);
+    const drawn = Math.min(count, getIndexedDeckSize(deck));
+    for (let i = 0; i < drawn; i++) {
+        out[i] = deck.order[deck.cursor++];
+    }
+    return out.subarray(0, drawn);
+}
+
+/**
+ * Check whether a card is reversed
+ * @param {Object} deck - Indexed deck
+ * @param {number} index - Table index
+ * @returns {boolean} - True if the deck is reversible and the card is reversed
+ */
+export function isIndexReversed(deck, index) {
+    return deck.reversed !== null && (deck.reversed[index >>> 5] & (1 << (index & 31))) !== 0;
+}
+
+/**
+ * Put the most recently drawn cards back on top, in their original order
+ * @param {Object} deck - Indexed deck
+ * @param {number} [count] - Number of cards to return (defaults to all drawn cards)
+ * @returns {Object} - The deck (mutated)
+ */
+export function returnIndexedCards(deck, count = deck.cursor) {
+    if (!Number.isInteger(count) || count < 0 || count > deck.cursor) {
+        throw new Error(`Invalid count: ${count}. Must be between 0 and ${deck.cursor}.`);
+    }
+    deck.cursor -= count;
+    return deck;
+}
+
+/**
+ * Reverse order[start..end) in place
+ * @param {Uint8Array|Uint16Array} order - Permutation
+ * @param {number} start - First position
+ * @param {number} end - One past the last position
+ */
+function reverseRange(order, start, end) {
+    for (let i = start, j = end - 1; i < j; i++, j--) {
+        const card = order[i];
+        order[i] = order[j];
+        order[j] = card;
+    }
+}
+
+/**
+ * Cut the remaining cards: the top position cards move to the bottom
+ * Done in place by three reversals, without allocating.
+ * @param {Object} deck - Indexed deck
+ * @param {number} position - Number of cards to move (0 to remaining cards)
+ * @returns {Object} - The deck (mutated)
+ */
+export function cutIndexedDeck(deck, position) {
+    const remaining = getIndexedDeckSize(deck);
+    if (!Number.isInteger(position) || position < 0 || position > remaining) {
+        throw new Error(`Invalid cut position: ${position}`);
+    }
+
+    const { order, cursor } = deck;
+    const end = order.length;
+    reverseRange(order, cursor, cursor + position);
+    reverseRange(order, cursor + position, end);
+    reverseRange(order, cursor, end);
+    return deck;
+}
+
+/**
+ * Deal table indices to multiple hands, round-robin style
+ * @param {Object} deck - Indexed deck
+ * @param {number} numHands - Number of hands to deal
+ * @param {number} cardsPerHand - Number of cards per hand
+ * @param {Uint16Array[]} [hands] - Buffers to fill (numHands arrays, each at least cardsPerHand long)
+ * @returns {Uint16Array[]} - One array of table indices per hand
+ */
+export function dealIndexedHands(deck, numHands, cardsPerHand, hands = null) {
+    if (!Number.isInteger(numHands) || numHands < 1) {
+        throw new Error(`Invalid number of hands: ${numHands}`);
+    }
+    if (!Number.isInteger(cardsPerHand) || cardsPerHand < 1) {
+        throw new Error(`Invalid cards per hand: ${cardsPerHand}`);
+    }
+
+    const totalNeeded = numHands * cardsPerHand;
+    const remaining = getIndexedDeckSize(deck);
+    if (remaining < totalNeeded) {
+        throw new Error(`Not enough cards. Need ${totalNeeded}, have ${remaining}`);
+    }
+
+    const result = hands || Array.from({ length: numHands }, () => new Uint16Array(cardsPerHand));
+    for (let i = 0; i < cardsPerHand; i++) {
+        for (let j = 0; j < numHands; j++) {
+            result[j][i] = deck.order[deck.cursor++];
+        }
+    }
+    return result;
+}
@@ -5,29 +5,38 @@
  * Can be used in browser, Node.js, or tests.
  *
  * Provides basic dice mechanics used by all dice rollers.
+ *
+ * Every roller takes an optional rng (see Random.js); without one it uses
+ * getDefaultRng(), which is Math.random() unless a page installs another.
  */
 
+import { RANDOM_BLOCK_SIZE, mathRandomRng, createCryptoRng, getDefaultRng } from './Random.js';
+
+export { RANDOM_BLOCK_SIZE };
+
 /**
  * Roll a single die
  * @param {number} sides - Number of sides on the die
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {number} - Random number between 1 and sides (inclusive)
  * @throws {Error} - If sides is not a positive integer
  */
-export function rollSingleDie(sides) {
+export function rollSingleDie(sides, rng = getDefaultRng()) {
     if (!Number.isInteger(sides) || sides < 1) {
         throw new Error(`Invalid dice sides: ${sides}. Must be a positive integer.`);
     }
-    return Math.floor(Math.random() * sides) + 1;
+    return rng.nextInt(sides) + 1;
 }
 
 /**
  * Roll multiple dice of the same type
  * @param {number} numDice - Number of dice to roll
  * @param {number} diceType - Number of sides per die
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { rolls: number[], total: number }
  * @throws {Error} - If numDice or diceType is invalid
  */
-export function rollDice(numDice, diceType) {
+export function rollDice(numDice, diceType, rng = getDefaultRng()) {
     if (!Number.isInteger(numDice) || numDice < 1) {
         throw new Error(`Invalid number of dice: ${numDice}. Must be a positive integer.`);
     }
@@ -37,7 +46,7 @@ export function rollDice(numDice, diceType) {
 
     const rolls = [];
     for (let i = 0; i < numDice; i++) {
-        rolls.push(rollSingleDie(diceType));
+        rolls.push(rollSingleDie(diceType, rng));
     }
 
     const total = rolls.reduce((sum, roll) => sum + roll, 0);
@@ -49,17 +58,18 @@ export function rollDice(numDice, diceType) {
  * Roll a single exploding die and return detailed breakdown
  * @param {number} diceType - Number of sides on the die
  * @param {string} [mode='standard'] - 'standard' (explode once) or 'compound' (keep exploding)
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { value: number, display: string, breakdown: number[] }
  * @throws {Error} - If diceType is invalid
  */
-export function rollSingleExplodingDie(diceType, mode = 'standard') {
+export function rollSingleExplodingDie(diceType, mode = 'standard', rng = getDefaultRng()) {
     if (!Number.isInteger(diceType) || diceType < 2) {
         throw new Error(`Invalid dice type: ${diceType}. Must be at least 2.`);
     }
 
     const breakdown = [];
     let total = 0;
-    let roll = rollSingleDie(diceType);
+    let roll = rollSingleDie(diceType, rng);
 
     breakdown.push(roll);
     total += roll;
@@ -68,14 +78,14 @@ export function rollSingleExplodingDie(diceType, mode = 'standard') {
     if (mode === 'standard') {
         // Explode only once
         if (roll === diceType) {
-            roll = rollSingleDie(diceType);
+            roll = rollSingleDie(diceType, rng);
             breakdown.push(roll);
             total += roll;
         }
     } else {
         // Compound mode - keep exploding
         while (roll === diceType) {
-            roll = rollSingleDie(diceType);
+            roll = rollSingleDie(diceType, rng);
             breakdown.push(roll);
             total += roll;
         }
@@ -93,9 +103,10 @@ export function rollSingleExplodingDie(diceType, mode = 'standard') {
  * @param {number} numDice - Number of dice to roll
  * @param {number} diceType - Number of sides per die
  * @param {string} [mode='standard'] - 'standard' (explode once) or 'compound' (keep exploding)
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { rolls: number[], total: number, explosions: number }
  */
-export function rollExploding(numDice, diceType, mode = 'standard') {
+export function rollExploding(numDice, diceType, mode = 'standard', rng = getDefaultRng()) {
     if (!Number.isInteger(numDice) || numDice < 1) {
         throw new Error(`Invalid number of dice: ${numDice}`);
     }
@@ -108,13 +119,13 @@ export function rollExploding(numDice, diceType, mode = 'standard') {
 
     for (let i = 0; i < numDice; i++) {
         let dieTotal = 0;
-        let roll = rollSingleDie(diceType);
+        let roll = rollSingleDie(diceType, rng);
         dieTotal += roll;
 
         // Check for explosions
         while (roll === diceType) {
             explosions++;
-            roll = rollSingleDie(diceType);
+            roll = rollSingleDie(diceType, rng);
             dieTotal += roll;
 
             // Standard mode only explodes once
@@ -168,6 +179,32 @@ export function dropDice(rolls, dropCount, dropType = 'lowest') {
     return { keptRolls, droppedRolls, total };
 }
 
+/**
+ * Check one die result against a success threshold
+ * @param {number} roll - The die result
+ * @param {number} threshold - The threshold value
+ * @param {string} comparison - Comparison operator: '>=', '>', '<=', '<', '==' (or '=')
+ * @returns {boolean} - Whether the roll is a success
+ * @throws {Error} - If comparison is not recognised
+ */
+function isSuccessfulRoll(roll, threshold, comparison) {
+    switch (comparison) {
+        case '>=':
+            return roll >= threshold;
+        case '>':
+            return roll > threshold;
+        case '<=':
+            return roll <= threshold;
+        case '<':
+            return roll < threshold;
+        case '==':
+        case '=':
+            return roll === threshold;
+        default:
+            throw new Error(`Invalid comparison: ${comparison}`);
+    }
+}
+
 /**
  * Count successes based on a threshold
  * @param {number[]} rolls - Array of die results
@@ -187,28 +224,7 @@ export function countSuccesses(rolls, threshold, comparison = '>=') {
     const failures = [];
 
     rolls.forEach(roll => {
-        let isSuccess = false;
-
-        switch (comparison) {
-            case '>=':
-                isSuccess = roll >= threshold;
-                break;
-            case '>':
-                isSuccess = roll > threshold;
-                break;
-            case '<=':
-                isSuccess = roll <= threshold;
-                break;
-            case '<':
-                isSuccess = roll < threshold;
-                break;
-            case '==':
-            case '=':
-                isSuccess = roll === threshold;
-                break;
-            default:
-                throw new Error(`Invalid comparison: ${comparison}`);
-        }
+        const isSuccess = isSuccessfulRoll(roll, threshold, comparison);
 
         if (isSuccess) {
             successes.push(roll);
@@ -302,6 +318,7 @@ export function parseDiceNotation(notation) {
  * @param {boolean} [options.countSuccesses=false] - Whether to count successes
  * @param {number} [options.successThreshold=4] - Minimum value for success
  * @param {string} [options.successComparison='>='] - '>=', '==', or '<='
+ * @param {Object} [options.rng] - Random number generator (see Random.js)
  * @returns {Object} - { rolls, keptRolls, droppedRolls, total, successCount }
  * @throws {Error} - If options are invalid
  */
@@ -316,7 +333,8 @@ export function rollDiceWithModifiers(options) {
         dropCount = 1,
         countSuccesses: countSuccessesEnabled = false,
         successThreshold = 4,
-        successComparison = '>='
+        successComparison = '>=',
+        rng = getDefaultRng()
     } = options;
 
     // Validate inputs
@@ -327,17 +345,52 @@ export function rollDiceWithModifiers(options) {
         throw new Error(`Invalid dice type: ${diceType}. Must be a positive integer.`);
     }
 
+    return rollValidatedDice({
+        numDice,
+        diceType,
+        exploding,
+        explodingMode,
+        drop,
+        dropType,
+        dropCount,
+        countSuccesses: countSuccessesEnabled,
+        successThreshold,
+        successComparison
+    }, rng);
+}
+
+/**
+ * Roll dice with modifiers whose options have already been validated
+ * Shared by rollDiceWithModifiers() and compiled dice expressions.
+ * @param {Object} options - Every rollDiceWithModifiers() option, defaults filled in
+ * @param {Object} rng - Random number generator
+ * @returns {Object} - { rolls, keptRolls, droppedRolls, total, successCount }
+ */
+function rollValidatedDice(options, rng) {
+    const {
+        numDice,
+        diceType,
+        exploding,
+        explodingMode,
+        drop,
+        dropType,
+        dropCount,
+        countSuccesses: countSuccessesEnabled,
+        successThreshold,
+        successComparison
+    } = options;
+
     // Step 1: Roll dice (with or without exploding)
     let rolls;
     if (exploding) {
         rolls = [];
         for (let i = 0; i < numDice; i++) {
-            rolls.push(rollSingleExplodingDie(diceType, explodingMode));
+            rolls.push(rollSingleExplodingDie(diceType, explodingMode, rng));
         }
     } else {
         rolls = [];
         for (let i = 0; i < numDice; i++) {
-            const value = rollSingleDie(diceType);
+            const value = rollSingleDie(diceType, rng);
             rolls.push({
                 value: value,
                 display: String(value),
@@ -399,7 +452,7 @@ export function rollDiceWithModifiers(options) {
  * Rolls twice and picks the better (advantage) or worse (disadvantage) result
  *
  * @param {string} mode - 'advantage' or 'disadvantage'
- * @param {Object} rollOptions - Options to pass to rollDiceWithModifiers
+ * @param {Object} rollOptions - Options to pass to rollDiceWithModifiers (including rng)
  * @returns {Object} - { chosenRoll, otherRoll, mode }
  * @throws {Error} - If mode is invalid
  */
@@ -442,3 +495,1232 @@ export function rollWithAdvantage(mode, rollOptions) {
         mode
     };
 }
+
+// ============================================================================
+// PROBABILITY DISTRIBUTIONS
+// ============================================================================
+//
+// Exact probability mass functions (PMFs) for the rolls above. A PMF is
+// { min, probs } where probs[i] is the probability of the value min + i.
+// Sums are built by convolution, keep/drop by a dynamic program over the
+// sorted die faces, and results are memoized by the roll options.
+
+/**
+ * Explosions followed per die before the exploding die is truncated
+ * (the last roll is then taken as-is). The truncated mass is below
+ * sides^-depth, e.g. under 1e-15 for a d6.
+ * @type {number}
+ */
+export const DEFAULT_EXPLOSION_DEPTH = 20;
+
+/**
+ * Number of memoized distributions kept by getRollDistribution() and friends
+ * @type {number}
+ */
+export const DISTRIBUTION_CACHE_SIZE = 128;
+
+// Map iteration order doubles as LRU order (oldest first)
+const distributionCache = new Map();
+
+/**
+ * Return the memoized distribution for key, computing it on a miss
+ * @param {string} key - Cache key describing the roll
+ * @param {Function} compute - Produces the distribution on a miss
+ * @returns {Object} - Shared PMF (do not modify)
+ */
+function memoizeDistribution(key, compute) {
+    const cached = distributionCache.get(key);
+    if (cached) {
+        distributionCache.delete(key);
+        distributionCache.set(key, cached);
+        return cached;
+    }
+
+    const pmf = compute();
+    distributionCache.set(key, pmf);
+    if (distributionCache.size > DISTRIBUTION_CACHE_SIZE) {
+        distributionCache.delete(distributionCache.keys().next().value);
+    }
+    return pmf;
+}
+
+/**
+ * Discard all memoized distributions
+ */
+export function clearDistributionCache() {
+    distributionCache.clear();
+}
+
+/**
+ * Build the distribution of one roll of a die with the given faces, each equally likely
+ * @param {number[]} faces - Integer face values (e.g. [-1, 0, 1] for a Fate die)
+ * @returns {Object} - PMF { min: number, probs: Float64Array }
+ * @throws {Error} - If faces is empty or contains non-integers
+ */
+export function faceDistribution(faces) {
+    if (!Array.isArray(faces) || faces.length === 0) {
+        throw new Error('Faces must be a non-empty array');
+    }
+    if (!faces.every(Number.isInteger)) {
+        throw new Error('Faces must be integers');
+    }
+
+    const min = Math.min(...faces);
+    const probs = new Float64Array(Math.max(...faces) - min + 1);
+    faces.forEach(face => {
+        probs[face - min] += 1 / faces.length;
+    });
+
+    return { min, probs };
+}
+
+/**
+ * Build the distribution of one roll of a standard die (1 to sides)
+ * @param {number} sides - Number of sides on the die
+ * @returns {Object} - PMF { min: 1, probs: Float64Array }
+ * @throws {Error} - If sides is not a positive integer
+ */
+export function dieDistribution(sides) {
+    if (!Number.isInteger(sides) || sides < 1) {
+        throw new Error(`Invalid dice sides: ${sides}. Must be a positive integer.`);
+    }
+    return { min: 1, probs: new Float64Array(sides).fill(1 / sides) };
+}
+
+/**
+ * Build the distribution of one exploding die
+ * Matches rollSingleExplodingDie(): 'standard' explodes at most once; any other
+ * mode keeps exploding, truncated after maxDepth explosions.
+ * @param {number} diceType - Number of sides on the die
+ * @param {string} [mode='standard'] - 'standard' (explode once) or 'compound' (keep exploding)
+ * @param {number} [maxDepth=DEFAULT_EXPLOSION_DEPTH] - Explosions followed in compound mode
+ * @returns {Object} - PMF { min: 1, probs: Float64Array }
+ * @throws {Error} - If diceType or maxDepth is invalid
+ */
+export function explodingDieDistribution(diceType, mode = 'standard', maxDepth = DEFAULT_EXPLOSION_DEPTH) {
+    if (!Number.isInteger(diceType) || diceType < 2) {
+        throw new Error(`Invalid dice type: ${diceType}. Must be at least 2.`);
+    }
+    if (!Number.isInteger(maxDepth) || maxDepth < 0) {
+        throw new Error(`Invalid explosion depth: ${maxDepth}`);
+    }
+
+    const depth = mode === 'standard' ? Math.min(1, maxDepth) : maxDepth;
+    const probs = new Float64Array((depth + 1) * diceType);
+
+    // k explosions contribute k * diceType, then a final roll that does not explode
+    // (or any final roll once the depth limit is reached)
+    let reach = 1 / diceType;
+    for (let k = 0; k <= depth; k++) {
+        const lastFace = k === depth ? diceType : diceType - 1;
+        for (let face = 1; face <= lastFace; face++) {
+            probs[k * diceType + face - 1] = reach;
+        }
+        reach /= diceType;
+    }
+
+    return { min: 1, probs };
+}
+
+/**
+ * Distribution of the sum of two independent rolls
+ * @param {Object} a - PMF
+ * @param {Object} b - PMF
+ * @returns {Object} - PMF of a + b
+ */
+export function convolveDistributions(a, b) {
+    const probs = new Float64Array(a.probs.length + b.probs.length - 1);
+    for (let i = 0; i < a.probs.length; i++) {
+        const pa = a.probs[i];
+        if (pa === 0) continue;
+        for (let j = 0; j < b.probs.length; j++) {
+            probs[i + j] += pa * b.probs[j];
+        }
+    }
+    return { min: a.min + b.min, probs };
+}
+
+/**
+ * Distribution of the sum of count independent rolls of the same die
+ * Uses repeated squaring, so only O(log count) convolutions are needed.
+ * @param {Object} pmf - PMF of one roll
+ * @param {number} count - Number of rolls (at least 1)
+ * @returns {Object} - PMF of the sum
+ */
+function sumOfRolls(pmf, count) {
+    let result = null;
+    let power = pmf;
+    let remaining = count;
+
+    while (remaining > 0) {
+        if (remaining & 1) {
+            result = result ? convolveDistributions(result, power) : power;
+        }
+        remaining >>= 1;
+        if (remaining > 0) {
+            power = convolveDistributions(power, power);
+        }
+    }
+
+    return result;
+}
+
+/**
+ * Map each outcome of a roll through a scoring function and merge equal scores
+ * @param {Object} pmf - PMF
+ * @param {Function} score - Integer score for a value
+ * @returns {Object} - PMF of the score
+ */
+function mapDistribution(pmf, score) {
+    const scores = Array.from(pmf.probs, (p, i) => score(pmf.min + i));
+    const min = Math.min(...scores);
+    const probs = new Float64Array(Math.max(...scores) - min + 1);
+    scores.forEach((value, i) => {
+        probs[value - min] += pmf.probs[i];
+    });
+    return { min, probs };
+}
+
+/**
+ * Distribution of the total score of the kept dice when keeping the highest or
+ * lowest keep of numDice rolls (an order-statistic dynamic program)
+ *
+ * Faces are visited best-first for the kept side. The state is how many dice
+ * have been assigned a face so far and the score of the ones kept; assigning c
+ * dice to the next face multiplies by C(remaining, c) * p^c.
+ *
+ * @param {Object} pmf - PMF of one die
+ * @param {number} numDice - Dice rolled
+ * @param {number} keep - Dice kept
+ * @param {string} which - 'highest' or 'lowest'
+ * @param {Function} score - Integer score of a kept die (value itself, or 1/0 for successes)
+ * @returns {Object} - PMF of the kept score
+ */
+function keptScoreDistribution(pmf, numDice, keep, which, score) {
+    const faces = [];
+    for (let i = 0; i < pmf.probs.length; i++) {
+        if (pmf.probs[i] > 0) {
+            faces.push({ score: score(pmf.min + i), p: pmf.probs[i] });
+        }
+    }
+    if (which === 'highest') {
+        faces.reverse();
+    }
+
+    const scores = faces.map(face => face.score);
+    const lo = Math.min(0, keep * Math.min(...scores));
+    const hi = Math.max(0, keep * Math.max(...scores));
+    const width = hi - lo + 1;
+
+    // states[n] = probability by kept score after assigning n dice
+    let states = Array.from({ length: numDice + 1 }, () => null);
+    states[0] = new Float64Array(width);
+    states[0][-lo] = 1;
+
+    // Binomial coefficients up to numDice
+    const binomial = [[1]];
+    for (let n = 1; n <= numDice; n++) {
+        binomial[n] = [1];
+        for (let k = 1; k < n; k++) {
+            binomial[n][k] = binomial[n - 1][k - 1] + binomial[n - 1][k];
+        }
+        binomial[n][n] = 1;
+    }
+
+    for (const face of faces) {
+        const next = Array.from({ length: numDice + 1 }, () => null);
+        const powers = [1];
+        for (let c = 1; c <= numDice; c++) {
+            powers[c] = powers[c - 1] * face.p;
+        }
+
+        for (let n = 0; n <= numDice; n++) {
+            const current = states[n];
+            if (!current) continue;
+            const remaining = numDice - n;
+
+            for (let c = 0; c <= remaining; c++) {
+                const weight = binomial[remaining][c] * powers[c];
+                if (weight === 0) continue;
+                const shift = Math.max(0, Math.min(c, keep - n)) * face.score;
+                const target = next[n + c] || (next[n + c] = new Float64Array(width));
+
+                for (let s = 0; s < width; s++) {
+                    if (current[s] !== 0) {
+                        target[s + shift] += current[s] * weight;
+                    }
+                }
+            }
+        }
+        states = next;
+    }
+
+    return trimDistribution({ min: lo, probs: states[numDice] });
+}
+
+/**
+ * Drop zero-probability values from both ends of a PMF
+ * @param {Object} pmf - PMF
+ * @returns {Object} - Equivalent PMF without leading/trailing zeros
+ */
+function trimDistribution(pmf) {
+    let start = 0;
+    let end = pmf.probs.length;
+    while (start < end - 1 && pmf.probs[start] === 0) start++;
+    while (end > start + 1 && pmf.probs[end - 1] === 0) end--;
+    return { min: pmf.min + start, probs: pmf.probs.slice(start, end) };
+}
+
+/**
+ * Distribution of the better (advantage) or worse (disadvantage) of two independent rolls
+ * @param {Object} pmf - PMF of one roll
+ * @param {string} mode - 'advantage' or 'disadvantage'
+ * @returns {Object} - PMF of the chosen roll
+ * @throws {Error} - If mode is invalid
+ */
+export function advantageDistribution(pmf, mode) {
+    if (mode !== 'advantage' && mode !== 'disadvantage') {
+        throw new Error(`Invalid mode: ${mode}. Must be 'advantage' or 'disadvantage'.`);
+    }
+
+    // P(max <= x) = F(x)^2 and P(min > x) = (1 - F(x))^2
+    const probs = new Float64Array(pmf.probs.length);
+    let cdf = 0;
+    for (let i = 0; i < probs.length; i++) {
+        const before = cdf;
+        cdf += pmf.probs[i];
+        probs[i] = mode === 'advantage'
+            ? cdf * cdf - before * before
+            : (1 - before) * (1 - before) - (1 - cdf) * (1 - cdf);
+    }
+    return { min: pmf.min, probs };
+}
+
+/**
+ * Apply defaults to rollDiceWithModifiers()-style options and validate them
+ * Shared by getRollDistribution() and rollBatch().
+ * @param {Object} options - Roll configuration
+ * @returns {Object} - Options with every default filled in
+ * @throws {Error} - If options are invalid
+ */
+function resolveRollOptions(options) {
+    const {
+        numDice,
+        diceType,
+        exploding = false,
+        explodingMode = 'standard',
+        explosionDepth = DEFAULT_EXPLOSION_DEPTH,
+        drop = false,
+        dropType = 'lowest',
+        dropCount = 1,
+        countSuccesses: countSuccessesEnabled = false,
+        successThreshold = 4,
+        successComparison = '>='
+    } = options;
+
+    if (!Number.isInteger(numDice) || numDice < 1) {
+        throw new Error(`Invalid number of dice: ${numDice}. Must be a positive integer.`);
+    }
+    if (!Number.isInteger(diceType) || diceType < 1) {
+        throw new Error(`Invalid dice type: ${diceType}. Must be a positive integer.`);
+    }
+    if (exploding && diceType < 2) {
+        throw new Error(`Invalid dice type: ${diceType}. Must be at least 2.`);
+    }
+    if (drop) {
+        if (!Number.isInteger(dropCount) || dropCount < 0) {
+            throw new Error(`Invalid drop count: ${dropCount}`);
+        }
+        if (dropCount >= numDice) {
+            throw new Error(`Cannot drop ${dropCount} dice from ${numDice} dice`);
+        }
+        if (dropType !== 'lowest' && dropType !== 'highest') {
+            throw new Error(`Invalid drop type: ${dropType}. Must be 'lowest' or 'highest'.`);
+        }
+    }
+    if (countSuccessesEnabled) {
+        if (!Number.isInteger(successThreshold)) {
+            throw new Error(`Invalid threshold: ${successThreshold}`);
+        }
+        isSuccessfulRoll(0, successThreshold, successComparison);
+    }
+
+    return {
+        numDice,
+        diceType,
+        exploding,
+        explodingMode,
+        explosionDepth,
+        drop,
+        dropType,
+        dropCount,
+        countSuccesses: countSuccessesEnabled,
+        successThreshold,
+        successComparison
+    };
+}
+
+/**
+ * Get the exact distribution of a rollDiceWithModifiers() roll
+ * The distribution is of total, or of successCount when success counting is
+ * enabled. Results are memoized by options.
+ *
+ * @param {Object} options - Same options as rollDiceWithModifiers()
+ * @param {number} [options.explosionDepth=DEFAULT_EXPLOSION_DEPTH] - Compound explosions followed per die
+ * @returns {Object} - PMF { min: number, probs: Float64Array } (shared - do not modify)
+ * @throws {Error} - If options are invalid
+ *
+ * @example
+ * // 4d6 drop lowest
+ * const pmf = getRollDistribution({ numDice: 4, diceType: 6, drop: true, dropCount: 1 });
+ * getProbability(pmf, 18); // 21/1296
+ */
+export function getRollDistribution(options) {
+    const {
+        numDice,
+        diceType,
+        exploding,
+        explodingMode,
+        explosionDepth,
+        drop,
+        dropType,
+        dropCount,
+        countSuccesses: countSuccessesEnabled,
+        successThreshold,
+        successComparison
+    } = resolveRollOptions(options);
+
+    const key = JSON.stringify([
+        'roll', numDice, diceType,
+        exploding ? [explodingMode === 'standard' ? 'standard' : 'compound', explosionDepth] : null,
+        drop && dropCount > 0 ? [dropType, dropCount] : null,
+        countSuccessesEnabled ? [successThreshold, successComparison] : null
+    ]);
+
+    return memoizeDistribution(key, () => {
+        const die = exploding
+            ? explodingDieDistribution(diceType, explodingMode, explosionDepth)
+            : dieDistribution(diceType);
+        const score = countSuccessesEnabled
+            ? value => (isSuccessfulRoll(value, successThreshold, successComparison) ? 1 : 0)
+            : value => value;
+
+        if (drop && dropCount > 0) {
+            // Dropping the lowest dropCount is keeping the highest numDice - dropCount
+            const keepType = dropType === 'lowest' ? 'highest' : 'lowest';
+            return keptScoreDistribution(die, numDice, numDice - dropCount, keepType, score);
+        }
+        return sumOfRolls(countSuccessesEnabled ? mapDistribution(die, score) : die, numDice);
+    });
+}
+
+/**
+ * Get the exact distribution of a rollWithAdvantage() result
+ * @param {string} mode - 'advantage' or 'disadvantage'
+ * @param {Object} rollOptions - Options for getRollDistribution()
+ * @returns {Object} - PMF of the chosen roll's total (or successCount)
+ * @throws {Error} - If mode or options are invalid
+ */
+export function getAdvantageDistribution(mode, rollOptions) {
+    const single = getRollDistribution(rollOptions);
+    return memoizeDistribution(
+        JSON.stringify(['advantage', mode, rollOptions]),
+        () => advantageDistribution(single, mode)
+    );
+}
+
+/**
+ * Get the distribution of the sum of numDice rolls of a die with the given faces
+ * @param {number[]} faces - Integer face values, each equally likely
+ * @param {number} numDice - Number of dice
+ * @returns {Object} - PMF of the sum (shared - do not modify)
+ * @throws {Error} - If faces or numDice is invalid
+ */
+export function getFacesSumDistribution(faces, numDice) {
+    if (!Number.isInteger(numDice) || numDice < 1) {
+        throw new Error(`Invalid number of dice: ${numDice}. Must be a positive integer.`);
+    }
+    return memoizeDistribution(
+        JSON.stringify(['faces', faces, numDice]),
+        () => sumOfRolls(faceDistribution(faces), numDice)
+    );
+}
+
+/**
+ * Get the distribution of the highest (or lowest) of numDice rolls of one die
+ * @param {Object} pmf - PMF of one die
+ * @param {number} numDice - Number of dice
+ * @param {string} [which='highest'] - 'highest' or 'lowest'
+ * @returns {Object} - PMF of the extreme value
+ */
+export function extremeValueDistribution(pmf, numDice, which = 'highest') {
+    if (!Number.isInteger(numDice) || numDice < 1) {
+        throw new Error(`Invalid number of dice: ${numDice}. Must be a positive integer.`);
+    }
+    if (which !== 'highest' && which !== 'lowest') {
+        throw new Error(`Invalid keep type: ${which}. Must be 'highest' or 'lowest'.`);
+    }
+    return keptScoreDistribution(pmf, numDice, 1, which, value => value);
+}
+
+/**
+ * Get the distribution of how many of numDice rolls are successes
+ * @param {Object} pmf - PMF of one die
+ * @param {number} numDice - Number of dice (0 or more)
+ * @param {number} threshold - The threshold value
+ * @param {string} [comparison='>='] - Same operators as countSuccesses()
+ * @returns {Object} - PMF over 0..numDice (binomial)
+ */
+export function successCountDistribution(pmf, numDice, threshold, comparison = '>=') {
+    if (!Number.isInteger(numDice) || numDice < 0) {
+        throw new Error(`Invalid number of dice: ${numDice}. Must be a non-negative integer.`);
+    }
+
+    let p = 0;
+    pmf.probs.forEach((prob, i) => {
+        if (isSuccessfulRoll(pmf.min + i, threshold, comparison)) {
+            p += prob;
+        }
+    });
+
+    const probs = new Float64Array(numDice + 1);
+    let coefficient = 1;
+    for (let k = 0; k <= numDice; k++) {
+        probs[k] = coefficient * Math.pow(p, k) * Math.pow(1 - p, numDice - k);
+        coefficient = coefficient * (numDice - k) / (k + 1);
+    }
+    return { min: 0, probs };
+}
+
+/**
+ * Probability of one value
+ * @param {Object} pmf - PMF
+ * @param {number} value - The value
+ * @returns {number} - Probability (0 outside the support)
+ */
+export function getProbability(pmf, value) {
+    const i = value - pmf.min;
+    return i >= 0 && i < pmf.probs.length ? pmf.probs[i] : 0;
+}
+
+/**
+ * Probability of rolling at least value
+ * @param {Object} pmf - PMF
+ * @param {number} value - The value
+ * @returns {number} - P(X >= value)
+ */
+export function getProbabilityAtLeast(pmf, value) {
+    let total = 0;
+    for (let i = Math.max(0, value - pmf.min); i < pmf.probs.length; i++) {
+        total += pmf.probs[i];
+    }
+    return Math.min(1, total);
+}
+
+/**
+ * Mean and variance of a distribution
+ * @param {Object} pmf - PMF
+ * @returns {Object} - { mean: number, variance: number, min: number, max: number }
+ */
+export function getDistributionStats(pmf) {
+    let mean = 0;
+    let square = 0;
+    pmf.probs.forEach((p, i) => {
+        const value = pmf.min + i;
+        mean += p * value;
+        square += p * value * value;
+    });
+    return {
+        mean,
+        variance: Math.max(0, square - mean * mean),
+        min: pmf.min,
+        max: pmf.min + pmf.probs.length - 1
+    };
+}
+
+// ============================================================================
+// BATCH ROLLING
+// ============================================================================
+//
+// rollBatch() runs many trials of one roll without building per-die objects:
+// random words are drawn RANDOM_BLOCK_SIZE at a time with rng.fill(), each
+// trial's dice live in one reused Uint32Array, and results go into typed arrays.
+
+const UINT32_RANGE = 4294967296;
+
+let batchCryptoRng = null;
+
+/**
+ * Pick the generator for a batch
+ * An explicit or installed default rng wins; otherwise batches use Web Crypto
+ * (falling back to Math.random() where it is unavailable).
+ * @param {Object} [rng] - Generator passed in the spec
+ * @returns {Object} - rng
+ */
+function getBatchRng(rng) {
+    if (rng) {
+        return rng;
+    }
+    const defaultRng = getDefaultRng();
+    if (defaultRng !== mathRandomRng || !createCryptoRng.available()) {
+        return defaultRng;
+    }
+    if (!batchCryptoRng) {
+        batchCryptoRng = createCryptoRng();
+    }
+    return batchCryptoRng;
+}
+
+/**
+ * Build a success test for one threshold/comparison (see countSuccesses())
+ * @param {number} threshold - The threshold value
+ * @param {string} comparison - Comparison operator
+ * @returns {Function} - Returns true if a die value is a success
+ */
+function createSuccessTest(threshold, comparison) {
+    switch (comparison) {
+        case '>=':
+            return value => value >= threshold;
+        case '>':
+            return value => value > threshold;
+        case '<=':
+            return value => value <= threshold;
+        case '<':
+            return value => value < threshold;
+        case '==':
+        case '=':
+            return value => value === threshold;
+        default:
+            throw new Error(`Invalid comparison: ${comparison}`);
+    }
+}
+
+/**
+ * Reuse a caller-supplied typed array if it is big enough, else allocate one
+ * @param {TypedArray} [existing] - Buffer supplied by the caller
+ * @param {Function} Type - Typed array constructor
+ * @param {number} length - Required length
+ * @returns {TypedArray} - A view of exactly length elements
+ */
+function batchBuffer(existing, Type, length) {
+    if (existing instanceof Type && existing.length >= length) {
+        return existing.subarray(0, length);
+    }
+    return new Type(length);
+}
+
+/**
+ * Roll the same dice many times, returning typed arrays and summaries
+ *
+ * Each trial is equivalent to rollDiceWithModifiers(spec): dice are rolled
+ * (exploding if enabled), dropped, then the kept dice are totalled and their
+ * successes counted. Die values are drawn without modulo bias.
+ *
+ * @param {Object} spec - Same options as rollDiceWithModifiers() (spec.rng defaults to Web Crypto)
+ * @param {number} trials - Number of trials
+ * @param {Object} [buffers] - Optional preallocated output buffers to fill
+ * @param {Int32Array} [buffers.totals] - At least trials long
+ * @param {Uint32Array} [buffers.successCounts] - At least trials long
+ * @returns {Object} - { trials, totals: Int32Array, successCounts: Uint32Array|null,
+ *                       explosions: number, stats: { total, successes } }
+ *                     where each stats entry is { mean, variance, min, max } (successes null if not counted)
+ * @throws {Error} - If spec or trials is invalid
+ *
+ * @example
+ * const { stats } = rollBatch({ numDice: 4, diceType: 6, drop: true }, 1e6);
+ * stats.total.mean; // ~12.24
+ */
+export function rollBatch(spec, trials, buffers = {}) {
+    const {
+        numDice,
+        diceType,
+        exploding,
+        explodingMode,
+        drop,
+        dropType,
+        dropCount,
+        countSuccesses: countSuccessesEnabled,
+        successThreshold,
+        successComparison
+    } = resolveRollOptions(spec);
+
+    if (!Number.isInteger(trials) || trials < 1) {
+        throw new Error(`Invalid number of trials: ${trials}. Must be a positive integer.`);
+    }
+
+    const totals = batchBuffer(buffers.totals, Int32Array, trials);
+    const successCounts = countSuccessesEnabled
+        ? batchBuffer(buffers.successCounts, Uint32Array, trials)
+        : null;
+    const isSuccess = countSuccessesEnabled ? createSuccessTest(successThreshold, successComparison) : null;
+
+    const rng = getBatchRng(spec.rng);
+    const block = new Uint32Array(RANDOM_BLOCK_SIZE);
+    let index = RANDOM_BLOCK_SIZE;
+    // Words at or above limit are redrawn so every face is equally likely;
+    // below it, each face owns a run of bucket consecutive words
+    const limit = UINT32_RANGE - (UINT32_RANGE % diceType);
+    const bucket = limit / diceType;
+    const explodeOnce = explodingMode === 'standard';
+
+    // Kept dice are [keepStart, keepEnd) after sorting ascending
+    const dropping = drop && dropCount > 0;
+    const keepStart = dropping && dropType === 'lowest' ? dropCount : 0;
+    const keepEnd = dropping && dropType === 'highest' ? numDice - dropCount : numDice;
+
+    const dice = new Uint32Array(numDice);
+    let explosions = 0;
+    let totalSum = 0;
+    let totalSquares = 0;
+    let totalMin = Infinity;
+    let totalMax = -Infinity;
+    let successSum = 0;
+    let successSquares = 0;
+    let successMin = Infinity;
+    let successMax = -Infinity;
+
+    const drawDie = () => {
+        let word;
+        do {
+            if (index === RANDOM_BLOCK_SIZE) {
+                rng.fill(block);
+                index = 0;
+            }
+            word = block[index++];
+        } while (word >= limit);
+        return Math.floor(word / bucket) + 1;
+    };
+
+    for (let t = 0; t < trials; t++) {
+        for (let d = 0; d < numDice; d++) {
+            let roll = drawDie();
+            let value = roll;
+
+            if (exploding) {
+                // Standard mode explodes once; other modes keep going
+                let depth = 0;
+                while (roll === diceType && !(explodeOnce && depth === 1)) {
+                    explosions++;
+                    depth++;
+                    roll = drawDie();
+                    value += roll;
+                }
+            }
+
+            dice[d] = value;
+        }
+
+        if (dropping) {
+            // Insertion sort: pools are small, and this avoids a comparator call per swap
+            for (let i = 1; i < numDice; i++) {
+                const value = dice[i];
+                let j = i - 1;
+                while (j >= 0 && dice[j] > value) {
+                    dice[j + 1] = dice[j];
+                    j--;
+                }
+                dice[j + 1] = value;
+            }
+        }
+
+        let total = 0;
+        let successes = 0;
+        for (let d = keepStart; d < keepEnd; d++) {
+            total += dice[d];
+            if (isSuccess && isSuccess(dice[d])) {
+                successes++;
+            }
+        }
+
+        totals[t] = total;
+        totalSum += total;
+        totalSquares += total * total;
+        if (total < totalMin) totalMin = total;
+        if (total > totalMax) totalMax = total;
+
+        if (successCounts) {
+            successCounts[t] = successes;
+            successSum += successes;
+            successSquares += successes * successes;
+            if (successes < successMin) successMin = successes;
+            if (successes > successMax) successMax = successes;
+        }
+    }
+
+    const summarize = (sum, squares, min, max) => {
+        const mean = sum / trials;
+        return { mean, variance: Math.max(0, squares / trials - mean * mean), min, max };
+    };
+
+    return {
+        trials,
+        totals,
+        successCounts,
+        explosions,
+        stats: {
+            total: summarize(totalSum, totalSquares, totalMin, totalMax),
+            successes: successCounts ? summarize(successSum, successSquares, successMin, successMax) : null
+        }
+    };
+}
+
+// ============================================================================
+// DICE EXPRESSIONS
+// ============================================================================
+//
+// compileDiceExpression() turns notation such as '4d6kh3+2d8!+5', '10d10>=7'
+// or 'adv(d20)+3' into a roll plan. Each plan is parsed and validated once,
+// cached by expression string, and shared by rollExpression() (one roll),
+// rollExpressionBatch() (many trials) and getExpressionDistribution().
+//
+// Grammar (case and whitespace are ignored):
+//   expression := ['+' | '-'] term (('+' | '-') term)*
+//   term       := dice | integer | ('adv' | 'dis') '(' expression ')'
+//   dice       := [count] 'd' sides modifier*
+//   modifier   := '!'                                   explode until a die stops rolling its highest face
+//               | '!o'                                  explode once
+//               | ('kh' | 'k' | 'kl' | 'dh' | 'dl') n   keep/drop the highest/lowest n dice
+//               | ('>=' | '>' | '<=' | '<' | '=') n     count successes instead of summing
+//
+// A term with a success modifier contributes its success count; adv()/dis()
+// rolls the inner expression twice and keeps the higher/lower total.
+
+/**
+ * Number of compiled expressions kept by compileDiceExpression()
+ * @type {number}
+ */
+export const EXPRESSION_CACHE_SIZE = 256;
+
+/**
+ * Most dice a single expression term may roll (same limit as the Custom form)
+ * @type {number}
+ */
+export const MAX_EXPRESSION_DICE = 1000;
+
+/**
+ * Most sides an expression die may have (same limit as the Custom form)
+ * @type {number}
+ */
+export const MAX_EXPRESSION_SIDES = 1000000;
+
+/**
+ * Most dice one roll of an expression may throw, summed over all terms
+ * Dice inside adv()/dis() count twice, since they are rolled twice.
+ * @type {number}
+ */
+export const MAX_EXPRESSION_TOTAL_DICE = 10000;
+
+/**
+ * Most terms (including those inside adv()/dis()) getExpressionDistribution() will convolve
+ * @type {number}
+ */
+export const MAX_DISTRIBUTION_TERMS = 100;
+
+// Map iteration order doubles as LRU order (oldest first)
+const expressionCache = new Map();
+
+const INTEGER_PATTERN = /\d+/y;
+const KEEP_DROP_TOKENS = ['kh', 'kl', 'dh', 'dl', 'k'];
+const COMPARISON_TOKENS = ['>=', '<=', '>', '<', '='];
+
+/**
+ * Parse a dice expression into a plan (see the grammar above)
+ * @param {string} source - The expression
+ * @returns {Object} - { expression: string, terms: Object[] }
+ * @throws {Error} - If the expression is malformed or describes an invalid roll
+ */
+function parseDiceExpression(source) {
+    const text = source.replace(/\s+/g, '').toLowerCase();
+    let pos = 0;
+    // Dice thrown per roll of the expression, and how often the current term is rolled
+    let totalDice = 0;
+    let rollsPerTerm = 1;
+
+    const fail = message => {
+        const rest = pos < text.length ? ` near '${text.slice(pos)}'` : '';
+        throw new Error(`Invalid dice expression: ${source} (${message}${rest})`);
+    };
+    const accept = token => {
+        if (text.startsWith(token, pos)) {
+            pos += token.length;
+            return true;
+        }
+        return false;
+    };
+    const readInteger = () => {
+        INTEGER_PATTERN.lastIndex = pos;
+        const match = INTEGER_PATTERN.exec(text);
+        if (!match) {
+            return null;
+        }
+        pos = INTEGER_PATTERN.lastIndex;
+        return parseInt(match[0], 10);
+    };
+
+    function parseModifiers(options) {
+        for (;;) {
+            if (accept('!')) {
+                if (options.exploding) fail('dice can only have one explode modifier');
+                options.exploding = true;
+                options.explodingMode = accept('o') ? 'standard' : 'compound';
+                continue;
+            }
+
+            const keepDrop = KEEP_DROP_TOKENS.find(token => text.startsWith(token, pos));
+            if (keepDrop) {
+                if (options.drop) fail('dice can only have one keep or drop modifier');
+                pos += keepDrop.length;
+                const count = readInteger();
+                if (count === null) fail(`expected a number after '${keepDrop}'`);
+
+                const keeping = keepDrop[0] === 'k';
+                const highest = keepDrop !== 'kl' && keepDrop !== 'dl';
+                if (keeping && (count < 1 || count > options.numDice)) {
+                    fail(`cannot keep ${count} of ${options.numDice} dice`);
+                }
+                options.drop = true;
+                options.dropCount = keeping ? options.numDice - count : count;
+                // Keeping the highest is dropping the lowest, and vice versa
+                options.dropType = keeping === highest ? 'lowest' : 'highest';
+                continue;
+            }
+
+            const comparison = COMPARISON_TOKENS.find(token => text.startsWith(token, pos));
+            if (comparison) {
+                if (options.countSuccesses) fail('dice can only have one success modifier');
+                pos += comparison.length;
+                const threshold = readInteger();
+                if (threshold === null) fail(`expected a number after '${comparison}'`);
+                options.countSuccesses = true;
+                options.successThreshold = threshold;
+                options.successComparison = comparison === '=' ? '==' : comparison;
+                continue;
+            }
+
+            return options;
+        }
+    }
+
+    function parseTerm(sign) {
+        const start = pos;
+
+        for (const [prefix, mode] of [['adv(', 'advantage'], ['dis(', 'disadvantage']]) {
+            if (accept(prefix)) {
+                rollsPerTerm *= 2;
+                if (rollsPerTerm > MAX_EXPRESSION_TOTAL_DICE) fail('adv() and dis() are nested too deeply');
+                const terms = parseTerms();
+                rollsPerTerm /= 2;
+                if (!accept(')')) fail("expected ')'");
+                return { type: 'advantage', sign, mode, notation: text.slice(start, pos), terms };
+            }
+        }
+
+        const count = readInteger();
+        if (!accept('d')) {
+            if (count === null) fail('expected a number, dice, adv() or dis()');
+            return { type: 'constant', sign, notation: text.slice(start, pos), value: count };
+        }
+
+        const numDice = count === null ? 1 : count;
+        if (numDice > MAX_EXPRESSION_DICE) {
+            fail(`${numDice} dice is more than the limit of ${MAX_EXPRESSION_DICE}`);
+        }
+        const diceType = readInteger();
+        if (diceType === null) fail("expected the number of sides after 'd'");
+        if (diceType > MAX_EXPRESSION_SIDES) {
+            fail(`${diceType} sides is more than the limit of ${MAX_EXPRESSION_SIDES}`);
+        }
+        totalDice += numDice * rollsPerTerm;
+        if (totalDice > MAX_EXPRESSION_TOTAL_DICE) {
+            fail(`more than ${MAX_EXPRESSION_TOTAL_DICE} dice in total`);
+        }
+        const options = parseModifiers({ numDice, diceType });
+
+        let resolved;
+        try {
+            resolved = resolveRollOptions(options);
+        } catch (error) {
+            throw new Error(`Invalid dice expression: ${source} (${error.message})`);
+        }
+        return { type: 'dice', sign, notation: text.slice(start, pos), options: resolved };
+    }
+
+    function parseTerms() {
+        const terms = [];
+        let sign = accept('-') ? -1 : 1;
+        if (sign === 1) {
+            accept('+');
+        }
+        terms.push(parseTerm(sign));
+
+        while (pos < text.length && (text[pos] === '+' || text[pos] === '-')) {
+            sign = text[pos] === '-' ? -1 : 1;
+            pos++;
+            terms.push(parseTerm(sign));
+        }
+        return terms;
+    }
+
+    const terms = parseTerms();
+    if (pos < text.length) {
+        fail('unexpected input');
+    }
+    return { expression: text, terms };
+}
+
+/**
+ * Compile a dice expression into a reusable roll plan
+ * Plans are cached by expression string (EXPRESSION_CACHE_SIZE entries, least
+ * recently used evicted), so rolling the same expression again skips parsing
+ * and validation.
+ *
+ * @param {string} expression - e.g. '4d6kh3+2d8!+5', '10d10>=7', 'adv(d20)+3'
+ * @returns {Object} - Plan { expression: string, terms: Object[] } (shared - do not modify)
+ * @throws {Error} - If the expression is invalid
+ *
+ * @example
+ * const plan = compileDiceExpression('4d6kh3');
+ * plan.terms[0].options; // { numDice: 4, diceType: 6, drop: true, dropType: 'lowest', dropCount: 1, ... }
+ */
+export function compileDiceExpression(expression) {
+    if (typeof expression !== 'string') {
+        throw new Error('Expression must be a string');
+    }
+
+    const cached = expressionCache.get(expression);
+    if (cached) {
+        expressionCache.delete(expression);
+        expressionCache.set(expression, cached);
+        return cached;
+    }
+
+    const plan = parseDiceExpression(expression);
+    expressionCache.set(expression, plan);
+    if (expressionCache.size > EXPRESSION_CACHE_SIZE) {
+        expressionCache.delete(expressionCache.keys().next().value);
+    }
+    return plan;
+}
+
+/**
+ * Discard all compiled expressions
+ */
+export function clearExpressionCache() {
+    expressionCache.clear();
+}
+
+/**
+ * Accept either an expression string or a plan from compileDiceExpression()
+ * @param {string|Object} expression - Expression or plan
+ * @returns {Object} - Plan
+ */
+function toPlan(expression) {
+    return typeof expression === 'string' ? compileDiceExpression(expression) : expression;
+}
+
+/**
+ * Roll each term of a plan once
+ * @param {Object[]} terms - Plan terms
+ * @param {Object} rng - Random number generator
+ * @returns {Object} - { total, terms }
+ */
+function rollTerms(terms, rng) {
+    let total = 0;
+    const results = terms.map(term => {
+        let value;
+        let result = null;
+
+        if (term.type === 'constant') {
+            value = term.value;
+        } else if (term.type === 'dice') {
+            result = rollValidatedDice(term.options, rng);
+            value = term.options.countSuccesses ? result.successCount : result.total;
+        } else {
+            const first = rollTerms(term.terms, rng);
+            const second = rollTerms(term.terms, rng);
+            const firstChosen = term.mode === 'advantage'
+                ? first.total >= second.total
+                : first.total <= second.total;
+            result = {
+                mode: term.mode,
+                chosenRoll: firstChosen ? first : second,
+                otherRoll: firstChosen ? second : first
+            };
+            value = result.chosenRoll.total;
+        }
+
+        total += term.sign * value;
+        return { type: term.type, sign: term.sign, notation: term.notation, value, result };
+    });
+
+    return { total, terms: results };
+}
+
+/**
+ * Roll a dice expression once
+ *
+ * Each entry in terms has { type: 'dice'|'constant'|'advantage', sign, notation,
+ * value, result }. For dice, result is shaped like rollDiceWithModifiers();
+ * for adv()/dis() it is { mode, chosenRoll, otherRoll }, each a nested { total, terms }.
+ *
+ * @param {string|Object} expression - Expression or compiled plan
+ * @param {Object} [rng] - Random number generator (see Random.js)
+ * @returns {Object} - { expression: string, total: number, terms: Object[] }
+ * @throws {Error} - If the expression is invalid
+ *
+ * @example
+ * rollExpression('adv(d20)+3').total; // 4-23
+ */
+export function rollExpression(expression, rng = getDefaultRng()) {
+    const plan = toPlan(expression);
+    return { expression: plan.expression, ...rollTerms(plan.terms, rng) };
+}
+
+/**
+ * Add every term of a plan, over many trials, into out
+ * @param {Object[]} terms - Plan terms
+ * @param {number} trials - Number of trials
+ * @param {Object} rng - Random number generator
+ * @param {Int32Array} out - Running totals (trials long)
+ * @param {Object} scratch - Reused rollBatch() buffers
+ */
+function batchTerms(terms, trials, rng, out, scratch) {
+    for (const term of terms) {
+        const sign = term.sign;
+
+        if (term.type === 'constant') {
+            const value = sign * term.value;
+            for (let t = 0; t < trials; t++) {
+                out[t] += value;
+            }
+        } else if (term.type === 'dice') {
+            const batch = rollBatch({ ...term.options, rng }, trials, scratch);
+            const values = term.options.countSuccesses ? batch.successCounts : batch.totals;
+            for (let t = 0; t < trials; t++) {
+                out[t] += sign * values[t];
+            }
+        } else {
+            const first = new Int32Array(trials);
+            const second = new Int32Array(trials);
+            batchTerms(term.terms, trials, rng, first, scratch);
+            batchTerms(term.terms, trials, rng, second, scratch);
+            const pick = term.mode === 'advantage' ? Math.max : Math.min;
+            for (let t = 0; t < trials; t++) {
+                out[t] += sign * pick(first[t], second[t]);
+            }
+        }
+    }
+}
+
+/**
+ * Roll a dice expression many times (see rollBatch())
+ * @param {string|Object} expression - Expression or compiled plan
+ * @param {number} trials - Number of trials
+ * @param {Object} [options] - Optional settings
+ * @param {Object} [options.rng] - Random number generator (defaults to Web Crypto, like rollBatch())
+ * @param {Int32Array} [options.totals] - Preallocated output buffer, at least trials long
+ * @returns {Object} - { trials, totals: Int32Array, stats: { total: { mean, variance, min, max } } }
+ * @throws {Error} - If the expression or trials is invalid
+ */
+export function rollExpressionBatch(expression, trials, options = {}) {
+    const plan = toPlan(expression);
+    if (!Number.isInteger(trials) || trials < 1) {
+        throw new Error(`Invalid number of trials: ${trials}. Must be a positive integer.`);
+    }
+
+    const rng = getBatchRng(options.rng);
+    const totals = batchBuffer(options.totals, Int32Array, trials).fill(0);
+    const scratch = { totals: new Int32Array(trials), successCounts: new Uint32Array(trials) };
+
+    batchTerms(plan.terms, trials, rng, totals, scratch);
+
+    let sum = 0;
+    let squares = 0;
+    let min = Infinity;
+    let max = -Infinity;
+    for (let t = 0; t < trials; t++) {
+        const total = totals[t];
+        sum += total;
+        squares += total * total;
+        if (total < min) min = total;
+        if (total > max) max = total;
+    }
+    const mean = sum / trials;
+
+    return {
+        trials,
+        totals,
+        stats: {
+            total: { mean, variance: Math.max(0, squares / trials - mean * mean), min, max }
+        }
+    };
+}
+
+/**
+ * Distribution of minus a roll
+ * @param {Object} pmf - PMF
+ * @returns {Object} - PMF of -X
+ */
+function negateDistribution(pmf) {
+    return { min: -(pmf.min + pmf.probs.length - 1), probs: pmf.probs.slice().reverse() };
+}
+
+/**
+ * Distribution of the signed sum of a plan's terms
+ * @param {Object[]} terms - Plan terms
+ * @returns {Object} - PMF
+ */
+function termsDistribution(terms) {
+    let pmf = { min: 0, probs: new Float64Array([1]) };
+
+    for (const term of terms) {
+        let termPmf;
+        if (term.type === 'constant') {
+            termPmf = { min: term.value, probs: new Float64Array([1]) };
+        } else if (term.type === 'dice') {
+            termPmf = getRollDistribution(term.options);
+        } else {
+            termPmf = advantageDistribution(termsDistribution(term.terms), term.mode);
+        }
+        pmf = convolveDistributions(pmf, term.sign < 0 ? negateDistribution(termPmf) : termPmf);
+    }
+
+    return pmf;
+}
+
+/**
+ * Number of terms in a plan, counting those inside adv()/dis()
+ * @param {Object[]} terms - Plan terms
+ * @returns {number}
+ */
+function countTerms(terms) {
+    return terms.reduce(
+        (count, term) => count + 1 + (term.type === 'advantage' ? countTerms(term.terms) : 0),
+        0
+    );
+}
+
+/**
+ * Get the exact distribution of a dice expression's total
+ * Memoized alongside getRollDistribution().
+ * @param {string|Object} expression - Expression or compiled plan
+ * @returns {Object} - PMF { min: number, probs: Float64Array } (shared - do not modify)
+ * @throws {Error} - If the expression is invalid
+ *
+ * @example
+ * getProbabilityAtLeast(getExpressionDistribution('d20+5'), 15); // 0.55
+ */
+export function getExpressionDistribution(expression) {
+    const plan = toPlan(expression);
+    const termCount = countTerms(plan.terms);
+    if (termCount > MAX_DISTRIBUTION_TERMS) {
+        throw new Error(
+            `Invalid dice expression: ${plan.expression} (${termCount} terms is more than the ` +
+            `limit of ${MAX_DISTRIBUTION_TERMS} for a distribution)`
+        );
+    }
+    return memoizeDistribution(
+        JSON.stringify(['expression', plan.expression]),
+        () => termsDistribution(plan.terms)
+    );
+}
@@ -7,12 +7,22 @@
  * Standard roll is 4dF, results typically range from -4 to +4
  */
 
+import { getFacesSumDistribution } from './DiceLibrary.js';
+import { getDefaultRng } from './Random.js';
+
+/**
+ * Face values of a Fate die: minus, blank, plus
+ * @type {number[]}
+ */
+const FATE_FACES = [-1, 0, 1];
+
 /**
  * Roll a single Fate die
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { value: number (-1, 0, 1), symbol: string (-, 0, +) }
  */
-export function rollFateDie() {
-    const result = Math.floor(Math.random() * 3); // 0, 1, or 2
+export function rollFateDie(rng = getDefaultRng()) {
+    const result = rng.nextInt(3); // 0, 1, or 2
 
     switch (result) {
         case 0:
@@ -30,16 +40,17 @@ export function rollFateDie() {
 /**
  * Roll multiple Fate dice (standard is 4dF)
  * @param {number} [numDice=4] - Number of Fate dice to roll
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { rolls: Array, total: number, symbols: string }
  */
-export function rollFateDice(numDice = 4) {
+export function rollFateDice(numDice = 4, rng = getDefaultRng()) {
     if (!Number.isInteger(numDice) || numDice < 1) {
         throw new Error(`Invalid number of dice: ${numDice}. Must be a positive integer.`);
     }
 
     const rolls = [];
     for (let i = 0; i < numDice; i++) {
-        rolls.push(rollFateDie());
+        rolls.push(rollFateDie(rng));
     }
 
     const total = rolls.reduce((sum, roll) => sum + roll.value, 0);
@@ -130,26 +141,18 @@ export function interpretFateRoll(total, skillLevel = 0) {
 
 /**
  * Calculate probability distribution for Fate dice
+ * Exact, for any number of dice (sum of numDice rolls of a [-1, 0, +1] die)
  * @param {number} [numDice=4] - Number of Fate dice
- * @returns {Object} - Map of result -> probability
+ * @returns {Object} - Map of result (formatted like formatFateTotal) -> probability
+ * @throws {Error} - If numDice is not a positive integer
  */
 export function getFateProbabilities(numDice = 4) {
-    // For 4dF, the probabilities are well-known
-    if (numDice === 4) {
-        return {
-            '-4': 0.0123,  // 1.23%
-            '-3': 0.0494,  // 4.94%
-            '-2': 0.1235,  // 12.35%
-            '-1': 0.1975,  // 19.75%
-            '0': 0.2346,   // 23.46%
-            '+1': 0.1975,  // 19.75%
-            '+2': 0.1235,  // 12.35%
-            '+3': 0.0494,  // 4.94%
-            '+4': 0.0123   // 1.23%
-        };
-    }
+    const pmf = getFacesSumDistribution(FATE_FACES, numDice);
+
+    const probabilities = {};
+    pmf.probs.forEach((probability, i) => {
+        probabilities[formatFateTotal(pmf.min + i)] = probability;
+    });
 
-    // For other numbers, would need to calculate combinatorially
-    // This is a simplified version
-    throw new Error('Probability calculation only implemented for 4dF');
+    return probabilities;
 }
@@ -5,7 +5,9 @@
  * Completely domain-agnostic - works with any type of history entry.
  *
  * Separation of concerns:
- * - This module: Generic DOM manipulation (create, add, clear)
+ * - This module: Generic DOM manipulation (create, add, clear), plus a
+ *   DOM-free history store with a virtualized view and IndexedDB persistence
+ *   for long sessions
  * - Domain modules (DiceLibrary, Fate, etc.): Format domain-specific text
  * - UI layer (HTML): Get inputs, call functions, update display
  */
@@ -63,7 +65,7 @@ export function addToHistory(historyContainer, entryElement, options = {}) {
     historyContainer.insertBefore(entryElement, historyContainer.firstChild);
 
     // Enforce max entries limit
-    while (historyContainer.children.length > maxEntries) {
+    for (let excess = historyContainer.children.length - maxEntries; excess > 0; excess--) {
         historyContainer.removeChild(historyContainer.lastChild);
     }
 }
@@ -121,3 +123,680 @@ export function removeHistoryEntry(historyContainer, entryElement) {
 export function getHistoryEntries(historyContainer, className = 'history-entry') {
     return Array.from(historyContainer.getElementsByClassName(className));
 }
+
+// ============================================================================
+// HISTORY STORE
+// ============================================================================
+//
+// The store keeps the session as structured entries in a fixed-size ring
+// buffer, so memory stays constant however long the session runs:
+//   { id, time, text, html, className, data }
+// id increases for the whole session (and across reloads when persisted);
+// text is the plain-text form used for export; html, when set, is rendered
+// instead of text; data holds any domain details the page wants to keep.
+//
+// A view renders the store into a scrolling container. Only the visible rows
+// (plus a few either side) exist in the DOM, each row is measured so entries
+// can wrap, and store changes and scrolling are applied at most once per
+// animation frame.
+
+/**
+ * Entries kept by createHistoryStore() when no capacity is given
+ * @type {number}
+ */
+export const DEFAULT_HISTORY_CAPACITY = 5000;
+
+/**
+ * Row height assumed for rows a view has not measured yet
+ * @type {number}
+ */
+export const DEFAULT_HISTORY_ROW_HEIGHT = 48;
+
+// Rows rendered when the container has no height yet
+const DEFAULT_VISIBLE_ROWS = 10;
+
+/**
+ * Create a bounded history store
+ * @param {number} [capacity=DEFAULT_HISTORY_CAPACITY] - Maximum entries kept; the oldest are dropped
+ * @returns {Object} - Store with add(), get(), toArray(), clear(), restore(), subscribe(), size and capacity
+ *
+ * @example
+ * const history = createHistoryStore(1000);
+ * history.add({ text: 'Rolled 3d6: 4, 2, 6 = 12', data: { total: 12 } });
+ * history.get(0).text; // most recent entry
+ */
+export function createHistoryStore(capacity = DEFAULT_HISTORY_CAPACITY) {
+    if (!Number.isInteger(capacity) || capacity < 1) {
+        throw new Error(`Invalid capacity: ${capacity}. Must be a positive integer.`);
+    }
+
+    const slots = new Array(capacity);
+    const listeners = new Set();
+    let head = 0; // Next slot to write
+    let size = 0;
+    let nextId = 1;
+
+    function notify(change) {
+        for (const listener of listeners) {
+            listener(change);
+        }
+    }
+
+    function createEntry(entry, id) {
+        return {
+            id,
+            time: entry.time ?? Date.now(),
+            text: entry.text ?? '',
+            html: entry.html ?? null,
+            className: entry.className ?? 'history-entry',
+            data: entry.data ?? null
+        };
+    }
+
+    function push(entry) {
+        const evicted = size === capacity ? slots[head] : null;
+        slots[head] = entry;
+        head = (head + 1) % capacity;
+        size = Math.min(size + 1, capacity);
+        return evicted;
+    }
+
+    function toArray() {
+        const entries = new Array(size);
+        for (let i = 0; i < size; i++) {
+            entries[i] = slots[(head - 1 - i + capacity) % capacity];
+        }
+        return entries;
+    }
+
+    return {
+        capacity,
+
+        get size() {
+            return size;
+        },
+
+        /**
+         * Add an entry as the most recent
+         * @param {Object} entry - { text, html?, className?, data?, time? }
+         * @returns {Object} - The stored entry, with its id
+         */
+        add(entry) {
+            const stored = createEntry(entry, nextId++);
+            const evicted = push(stored);
+            notify({ type: 'add', entry: stored, evicted });
+            return stored;
+        },
+
+        /**
+         * Get an entry by position, most recent first
+         * @param {number} index - 0 for the most recent entry
+         * @returns {Object|null} - The entry, or null if out of range
+         */
+        get(index) {
+            if (!Number.isInteger(index) || index < 0 || index >= size) {
+                return null;
+            }
+            return slots[(head - 1 - index + capacity) % capacity];
+        },
+
+        /**
+         * Get every entry, most recent first
+         * @returns {Object[]} - Entries
+         */
+        toArray,
+
+        /**
+         * Remove every entry (ids keep increasing afterwards)
+         */
+        clear() {
+            slots.fill(undefined);
+            head = 0;
+            size = 0;
+            notify({ type: 'clear' });
+        },
+
+        /**
+         * Load older entries (e.g. from a previous visit) beneath the current ones
+         * Current entries keep their order but are renumbered after the restored ids.
+         * @param {Object[]} entries - Entries with ids, oldest first
+         * @returns {Object[]} - The current entries that were renumbered, oldest first
+         */
+        restore(entries) {
+            const current = toArray().reverse();
+            const restored = entries.slice(-capacity);
+            slots.fill(undefined);
+            head = 0;
+            size = 0;
+
+            for (const entry of restored) {
+                push(createEntry(entry, entry.id));
+                nextId = Math.max(nextId, entry.id + 1);
+            }
+            const renumbered = current.map(entry => createEntry(entry, nextId++));
+            renumbered.forEach(push);
+
+            notify({ type: 'restore' });
+            return renumbered;
+        },
+
+        /**
+         * Listen for changes: { type: 'add', entry, evicted }, { type: 'clear' } or { type: 'restore' }
+         * @param {Function} listener - Called after each change
+         * @returns {Function} - Call to stop listening
+         */
+        subscribe(listener) {
+            listeners.add(listener);
+            return () => listeners.delete(listener);
+        }
+    };
+}
+
+/**
+ * Render a store entry as a history element
+ * @param {Object} entry - Store entry
+ * @returns {HTMLDivElement} - Entry element
+ */
+export function renderHistoryEntry(entry) {
+    const element = entry.html !== null
+        ? createComplexHistoryEntry(entry.html, entry.className)
+        : createHistoryEntry(entry.text, entry.className);
+    element.title = entry.text;
+    return element;
+}
+
+/**
+ * Schedule a callback for the next animation frame
+ * @param {Function} callback - Callback
+ * @returns {Function} - Call to cancel
+ */
+function requestFrame(callback) {
+    if (typeof requestAnimationFrame === 'function') {
+        const handle = requestAnimationFrame(callback);
+        return () => cancelAnimationFrame(handle);
+    }
+    const handle = setTimeout(callback, 16);
+    return () => clearTimeout(handle);
+}
+
+/**
+ * Render a history store into a scrolling container, most recent first
+ * Rows are absolutely positioned inside a spacer as tall as the whole history,
+ * so only the rows in view (plus overscan) are in the DOM. Each row's height is
+ * measured once it is rendered; rows not rendered yet are assumed to be as tall
+ * as the average measured row (or options.rowHeight before any are measured).
+ * @param {HTMLElement} container - Scrolling container (e.g. .roll-history); its contents are replaced
+ * @param {Object} store - History store (see createHistoryStore())
+ * @param {Object} [options={}] - Optional configuration
+ * @param {number} [options.rowHeight=DEFAULT_HISTORY_ROW_HEIGHT] - Estimated row height in pixels, including the gap below it
+ * @param {number} [options.overscan=4] - Extra rows rendered above and below the visible ones
+ * @param {boolean} [options.animate=false] - Add the animation class to new entries
+ * @param {Function} [options.renderEntry=renderHistoryEntry] - Builds the element for an entry
+ * @returns {Object} - { flush(), destroy() }; flush() renders pending changes immediately
+ */
+export function createHistoryView(container, store, options = {}) {
+    const {
+        rowHeight = DEFAULT_HISTORY_ROW_HEIGHT,
+        overscan = 4,
+        animate = false,
+        renderEntry = renderHistoryEntry
+    } = options;
+
+    container.innerHTML = '';
+    container.classList.add('history-virtual');
+    const spacer = document.createElement('div');
+    spacer.className = 'history-virtual-spacer';
+    container.appendChild(spacer);
+
+    const rows = new Map(); // entry id -> element
+    const heights = new Map(); // entry id -> measured height, for entries still in the store
+    const newIds = new Set();
+    let measuredTotal = 0;
+    let addedIds = [];
+    let offsets = new Float64Array(1); // offsets[i] = top of row i; offsets[count] = total height
+    let cancelFrame = null;
+
+    function schedule() {
+        if (cancelFrame === null) {
+            cancelFrame = requestFrame(render);
+        }
+    }
+
+    function removeAllRows() {
+        for (const element of rows.values()) {
+            element.remove();
+        }
+        rows.clear();
+    }
+
+    function forgetHeights() {
+        heights.clear();
+        measuredTotal = 0;
+    }
+
+    function setHeight(id, height) {
+        measuredTotal += height;
+        heights.set(id, height);
+    }
+
+    function forgetHeight(id) {
+        if (heights.has(id)) {
+            measuredTotal -= heights.get(id);
+            heights.delete(id);
+        }
+    }
+
+    function estimatedHeight() {
+        return heights.size > 0 ? measuredTotal / heights.size : rowHeight;
+    }
+
+    function heightOf(id) {
+        return heights.get(id) ?? estimatedHeight();
+    }
+
+    function layout(count) {
+        if (offsets.length !== count + 1) {
+            offsets = new Float64Array(count + 1);
+        }
+        for (let i = 0; i < count; i++) {
+            offsets[i + 1] = offsets[i] + heightOf(store.get(i).id);
+        }
+        spacer.style.height = `${offsets[count]}px`;
+    }
+
+    // Smallest index i in [from, count] with offsets[i] >= y (or > y when not inclusive)
+    function offsetIndex(y, from, count, inclusive) {
+        let low = from;
+        let high = count;
+        while (low < high) {
+            const mid = (low + high) >>> 1;
+            if (inclusive ? offsets[mid] >= y : offsets[mid] > y) {
+                high = mid;
+            } else {
+                low = mid + 1;
+            }
+        }
+        return low;
+    }
+
+    function measure(element) {
+        // Not laid out (hidden, or no layout engine): keep the estimate
+        if (!(element.offsetHeight > 0)) {
+            return null;
+        }
+        const style = typeof getComputedStyle === 'function' ? getComputedStyle(element) : null;
+        const marginBottom = style ? parseFloat(style.marginBottom) || 0 : 0;
+        return element.offsetHeight + marginBottom;
+    }
+
+    function render() {
+        cancelFrame = null;
+        const count = store.size;
+
+        // Keep the rows the reader is looking at in place when new ones arrive on top
+        if (addedIds.length > 0 && container.scrollTop > 0) {
+            layout(count);
+            container.scrollTop += addedIds.reduce((sum, id) => sum + heightOf(id), 0);
+        }
+        addedIds = [];
+        layout(count);
+
+        const top = container.scrollTop;
+        const viewport = container.clientHeight || estimatedHeight() * DEFAULT_VISIBLE_ROWS;
+        // Rows whose bottom is below the top of the viewport and whose top is above its bottom
+        const firstVisible = Math.max(0, offsetIndex(top, 1, count, false) - 1);
+        const endVisible = offsetIndex(top + viewport, firstVisible, count, true);
+        const first = Math.max(0, firstVisible - overscan);
+        const last = Math.min(count, endVisible + overscan);
+        const visible = new Set();
+        let resized = false;
+
+        for (let i = first; i < last; i++) {
+            const entry = store.get(i);
+            visible.add(entry.id);
+
+            let element = rows.get(entry.id);
+            if (!element) {
+                element = renderEntry(entry);
+                if (newIds.has(entry.id)) {
+                    element.classList.add('history-entry-new');
+                }
+                rows.set(entry.id, element);
+                spacer.appendChild(element);
+            }
+            if (!heights.has(entry.id)) {
+                const height = measure(element);
+                if (height !== null) {
+                    setHeight(entry.id, height);
+                    resized = true;
+                }
+            }
+        }
+
+        for (const [id, element] of rows) {
+            if (!visible.has(id)) {
+                element.remove();
+                rows.delete(id);
+            }
+        }
+        newIds.clear();
+
+        if (resized) {
+            layout(count);
+        }
+        for (let i = first; i < last; i++) {
+            rows.get(store.get(i).id).style.transform = `translateY(${offsets[i]}px)`;
+        }
+    }
+
+    const unsubscribe = store.subscribe(change => {
+        if (change.type === 'add') {
+            addedIds.push(change.entry.id);
+            if (change.evicted) {
+                forgetHeight(change.evicted.id);
+            }
+            if (animate) {
+                newIds.add(change.entry.id);
+            }
+        } else {
+            addedIds = [];
+            removeAllRows();
+            forgetHeights();
+        }
+        schedule();
+    });
+
+    // Rows wrap differently at a new width, so measure them again
+    let lastWidth = container.clientWidth;
+    const resizeObserver = typeof ResizeObserver === 'function' ? new ResizeObserver(() => {
+        if (container.clientWidth !== lastWidth) {
+            lastWidth = container.clientWidth;
+            forgetHeights();
+            schedule();
+        }
+    }) : null;
+    if (resizeObserver) {
+        resizeObserver.observe(container);
+    }
+
+    container.addEventListener('scroll', schedule, { passive: true });
+    schedule();
+
+    return {
+        flush() {
+            if (cancelFrame !== null) {
+                cancelFrame();
+            }
+            render();
+        },
+
+        destroy() {
+            if (cancelFrame !== null) {
+                cancelFrame();
+                cancelFrame = null;
+            }
+            unsubscribe();
+            if (resizeObserver) {
+                resizeObserver.disconnect();
+            }
+            container.removeEventListener('scroll', schedule);
+            container.classList.remove('history-virtual');
+            container.innerHTML = '';
+            rows.clear();
+            forgetHeights();
+        }
+    };
+}
+
+// ============================================================================
+// EXPORT AND PERSISTENCE
+// ============================================================================
+
+/**
+ * Serialize a history store, oldest entry first
+ * @param {Object} store - History store
+ * @param {string} [format='json'] - 'json' (every field) or 'text' (one line per entry)
+ * @returns {string} - Exported history
+ */
+export function exportHistory(store, format = 'json') {
+    const entries = store.toArray().reverse();
+
+    if (format === 'json') {
+        return JSON.stringify({ version: 1, exported: new Date().toISOString(), entries }, null, 2);
+    }
+    if (format === 'text') {
+        return entries.map(entry => `${new Date(entry.time).toISOString()}  ${entry.text}`).join('\n');
+    }
+    throw new Error(`Invalid format: ${format}. Must be 'json' or 'text'.`);
+}
+
+/**
+ * Offer a history store as a file download
+ * @param {Object} store - History store
+ * @param {string} filename - Suggested file name
+ * @param {string} [format='json'] - 'json' or 'text' (see exportHistory())
+ */
+export function downloadHistory(store, filename, format = 'json') {
+    const type = format === 'json' ? 'application/json' : 'text/plain';
+    const url = URL.createObjectURL(new Blob([exportHistory(store, format)], { type }));
+
+    const link = document.createElement('a');
+    link.href = url;
+    link.download = filename;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    URL.revokeObjectURL(url);
+}
+
+/**
+ * IndexedDB database used by persistHistory()
+ * @type {string}
+ */
+export const HISTORY_DB_NAME = 'dice-history';
+
+/**
+ * Entries kept on disk per log by persistHistory() when no limit is given
+ * @type {number}
+ */
+export const DEFAULT_MAX_PERSISTED = 20000;
+
+const HISTORY_DB_VERSION = 1;
+const HISTORY_OBJECT_STORE = 'entries';
+
+/**
+ * Wrap an IndexedDB request in a promise
+ * @param {IDBRequest} request - Request
+ * @returns {Promise} - Resolves with the request's result
+ */
+function requestToPromise(request) {
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => resolve(request.result);
+        request.onerror = () => reject(request.error);
+    });
+}
+
+/**
+ * Wait for an IndexedDB transaction to commit
+ * @param {IDBTransaction} transaction - Transaction
+ * @returns {Promise} - Resolves on complete
+ */
+function transactionDone(transaction) {
+    return new Promise((resolve, reject) => {
+        transaction.oncomplete = () => resolve();
+        transaction.onerror = () => reject(transaction.error);
+        transaction.onabort = () => reject(transaction.error);
+    });
+}
+
+/**
+ * Open (creating if needed) the history database
+ * Entries of every log share one object store, keyed by [log, id].
+ * @param {string} dbName - Database name
+ * @returns {Promise<IDBDatabase>} - Database
+ */
+function openHistoryDatabase(dbName) {
+    const request = indexedDB.open(dbName, HISTORY_DB_VERSION);
+    request.onupgradeneeded = () => {
+        request.result.createObjectStore(HISTORY_OBJECT_STORE, { keyPath: ['log', 'id'] });
+    };
+    return requestToPromise(request);
+}
+
+/**
+ * Key range covering a log's entries with ids up to maxId
+ * @param {string} log - Log name
+ * @param {number} [maxId=Infinity] - Largest id included
+ * @returns {IDBKeyRange} - Key range
+ */
+function logRange(log, maxId = Infinity) {
+    return IDBKeyRange.bound([log, -Infinity], [log, maxId]);
+}
+
+/**
+ * Read a log's most recent entries
+ * @param {IDBDatabase} db - Database
+ * @param {string} log - Log name
+ * @param {number} limit - Maximum entries to read
+ * @returns {Promise<Object[]>} - Entries, oldest first
+ */
+function readRecentEntries(db, log, limit) {
+    const objectStore = db.transaction(HISTORY_OBJECT_STORE, 'readonly').objectStore(HISTORY_OBJECT_STORE);
+    const request = objectStore.openCursor(logRange(log), 'prev');
+    const entries = [];
+
+    return new Promise((resolve, reject) => {
+        request.onsuccess = () => {
+            const cursor = request.result;
+            if (cursor && entries.length < limit) {
+                entries.push(cursor.value);
+                cursor.continue();
+            } else {
+                resolve(entries.reverse());
+            }
+        };
+        request.onerror = () => reject(request.error);
+    });
+}
+
+/**
+ * Keep a history store in IndexedDB across page loads
+ * Restores the log's most recent entries into the store, then writes each new
+ * entry as it is added; entries added in the same task share one transaction.
+ * Only the newest maxPersisted entries are kept on disk, and clearing the
+ * store clears the log.
+ * @param {Object} store - History store (see createHistoryStore())
+ * @param {Object} [options={}] - Optional configuration
+ * @param {string} [options.log='history'] - Log name (one per page)
+ * @param {string} [options.dbName=HISTORY_DB_NAME] - Database name
+ * @param {number} [options.maxPersisted=DEFAULT_MAX_PERSISTED] - Entries kept on disk
+ * @returns {Promise<Object|null>} - { flush(), close() }, or null if IndexedDB is unavailable
+ */
+export async function persistHistory(store, options = {}) {
+    const { log = 'history', dbName = HISTORY_DB_NAME, maxPersisted = DEFAULT_MAX_PERSISTED } = options;
+
+    if (!persistHistory.available()) {
+        return null;
+    }
+    if (!Number.isInteger(maxPersisted) || maxPersisted < 1) {
+        throw new Error(`Invalid maxPersisted: ${maxPersisted}. Must be a positive integer.`);
+    }
+
+    const db = await openHistoryDatabase(dbName);
+    let pending = [];
+    let clearPending = false;
+    let lastId = 0;
+    let flushing = null;
+
+    async function write() {
+        const entries = pending;
+        const clear = clearPending;
+        pending = [];
+        clearPending = false;
+
+        const transaction = db.transaction(HISTORY_OBJECT_STORE, 'readwrite');
+        const objectStore = transaction.objectStore(HISTORY_OBJECT_STORE);
+        if (clear) {
+            objectStore.delete(logRange(log));
+        }
+        for (const entry of entries) {
+            objectStore.put({ ...entry, log });
+            lastId = Math.max(lastId, entry.id);
+        }
+        if (lastId > maxPersisted) {
+            objectStore.delete(logRange(log, lastId - maxPersisted));
+        }
+        await transactionDone(transaction);
+    }
+
+    function flush() {
+        if (!flushing) {
+            flushing = Promise.resolve().then(write).catch(error => {
+                // A failed batch is dropped; later entries are still written
+                console.warn('Could not save history entries:', error);
+            }).finally(() => {
+                flushing = null;
+                // Entries added while this batch was being written
+                if (pending.length > 0 || clearPending) {
+                    flush();
+                }
+            });
+        }
+        return flushing;
+    }
+
+    async function flushAll() {
+        while (flushing || pending.length > 0 || clearPending) {
+            await flush();
+        }
+    }
+
+    function queue(entries) {
+        pending.push(...entries);
+        flush();
+    }
+
+    // Entries added while the database was opening get ids after the restored ones
+    const saved = await readRecentEntries(db, log, store.capacity);
+    lastId = saved.length > 0 ? saved[saved.length - 1].id : 0;
+    const unsaved = store.restore(saved);
+    if (unsaved.length > 0) {
+        queue(unsaved);
+    }
+
+    const unsubscribe = store.subscribe(change => {
+        if (change.type === 'add') {
+            queue([change.entry]);
+        } else if (change.type === 'clear') {
+            pending = [];
+            clearPending = true;
+            flush();
+        }
+    });
+
+    return {
+        /**
+         * Wait until every entry added so far is written
+         * @returns {Promise} - Resolves when written
+         */
+        flush: flushAll,
+
+        /**
+         * Stop persisting, write what is pending and close the database
+         * @returns {Promise} - Resolves once closed
+         */
+        async close() {
+            unsubscribe();
+            await flushAll();
+            db.close();
+        }
+    };
+}
+
+/**
+ * Check whether persistHistory() can be used here
+ * @returns {boolean} - True if IndexedDB exists
+ */
+persistHistory.available = function () {
+    return typeof indexedDB !== 'undefined';
+};
@@ -47,6 +47,71 @@ const DEFAULT_NICKNAME_FREQUENCY = 0.25;
  */
 const DEFAULT_TITLE_FREQUENCY = 0.10;
 
+/**
+ * Maximum number of alias tables kept in memory by getWeightedName().
+ * Each table covers one (position, genders, source tags) combination;
+ * the least recently used table is evicted when the cache is full.
+ * @constant {number}
+ */
+const ALIAS_TABLE_CACHE_SIZE = 64;
+
+/**
+ * Maximum number of prepared statements kept open by execParams().
+ * The least recently used statement is freed when the cache is full.
+ * @constant {number}
+ */
+const STATEMENT_CACHE_SIZE = 32;
+
+/**
+ * Rows fetched per page by searchNames() (Database Viewer).
+ * @constant {number}
+ */
+const VIEWER_PAGE_SIZE = 200;
+
+/**
+ * Shortest search text that uses the trigram full-text index.
+ * Trigram tokens need at least three characters; shorter text falls back to LIKE.
+ * @constant {number}
+ */
+const MIN_FULL_TEXT_SEARCH_LENGTH = 3;
+
+/**
+ * Columns returned by buildNameSearchQuery(), in order.
+ * @constant {string[]}
+ */
+const NAME_VIEWER_COLUMNS = ['id', 'name', 'position', 'gender', 'weight', 'sources', 'vibes', 'themes'];
+
+/**
+ * Magic bytes at the start of every name bundle shard (see export_bundle.py).
+ * @constant {string}
+ */
+const BUNDLE_MAGIC = 'NGB1';
+
+/**
+ * Name bundle manifest version this module understands.
+ * @constant {number}
+ */
+const BUNDLE_VERSION = 1;
+
+/**
+ * Bytes before the first array in a shard: magic, count, string bytes, reserved.
+ * @constant {number}
+ */
+const BUNDLE_SHARD_HEADER_BYTES = 16;
+
+/**
+ * Cache Storage bucket for downloaded shards. Shard file names contain a
+ * content hash, so cached entries never go stale.
+ * @constant {string}
+ */
+const BUNDLE_CACHE_NAME = 'name-bundle-v1';
+
+/**
+ * Manifest shard key for names that have no source tag.
+ * @constant {string}
+ */
+const BUNDLE_UNTAGGED_SHARD = 'untagged';
+
 // ============================================================================
 // STATE
 // ============================================================================
@@ -57,6 +122,55 @@ const DEFAULT_TITLE_FREQUENCY = 0.10;
  */
 let db = null;
 
+/**
+ * Cached alias tables for weighted sampling, keyed by filter combination.
+ * Map iteration order doubles as LRU order (oldest first).
+ * Cleared whenever initDatabase() loads a database.
+ * @type {Map<string, {names: string[], table: {prob: Float64Array, alias: Uint32Array}}>}
+ */
+const aliasTableCache = new Map();
+
+/**
+ * Prepared statements reused by execParams(), keyed by SQL text.
+ * Map iteration order doubles as LRU order (oldest first).
+ * @type {Map<string, Statement>}
+ */
+const statementCache = new Map();
+
+/**
+ * Memoized reference data (source tags, genders, positions, stats, Default tag id).
+ * Only reset when initDatabase() loads a database.
+ * @type {Map<string, *>}
+ */
+const lookupCache = new Map();
+
+/**
+ * Loaded name bundle (manifest plus base URL), set by initBundle().
+ * @type {{baseUrl: string, manifest: Object}|null}
+ */
+let bundle = null;
+
+/**
+ * Parsed bundle shards (or their pending loads), keyed by file name.
+ * @type {Map<string, Promise<Object>>}
+ */
+const shardCache = new Map();
+
+/**
+ * Hit/miss counters for the caches above, reported by getCacheStats().
+ */
+const cacheCounters = {
+    statementHits: 0,
+    statementMisses: 0,
+    statementEvictions: 0,
+    lookupHits: 0,
+    lookupMisses: 0,
+    aliasTableHits: 0,
+    aliasTableMisses: 0,
+    shardFetches: 0,
+    shardStorageHits: 0
+};
+
 // ============================================================================
 // DATABASE INITIALIZATION
 // ============================================================================
@@ -84,6 +198,9 @@ async function initDatabase(dbPath = 'names.db') {
     }
 
     const buffer = await response.arrayBuffer();
+
+    // Statements, tables and lookups built from a previous database are no longer valid
+    clearDatabaseCaches();
     db = new SQL.Database(new Uint8Array(buffer));
 
     return db;
@@ -104,6 +221,108 @@ function getDatabase() {
     return db;
 }
 
+// ============================================================================
+// CACHES
+// ============================================================================
+
+/**
+ * Get a prepared statement for sql, compiling it only on a cache miss.
+ *
+ * @param {string} sql - SQL query with ? placeholders
+ * @returns {Statement} A prepared statement owned by the cache (do not free it)
+ */
+function getCachedStatement(sql) {
+    let stmt = statementCache.get(sql);
+    if (stmt) {
+        cacheCounters.statementHits++;
+        // Refresh LRU position
+        statementCache.delete(sql);
+        statementCache.set(sql, stmt);
+        return stmt;
+    }
+
+    cacheCounters.statementMisses++;
+    stmt = db.prepare(sql);
+    statementCache.set(sql, stmt);
+
+    if (statementCache.size > STATEMENT_CACHE_SIZE) {
+        const [oldestSql, oldestStmt] = statementCache.entries().next().value;
+        statementCache.delete(oldestSql);
+        oldestStmt.free();
+        cacheCounters.statementEvictions++;
+    }
+
+    return stmt;
+}
+
+/**
+ * Return the memoized value for key, computing it on first use.
+ *
+ * @param {string} key - Lookup name
+ * @param {function(): *} compute - Produces the value on a cache miss
+ * @returns {*} The cached value (shared - copy before mutating)
+ */
+function memoizeLookup(key, compute) {
+    if (lookupCache.has(key)) {
+        cacheCounters.lookupHits++;
+        return lookupCache.get(key);
+    }
+
+    cacheCounters.lookupMisses++;
+    const value = compute();
+    lookupCache.set(key, value);
+    return value;
+}
+
+/**
+ * Free cached statements and discard alias tables and memoized lookups.
+ * Called by initDatabase(); call it yourself after modifying the loaded database.
+ */
+function clearDatabaseCaches() {
+    statementCache.forEach(stmt => stmt.free());
+    statementCache.clear();
+    lookupCache.clear();
+    aliasTableCache.clear();
+}
+
+/**
+ * Get hit/miss counters and sizes for the statement, lookup and alias table caches.
+ * Counters accumulate for the lifetime of the page.
+ *
+ * @returns {{statements: Object, lookups: Object, aliasTables: Object, shards: Object}} Cache statistics
+ *
+ * @example
+ * const { statements } = getCacheStats();
+ * console.log(`${statements.hits} statement cache hits, ${statements.misses} misses`);
+ */
+function getCacheStats() {
+    return {
+        statements: {
+            size: statementCache.size,
+            capacity: STATEMENT_CACHE_SIZE,
+            hits: cacheCounters.statementHits,
+            misses: cacheCounters.statementMisses,
+            evictions: cacheCounters.statementEvictions
+        },
+        lookups: {
+            size: lookupCache.size,
+            hits: cacheCounters.lookupHits,
+            misses: cacheCounters.lookupMisses
+        },
+        aliasTables: {
+            size: aliasTableCache.size,
+            capacity: ALIAS_TABLE_CACHE_SIZE,
+            hits: cacheCounters.aliasTableHits,
+            misses: cacheCounters.aliasTableMisses
+        },
+        shards: {
+            size: shardCache.size,
+            fetches: cacheCounters.shardFetches,
+            storageHits: cacheCounters.shardStorageHits
+        }
+    };
+}
+
 // ============================================================================
 // HELPER FUNCTIONS
 // ============================================================================
@@ -111,6 +330,8 @@ function getDatabase() {
 /**
  * Execute a parameterized query and return all results.
  * This is the RECOMMENDED and SECURE way to execute queries with user input.
+ * Statements are compiled once per distinct SQL string and reused, so keep the
+ * SQL text fixed and pass variable lists as JSON arrays (see json_each() below).
  *
  * @param {string} sql - SQL query with ? placeholders
  * @param {Array} params - Array of parameter values
@@ -120,14 +341,17 @@ function getDatabase() {
  * const results = execParams("SELECT * FROM tags WHERE tag_name = ?", ["Blades 68"]);
  */
 function execParams(sql, params = []) {
-    const stmt = db.prepare(sql);
-    stmt.bind(params);
+    const stmt = getCachedStatement(sql);
 
     const results = [];
-    while (stmt.step()) {
-        results.push(stmt.get());
+    try {
+        stmt.bind(params);
+        while (stmt.step()) {
+            results.push(stmt.get());
+        }
+    } finally {
+        stmt.reset();
     }
-    stmt.free();
 
     return results;
 }
@@ -160,25 +384,29 @@ function escapeSQL(value) {
  * // [{ id: 1, name: 'Blades 68', parentId: null, parentName: null }, ...]
  */
 function getSourceTags() {
-    const result = db.exec(`
-        SELECT t.id, t.tag_name, t.parent_tag_id, p.tag_name as parent_name
-        FROM tags t
-        LEFT JOIN tags p ON t.parent_tag_id = p.id
-        WHERE t.tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
-        ORDER BY
-            CASE WHEN t.parent_tag_id IS NULL THEN t.tag_name ELSE p.tag_name END,
-            CASE WHEN t.parent_tag_id IS NULL THEN 0 ELSE 1 END,
-            t.tag_name
-    `);
-
-    if (result.length === 0) return [];
+    const tags = memoizeLookup('sourceTags', () => {
+        const result = db.exec(`
+            SELECT t.id, t.tag_name, t.parent_tag_id, p.tag_name as parent_name
+            FROM tags t
+            LEFT JOIN tags p ON t.parent_tag_id = p.id
+            WHERE t.tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
+            ORDER BY
+                CASE WHEN t.parent_tag_id IS NULL THEN t.tag_name ELSE p.tag_name END,
+                CASE WHEN t.parent_tag_id IS NULL THEN 0 ELSE 1 END,
+                t.tag_name
+        `);
+
+        if (result.length === 0) return [];
+
+        return result[0].values.map(([id, name, parentId, parentName]) => ({
+            id,
+            name,
+            parentId,
+            parentName
+        }));
+    });
 
-    return result[0].values.map(([id, name, parentId, parentName]) => ({
-        id,
-        name,
-        parentId,
-        parentName
-    }));
+    return tags.map(tag => ({ ...tag }));
 }
 
 /**
@@ -193,22 +421,17 @@ function getSourceTags() {
  * // Returns IDs for 'Blades 68' and all its children like 'Blades - Akoros'
  */
 function getTagIdsForSources(sourceNames) {
-    const tagIds = [];
-
-    sourceNames.forEach(source => {
-        const sql = `
-            SELECT id FROM tags WHERE tag_name = ?
-            UNION
-            SELECT id FROM tags WHERE parent_tag_id = (SELECT id FROM tags WHERE tag_name = ?)
-        `;
-        const tagResult = execParams(sql, [source, source]);
-
-        tagResult.forEach(row => {
-            tagIds.push(row[0]);
-        });
-    });
+    // One fixed statement for any number of sources (names passed as a JSON array)
+    const sql = `
+        SELECT id FROM tags WHERE tag_name IN (SELECT value FROM json_each(?))
+        UNION
+        SELECT id FROM tags WHERE parent_tag_id IN (
+            SELECT id FROM tags WHERE tag_name IN (SELECT value FROM json_each(?))
+        )
+    `;
+    const sourcesJson = JSON.stringify(sourceNames);
 
-    return tagIds;
+    return execParams(sql, [sourcesJson, sourcesJson]).map(row => row[0]);
 }
 
 /**
@@ -221,9 +444,11 @@ function getTagIdsForSources(sourceNames) {
  * // ['male', 'female', 'ambiguous', 'queer', 'any']
  */
 function getGenders() {
-    const result = db.exec('SELECT gender FROM genders ORDER BY id');
-    if (result.length === 0) return [];
-    return result[0].values.map(row => row[0]);
+    return [...memoizeLookup('genders', () => {
+        const result = db.exec('SELECT gender FROM genders ORDER BY id');
+        if (result.length === 0) return [];
+        return result[0].values.map(row => row[0]);
+    })];
 }
 
 /**
@@ -236,9 +461,42 @@ function getGenders() {
  * // ['first', 'last', 'title', 'nickname']
  */
 function getPositions() {
-    const result = db.exec('SELECT position FROM positions ORDER BY position');
-    if (result.length === 0) return [];
-    return result[0].values.map(row => row[0]);
+    return [...memoizeLookup('positions', () => {
+        const result = db.exec('SELECT position FROM positions ORDER BY position');
+        if (result.length === 0) return [];
+        return result[0].values.map(row => row[0]);
+    })];
+}
+
+/**
+ * Check whether the database has the tag_position_gender_counts rollup table.
+ * It is built by create_database.py and refreshed by import_names_from_csv.py;
+ * older databases without it fall back to counting names directly.
+ *
+ * @returns {boolean} True if the rollup table exists
+ */
+function hasTagCounts() {
+    return memoizeLookup('hasTagCounts', () => execParams(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tag_position_gender_counts'"
+    ).length > 0);
+}
+
+/**
+ * Check whether the names_fts full-text index exists and can be queried.
+ * False for databases built before the index was added, and for SQL.js
+ * builds compiled without FTS5; searchNames() then falls back to LIKE.
+ *
+ * @returns {boolean} True if MATCH queries against names_fts work
+ */
+function hasNameSearchIndex() {
+    return memoizeLookup('hasNameSearchIndex', () => {
+        try {
+            execParams('SELECT rowid FROM names_fts LIMIT 0');
+            return true;
+        } catch (error) {
+            return false;
+        }
+    });
 }
 
 /**
@@ -251,46 +509,41 @@ function getPositions() {
  * // { names: 1296, sources: 12, otherTags: 45, firstNames: 1006, lastNames: 507, nicknames: 193, titles: 57 }
  */
 function getDatabaseStats() {
-    const namesCount = db.exec('SELECT COUNT(*) as count FROM names')[0].values[0][0];
-    const sourcesCount = db.exec(`
-        SELECT COUNT(*) as count FROM tags
-        WHERE tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
-    `)[0].values[0][0];
-    const otherTagsCount = db.exec(`
-        SELECT COUNT(*) as count FROM tags
-        WHERE tag_type_id != (SELECT id FROM tag_types WHERE type_name = 'source')
-    `)[0].values[0][0];
-
-    // Get actual counts per position (not sum of source associations)
-    const firstNamesCount = db.exec(`
-        SELECT COUNT(*) as count FROM names
-        WHERE position_id = (SELECT id FROM positions WHERE position = 'first')
-    `)[0].values[0][0];
-
-    const lastNamesCount = db.exec(`
-        SELECT COUNT(*) as count FROM names
-        WHERE position_id = (SELECT id FROM positions WHERE position = 'last')
-    `)[0].values[0][0];
-
-    const nicknamesCount = db.exec(`
-        SELECT COUNT(*) as count FROM names
-        WHERE position_id = (SELECT id FROM positions WHERE position = 'nickname')
-    `)[0].values[0][0];
-
-    const titlesCount = db.exec(`
-        SELECT COUNT(*) as count FROM names
-        WHERE position_id = (SELECT id FROM positions WHERE position = 'title')
-    `)[0].values[0][0];
+    return { ...memoizeLookup('databaseStats', () => {
+        const namesCount = db.exec('SELECT COUNT(*) as count FROM names')[0].values[0][0];
+        const sourcesCount = db.exec(`
+            SELECT COUNT(*) as count FROM tags
+            WHERE tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
+        `)[0].values[0][0];
+        const otherTagsCount = db.exec(`
+            SELECT COUNT(*) as count FROM tags
+            WHERE tag_type_id != (SELECT id FROM tag_types WHERE type_name = 'source')
+        `)[0].values[0][0];
+
+        // Get actual counts per position (not sum of source associations),
+        // one pass over the position index instead of a query per position
+        const positionCounts = {};
+        const positionResult = db.exec(`
+            SELECT p.position, COUNT(n.id) as count FROM positions p
+            LEFT JOIN names n ON n.position_id = p.id
+            GROUP BY p.id
+        `);
+        if (positionResult.length > 0) {
+            positionResult[0].values.forEach(([position, count]) => {
+                positionCounts[position] = count;
+            });
+        }
 
-    return {
-        names: namesCount,
-        sources: sourcesCount,
-        otherTags: otherTagsCount,
-        firstNames: firstNamesCount,
-        lastNames: lastNamesCount,
-        nicknames: nicknamesCount,
-        titles: titlesCount
-    };
+        return {
+            names: namesCount,
+            sources: sourcesCount,
+            otherTags: otherTagsCount,
+            firstNames: positionCounts.first || 0,
+            lastNames: positionCounts.last || 0,
+            nicknames: positionCounts.nickname || 0,
+            titles: positionCounts.title || 0
+        };
+    }) };
 }
 
 // ============================================================================
@@ -384,6 +637,150 @@ function buildNameViewerQuery(filters = {}) {
     `;
 }
 
+/**
+ * Build a parameterized, paginated viewer query with optional text search.
+ *
+ * Pages are fetched with keyset pagination: pass the id of the last row of the
+ * previous page as afterId. Text search uses the names_fts trigram index
+ * (parameterized MATCH) when fullText is true and the text is long enough,
+ * and a LIKE over name, pronunciation and meaning otherwise.
+ *
+ * @param {Object} filters - Filter options
+ * @param {string} [filters.position] - Filter by position (e.g., 'first', 'last')
+ * @param {string} [filters.gender] - Filter by gender (e.g., 'male', 'female')
+ * @param {string} [filters.source] - Filter by source tag name, or '__ORPHANED__' for names without sources
+ * @param {string} [filters.text] - Substring to search for in name, pronunciation or meaning
+ * @param {Object} [options] - Paging options
+ * @param {number} [options.afterId=0] - Only return names with a larger id
+ * @param {number} [options.limit=VIEWER_PAGE_SIZE] - Maximum rows to return
+ * @param {boolean} [options.fullText=false] - Use the names_fts index (see hasNameSearchIndex())
+ * @returns {{sql: string, params: Array}} Query and its parameters, columns as NAME_VIEWER_COLUMNS
+ *
+ * @example
+ * const { sql, params } = buildNameSearchQuery({ text: 'ann' }, { fullText: hasNameSearchIndex() });
+ * const rows = execParams(sql, params);
+ */
+function buildNameSearchQuery(filters = {}, { afterId = 0, limit = VIEWER_PAGE_SIZE, fullText = false } = {}) {
+    const conditions = ['n.id > ?'];
+    const params = [afterId];
+
+    if (filters.position) {
+        conditions.push('p.position = ?');
+        params.push(filters.position);
+    }
+
+    if (filters.gender) {
+        conditions.push('g.gender = ?');
+        params.push(filters.gender);
+    }
+
+    if (filters.source) {
+        if (filters.source === '__ORPHANED__') {
+            // Show names with no source tags
+            conditions.push(`n.id NOT IN (
+                SELECT nt.name_id FROM name_tags nt
+                JOIN tags t ON nt.tag_id = t.id
+                JOIN tag_types tt ON t.tag_type_id = tt.id
+                WHERE tt.type_name = 'source'
+            )`);
+        } else {
+            // Include parent tag and all its children
+            conditions.push(`n.id IN (
+                SELECT nt.name_id FROM name_tags nt
+                JOIN tags t ON nt.tag_id = t.id
+                WHERE t.tag_name = ?
+                   OR t.parent_tag_id = (SELECT id FROM tags WHERE tag_name = ?)
+            )`);
+            params.push(filters.source, filters.source);
+        }
+    }
+
+    const text = (filters.text || '').trim();
+    if (text) {
+        if (fullText && text.length >= MIN_FULL_TEXT_SEARCH_LENGTH) {
+            // Quote as an FTS5 phrase so the text is matched literally, not as query syntax
+            conditions.push('n.id IN (SELECT rowid FROM names_fts WHERE names_fts MATCH ?)');
+            params.push(`"${text.replace(/"/g, '""')}"`);
+        } else {
+            const pattern = `%${text.replace(/[\\%_]/g, '\\$&')}%`;
+            conditions.push(`(n.name LIKE ? ESCAPE '\\'
+                OR n.pronunciation LIKE ? ESCAPE '\\'
+                OR n.meaning LIKE ? ESCAPE '\\')`);
+            params.push(pattern, pattern, pattern);
+        }
+    }
+
+    params.push(limit);
+
+    const sql = `
+        SELECT
+            n.id,
+            n.name,
+            p.position,
+            g.gender,
+            PRINTF('%.2f', n.frequency_weight) as weight,
+            (SELECT GROUP_CONCAT(t2.tag_name, ', ')
+             FROM name_tags nt2
+             JOIN tags t2 ON nt2.tag_id = t2.id
+             JOIN tag_types tt2 ON t2.tag_type_id = tt2.id
+             WHERE nt2.name_id = n.id AND tt2.type_name = 'source'
+             ORDER BY t2.tag_name) as sources,
+            (SELECT GROUP_CONCAT(t2.tag_name, ', ')
+             FROM name_tags nt2
+             JOIN tags t2 ON nt2.tag_id = t2.id
+             JOIN tag_types tt2 ON t2.tag_type_id = tt2.id
+             WHERE nt2.name_id = n.id AND tt2.type_name = 'vibe'
+             ORDER BY t2.tag_name) as vibes,
+            (SELECT GROUP_CONCAT(t2.tag_name, ', ')
+             FROM name_tags nt2
+             JOIN tags t2 ON nt2.tag_id = t2.id
+             JOIN tag_types tt2 ON t2.tag_type_id = tt2.id
+             WHERE nt2.name_id = n.id AND tt2.type_name = 'theme'
+             ORDER BY t2.tag_name) as themes
+        FROM names n
+        LEFT JOIN positions p ON n.position_id = p.id
+        LEFT JOIN genders g ON n.gender_id = g.id
+        WHERE ${conditions.join('\n          AND ')}
+        ORDER BY n.id
+        LIMIT ?
+    `;
+
+    return { sql, params };
+}
+
+/**
+ * Fetch one page of names for the Database Viewer.
+ *
+ * @param {Object} filters - Same filters as buildNameSearchQuery()
+ * @param {number} [afterId=0] - Id of the last row already shown (0 for the first page)
+ * @param {number} [limit=VIEWER_PAGE_SIZE] - Page size
+ * @returns {{columns: string[], rows: Array[], lastId: number, hasMore: boolean}} The page
+ *
+ * @example
+ * let page = searchNames({ text: 'ann' });
+ * if (page.hasMore) page = searchNames({ text: 'ann' }, page.lastId);
+ */
+function searchNames(filters = {}, afterId = 0, limit = VIEWER_PAGE_SIZE) {
+    // Fetch one extra row to learn whether another page exists
+    const { sql, params } = buildNameSearchQuery(filters, {
+        afterId,
+        limit: limit + 1,
+        fullText: hasNameSearchIndex()
+    });
+    const rows = execParams(sql, params);
+    const hasMore = rows.length > limit;
+    if (hasMore) {
+        rows.pop();
+    }
+
+    return {
+        columns: [...NAME_VIEWER_COLUMNS],
+        rows,
+        lastId: rows.length > 0 ? rows[rows.length - 1][0] : afterId,
+        hasMore
+    };
+}
+
 /**
  * Build a SQL query for source statistics (dashboard).
  * Returns count of names by position for each source tag.
@@ -442,6 +839,41 @@ function buildSourceStatsQuery() {
     `;
 }
 
+/**
+ * Build the source statistics query (same columns and order as
+ * buildSourceStatsQuery()) from the precomputed tag_position_gender_counts
+ * rollup. Reads one row per tag/position/gender instead of scanning names.
+ * Use it when hasTagCounts() is true.
+ *
+ * @returns {string} SQL query string
+ *
+ * @example
+ * const query = hasTagCounts() ? buildSourceStatsRollupQuery() : buildSourceStatsQuery();
+ */
+function buildSourceStatsRollupQuery() {
+    return `
+        SELECT
+            t.id,
+            t.tag_name,
+            t.parent_tag_id,
+            p.tag_name as parent_name,
+            COALESCE(SUM(CASE WHEN pos.position = 'first' THEN c.direct_count END), 0) as first_count,
+            COALESCE(SUM(CASE WHEN pos.position = 'last' THEN c.direct_count END), 0) as last_count,
+            COALESCE(SUM(CASE WHEN pos.position = 'title' THEN c.direct_count END), 0) as title_count,
+            COALESCE(SUM(CASE WHEN pos.position = 'nickname' THEN c.direct_count END), 0) as nickname_count
+        FROM tags t
+        LEFT JOIN tags p ON t.parent_tag_id = p.id
+        LEFT JOIN tag_position_gender_counts c ON c.tag_id = t.id
+        LEFT JOIN positions pos ON c.position_id = pos.id
+        WHERE t.tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
+        GROUP BY t.id
+        ORDER BY
+            CASE WHEN t.parent_tag_id IS NULL THEN t.tag_name ELSE p.tag_name END,
+            CASE WHEN t.parent_tag_id IS NULL THEN 0 ELSE 1 END,
+            t.tag_name
+    `;
+}
+
 /**
  * Check if a source is undersupplied based on thresholds.
  *
@@ -460,13 +892,153 @@ function isUndersupplied(firstCount, lastCount, isAdminEntry = false) {
     return firstCount < THRESHOLD_FIRST_NAMES || lastCount < THRESHOLD_LAST_NAMES;
 }
 
+// ============================================================================
+// WEIGHTED SAMPLING (ALIAS METHOD)
+// ============================================================================
+
+/**
+ * Build a Walker/Vose alias table for sampling indices in proportion to weights.
+ * Construction is O(n); each draw from the table is O(1).
+ * Non-positive or non-finite weights are treated as zero.
+ *
+ * @param {number[]} weights - Relative weight per index
+ * @returns {{prob: Float64Array, alias: Uint32Array}|null} Alias table, or null if no weight is positive
+ *
+ * @example
+ * const table = buildAliasTable([1.0, 0.5, 0.5]);
+ * sampleAliasTable(table); // 0 half the time, 1 or 2 a quarter of the time each
+ */
+function buildAliasTable(weights) {
+    const n = weights.length;
+    const prob = new Float64Array(n);
+    const alias = new Uint32Array(n);
+
+    let total = 0;
+    for (let i = 0; i < n; i++) {
+        const w = weights[i];
+        if (Number.isFinite(w) && w > 0) {
+            total += w;
+        }
+    }
+    if (total <= 0) {
+        return null;
+    }
+
+    // Scale weights so the average bucket holds exactly 1.0
+    const scaled = new Float64Array(n);
+    const small = [];
+    const large = [];
+    for (let i = 0; i < n; i++) {
+        const w = weights[i];
+        scaled[i] = (Number.isFinite(w) && w > 0 ? w : 0) * n / total;
+        (scaled[i] < 1 ? small : large).push(i);
+    }
+
+    while (small.length > 0 && large.length > 0) {
+        const s = small.pop();
+        const l = large.pop();
+
+        prob[s] = scaled[s];
+        alias[s] = l;
+
+        // The large entry donates what the small bucket was missing
+        scaled[l] = (scaled[l] + scaled[s]) - 1;
+        (scaled[l] < 1 ? small : large).push(l);
+    }
+
+    // Leftovers are full buckets (any shortfall is floating-point rounding)
+    while (large.length > 0) {
+        const l = large.pop();
+        prob[l] = 1;
+        alias[l] = l;
+    }
+    while (small.length > 0) {
+        const s = small.pop();
+        prob[s] = 1;
+        alias[s] = s;
+    }
+
+    return { prob, alias };
+}
+
+/**
+ * Draw one index from an alias table in O(1).
+ *
+ * @param {{prob: Float64Array, alias: Uint32Array}} table - Table from buildAliasTable()
+ * @param {function(): number} [random=Math.random] - Uniform random source in [0, 1)
+ * @returns {number} The sampled index
+ */
+function sampleAliasTable(table, random = Math.random) {
+    const i = Math.floor(random() * table.prob.length);
+    return random() < table.prob[i] ? i : table.alias[i];
+}
+
+/**
+ * Get (building and caching on first use) the alias sampler for a filter combination.
+ *
+ * @param {string} position - Name position ('first', 'last', 'title', 'nickname')
+ * @param {string[]} genders - Array of allowed genders
+ * @param {number[]} sourceTagIds - Array of source tag IDs (empty = all sources)
+ * @returns {{names: string[], table: {prob: Float64Array, alias: Uint32Array}|null}} Candidate names and their alias table
+ */
+function getAliasSampler(position, genders, sourceTagIds = []) {
+    const key = [
+        position,
+        [...genders].sort().join(','),
+        [...sourceTagIds].sort((a, b) => a - b).join(',')
+    ].join('|');
+
+    const cached = aliasTableCache.get(key);
+    if (cached) {
+        cacheCounters.aliasTableHits++;
+        // Refresh LRU position
+        aliasTableCache.delete(key);
+        aliasTableCache.set(key, cached);
+        return cached;
+    }
+    cacheCounters.aliasTableMisses++;
+
+    const sql = `
+        SELECT n.name, n.frequency_weight FROM names n
+        WHERE n.position_id = (SELECT id FROM positions WHERE position = ?)
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (json_array_length(?) = 0
+               OR n.id IN (SELECT nt.name_id FROM json_each(?) AS tag
+                           CROSS JOIN name_tags nt ON nt.tag_id = tag.value))
+        ORDER BY n.id
+    `;
+    const tagIdsJson = JSON.stringify(sourceTagIds);
+
+    const rows = execParams(sql, [position, JSON.stringify(genders), tagIdsJson, tagIdsJson]);
+    const sampler = {
+        names: rows.map(row => row[0]),
+        table: buildAliasTable(rows.map(row => row[1]))
+    };
+
+    aliasTableCache.set(key, sampler);
+    if (aliasTableCache.size > ALIAS_TABLE_CACHE_SIZE) {
+        aliasTableCache.delete(aliasTableCache.keys().next().value);
+    }
+
+    return sampler;
+}
+
+/**
+ * Discard all cached alias tables.
+ * Called by initDatabase(); call it yourself after modifying the loaded database.
+ */
+function clearAliasTableCache() {
+    aliasTableCache.clear();
+}
+
 // ============================================================================
 // NAME GENERATION FUNCTIONS
 // ============================================================================
 
 /**
  * Get a weighted random name from the database.
- * Uses frequency_weight column to bias selection toward more common names.
+ * Names are drawn exactly in proportion to their frequency_weight, using an
+ * alias table that is built once per filter combination and then cached.
  *
  * @param {string} position - Name position ('first', 'last', 'title', 'nickname')
  * @param {string[]} genders - Array of allowed genders (e.g., ['male', 'female', 'any'])
@@ -477,33 +1049,13 @@ function isUndersupplied(firstCount, lastCount, isAdminEntry = false) {
  * const firstName = getWeightedName('first', ['male', 'any'], [1, 2, 3]);
  */
 function getWeightedName(position, genders, sourceTagIds = []) {
-    //Build placeholders for genders array
-    const genderPlaceholders = genders.map(() => '?').join(', ');
-
-    // Tag IDs are integers, safe to use directly in IN clause
-    let sourceFilter = '';
-    if (sourceTagIds.length > 0) {
-        const tagIdList = sourceTagIds.join(', ');
-        sourceFilter = ` AND n.id IN (SELECT nt.name_id FROM name_tags nt WHERE nt.tag_id IN (${tagIdList}))`;
-    }
+    const { names, table } = getAliasSampler(position, genders, sourceTagIds);
 
-    const sql = `
-        SELECT n.name FROM names n
-        WHERE n.position_id = (SELECT id FROM positions WHERE position = ?)
-          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (${genderPlaceholders}))
-          ${sourceFilter}
-        ORDER BY RANDOM() * n.frequency_weight DESC
-        LIMIT 1
-    `;
-
-    const params = [position, ...genders];
-    const result = execParams(sql, params);
-
-    if (result.length === 0) {
+    if (!table) {
         return null;
     }
 
-    return result[0][0];
+    return names[sampleAliasTable(table)];
 }
 
 /**
@@ -518,24 +1070,18 @@ function getWeightedName(position, genders, sourceTagIds = []) {
  * const count = countNames('nickname', ['male', 'any'], [1, 2]);
  */
 function countNames(position, genders, sourceTagIds = []) {
-    // Build placeholders for genders array
-    const genderPlaceholders = genders.map(() => '?').join(', ');
-
-    // Tag IDs are integers, safe to use directly in IN clause
-    let sourceFilter = '';
-    if (sourceTagIds.length > 0) {
-        const tagIdList = sourceTagIds.join(', ');
-        sourceFilter = ` AND n.id IN (SELECT nt.name_id FROM name_tags nt WHERE nt.tag_id IN (${tagIdList}))`;
-    }
-
+    // Lists are passed as JSON arrays so the SQL text (and its cached statement) is fixed
     const sql = `
         SELECT COUNT(DISTINCT n.id) FROM names n
         WHERE n.position_id = (SELECT id FROM positions WHERE position = ?)
-          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (${genderPlaceholders}))
-          ${sourceFilter}
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (json_array_length(?) = 0
+               OR n.id IN (SELECT nt.name_id FROM json_each(?) AS tag
+                           CROSS JOIN name_tags nt ON nt.tag_id = tag.value))
     `;
+    const tagIdsJson = JSON.stringify(sourceTagIds);
 
-    const params = [position, ...genders];
+    const params = [position, JSON.stringify(genders), tagIdsJson, tagIdsJson];
     const result = execParams(sql, params);
 
     if (result.length === 0) {
@@ -559,21 +1105,25 @@ function countNames(position, genders, sourceTagIds = []) {
  * const count = countNamesIncludingChildren('first', ['male', 'female', 'any'], 5);
  */
 function countNamesIncludingChildren(position, genders, tagId) {
-    // Build placeholders for genders array
-    const genderPlaceholders = genders.map(() => '?').join(', ');
-
-    // tagId is an integer, safe to use directly
-    const sql = `
+    // Each name has one gender, so summing the per-gender rollup rows is a distinct count
+    const sql = hasTagCounts() ? `
+        SELECT COALESCE(SUM(c.total_count), 0) FROM tag_position_gender_counts c
+        WHERE c.tag_id = ?
+          AND c.position_id = (SELECT id FROM positions WHERE position = ?)
+          AND c.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+    ` : `
         SELECT COUNT(DISTINCT n.id) FROM names n
         JOIN positions pos ON n.position_id = pos.id
         JOIN name_tags nt ON n.id = nt.name_id
         WHERE pos.position = ?
-          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (${genderPlaceholders}))
-          AND (nt.tag_id = ${tagId}
-               OR nt.tag_id IN (SELECT id FROM tags WHERE parent_tag_id = ${tagId}))
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (nt.tag_id = ?
+               OR nt.tag_id IN (SELECT id FROM tags WHERE parent_tag_id = ?))
     `;
 
-    const params = [position, ...genders];
+    const params = hasTagCounts()
+        ? [tagId, position, JSON.stringify(genders)]
+        : [position, JSON.stringify(genders), tagId, tagId];
     const result = execParams(sql, params);
 
     if (result.length === 0) {
@@ -583,6 +1133,19 @@ function countNamesIncludingChildren(position, genders, tagId) {
     return result[0][0];
 }
 
+/**
+ * Get the id of the 'Default' tag, whose titles back up sources with few titles.
+ * The lookup is memoized until the next initDatabase().
+ *
+ * @returns {number|null} The tag id, or null if the database has no Default tag
+ */
+function getDefaultTagId() {
+    return memoizeLookup('defaultTagId', () => {
+        const result = execParams("SELECT id FROM tags WHERE tag_name = 'Default'");
+        return result.length > 0 ? result[0][0] : null;
+    });
+}
+
 /**
  * Generate a complete random name with optional nickname and title.
  *
@@ -604,18 +1167,25 @@ function countNamesIncludingChildren(position, genders, tagId) {
  * // Returns something like: "Captain John Smith" or "Mary 'Rose' Jones"
  */
 function generateRandomName(options) {
-    const {
-        genders,
-        sourceNames = [],
-        nicknameFrequency = DEFAULT_NICKNAME_FREQUENCY,
-        titleFrequency = DEFAULT_TITLE_FREQUENCY
-    } = options;
+    return generateRandomNames(options, 1)[0];
+}
 
-    // Validate that at least one non-'any' gender is selected
-    const nonAnyGenders = genders.filter(g => g !== 'any');
-    if (nonAnyGenders.length === 0) {
-        throw new Error('Please select at least one gender (male, female, ambiguous, or queer)');
-    }
+/**
+ * Generate many random names in one call.
+ * Source filters, candidate counts and the Default tag are resolved once for the
+ * whole batch, and every name part is drawn from a cached alias table, so the
+ * number of SQL queries does not grow with count.
+ *
+ * @param {Object} options - Generation options (same as generateRandomName())
+ * @param {number} count - Number of names to generate
+ * @returns {string[]} The generated full names
+ * @throws {Error} If count is invalid, no genders are selected or required names cannot be generated
+ *
+ * @example
+ * const roster = generateRandomNames({ genders: ['female', 'any'], sourceNames: ['Blades 68'] }, 10000);
+ */
+function generateRandomNames(options, count) {
+    const { genders, sourceNames } = validateGenerationOptions(options, count);
 
     // Convert source names to tag IDs
     const sourceTagIds = sourceNames.length > 0 ? getTagIdsForSources(sourceNames) : [];
@@ -624,63 +1194,471 @@ function generateRandomName(options) {
         throw new Error('No valid sources found in database');
     }
 
-    // Get required first and last names
-    const firstName = getWeightedName('first', genders, sourceTagIds);
-    const lastName = getWeightedName('last', genders, sourceTagIds);
+    const samplers = resolveSamplers(
+        (position, tagIds) => getAliasSampler(position, genders, tagIds),
+        sourceTagIds,
+        getDefaultTagId,
+        options
+    );
+
+    return drawFullNames(samplers, options, count);
+}
 
-    if (!firstName || !lastName) {
+/**
+ * Check the options and count shared by generateRandomNames() and
+ * generateRandomNamesFromBundle().
+ *
+ * @param {Object} options - Generation options
+ * @param {number} count - Number of names to generate
+ * @returns {{genders: string[], sourceNames: string[]}} The validated filters
+ * @throws {Error} If count is invalid or no non-'any' gender is selected
+ */
+function validateGenerationOptions(options, count) {
+    const { genders, sourceNames = [] } = options;
+
+    if (!Number.isInteger(count) || count < 0) {
+        throw new Error(`Invalid name count: ${count}. Must be a non-negative integer.`);
+    }
+
+    // Validate that at least one non-'any' gender is selected
+    const nonAnyGenders = genders.filter(g => g !== 'any');
+    if (nonAnyGenders.length === 0) {
+        throw new Error('Please select at least one gender (male, female, ambiguous, or queer)');
+    }
+
+    return { genders, sourceNames };
+}
+
+/**
+ * Resolve the first/last/nickname/title samplers for one batch.
+ *
+ * @param {function(string, number[]): Object} getSampler - Returns the sampler for a position and tag ids
+ * @param {number[]} sourceTagIds - Selected source tag IDs (empty = all sources)
+ * @param {function(): (number|null)} getDefaultId - Returns the Default tag id
+ * @param {Object} options - Generation options (nicknameFrequency, titleFrequency)
+ * @returns {{firstNames: Object, lastNames: Object, nicknames: Object|null, titles: Object|null}} Samplers
+ * @throws {Error} If there are no first or last names to draw from
+ */
+function resolveSamplers(getSampler, sourceTagIds, getDefaultId, options) {
+    const {
+        nicknameFrequency = DEFAULT_NICKNAME_FREQUENCY,
+        titleFrequency = DEFAULT_TITLE_FREQUENCY
+    } = options;
+
+    // Required first and last names
+    const firstNames = getSampler('first', sourceTagIds);
+    const lastNames = getSampler('last', sourceTagIds);
+
+    if (!firstNames.table || !lastNames.table) {
         throw new Error('Could not find required first or last names in database with selected genders and sources');
     }
 
-    let fullName = firstName;
+    // Optional parts are only resolved if they can appear
+    const nicknames = nicknameFrequency > 0 ? getSampler('nickname', sourceTagIds) : null;
 
-    // Add nickname based on frequency
-    if (nicknameFrequency > 0 && Math.random() < nicknameFrequency) {
-        let nickname = null;
-        const nicknameCount = countNames('nickname', genders, sourceTagIds);
+    let titles = null;
+    if (titleFrequency > 0) {
+        titles = getSampler('title', sourceTagIds);
 
-        if (nicknameCount === 0) {
-            // No nicknames available, use a first name instead
-            nickname = getWeightedName('first', genders, sourceTagIds);
-        } else {
-            // 50/50 between actual nickname and first name
-            if (Math.random() < 0.5) {
-                nickname = getWeightedName('nickname', genders, sourceTagIds);
+        // If fewer than threshold titles available, also include Default titles
+        if (sourceTagIds.length > 0 && titles.names.length < THRESHOLD_TITLES_FOR_DEFAULT_FALLBACK) {
+            const defaultId = getDefaultId();
+            if (defaultId !== null) {
+                titles = getSampler('title', [...sourceTagIds, defaultId]);
+            }
+        }
+    }
+
+    return { firstNames, lastNames, nicknames, titles };
+}
+
+/**
+ * Draw count full names from resolved samplers.
+ *
+ * @param {Object} samplers - Result of resolveSamplers()
+ * @param {Object} options - Generation options (nicknameFrequency, titleFrequency)
+ * @param {number} count - Number of names to generate
+ * @returns {string[]} The generated full names
+ */
+function drawFullNames(samplers, options, count) {
+    const { firstNames, lastNames, nicknames, titles } = samplers;
+    const {
+        nicknameFrequency = DEFAULT_NICKNAME_FREQUENCY,
+        titleFrequency = DEFAULT_TITLE_FREQUENCY
+    } = options;
+
+    const pick = sampler => sampler.table ? sampler.names[sampleAliasTable(sampler.table)] : null;
+
+    const results = new Array(count);
+    for (let i = 0; i < count; i++) {
+        let fullName = pick(firstNames);
+        const lastName = pick(lastNames);
+
+        // Add nickname based on frequency
+        if (nicknames && Math.random() < nicknameFrequency) {
+            let nickname;
+            if (!nicknames.table) {
+                // No nicknames available, use a first name instead
+                nickname = pick(firstNames);
             } else {
-                nickname = getWeightedName('first', genders, sourceTagIds);
+                // 50/50 between actual nickname and first name
+                nickname = Math.random() < 0.5 ? pick(nicknames) : pick(firstNames);
+            }
+
+            if (nickname) {
+                fullName += ` "${nickname}"`;
+            }
+        }
+
+        // Add last name
+        fullName += ` ${lastName}`;
+
+        // Add title based on frequency
+        if (titles && Math.random() < titleFrequency) {
+            const title = pick(titles);
+            if (title) {
+                fullName = `${title} ${fullName}`;
             }
         }
 
-        if (nickname) {
-            fullName += ` "${nickname}"`;
+        results[i] = fullName;
+    }
+
+    return results;
+}
+
+// ============================================================================
+// NAME BUNDLE (SHARDED BINARY EXPORT)
+// ============================================================================
+//
+// export_bundle.py writes a manifest plus one small binary shard per
+// (position, source tag). The generator page can load the manifest instead of
+// names.db and fetch only the shards for the sources the user picks, so the
+// time to the first name does not grow with the size of the database.
+
+/**
+ * Load a name bundle manifest. Shards are fetched later, on demand.
+ *
+ * @param {string} [bundlePath='bundle/'] - URL of the directory written by export_bundle.py
+ * @returns {Promise<Object>} The manifest
+ * @throws {Error} If the manifest is missing or has an unsupported version
+ *
+ * @example
+ * await initBundle('bundle/');
+ * const names = await generateRandomNamesFromBundle({ genders: ['male', 'any'] }, 10);
+ */
+async function initBundle(bundlePath = 'bundle/') {
+    const baseUrl = bundlePath.endsWith('/') ? bundlePath : `${bundlePath}/`;
+
+    // Revalidate the manifest every time; shards are immutable and cached separately
+    const response = await fetch(`${baseUrl}manifest.json`, { cache: 'no-cache' });
+    if (!response.ok) {
+        throw new Error(`Failed to load name bundle: ${response.statusText}`);
+    }
+
+    const manifest = await response.json();
+    if (manifest.version !== BUNDLE_VERSION) {
+        throw new Error(`Unsupported name bundle version: ${manifest.version}`);
+    }
+
+    aliasTableCache.clear();
+    shardCache.clear();
+    bundle = { baseUrl, manifest };
+
+    await pruneShardStorage();
+
+    return manifest;
+}
+
+/**
+ * Get the loaded name bundle manifest.
+ *
+ * @returns {Object|null} The manifest, or null if initBundle() has not succeeded
+ */
+function getBundle() {
+    return bundle ? bundle.manifest : null;
+}
+
+/**
+ * Parse a shard without copying: the returned arrays are views over buffer.
+ * Shards are little-endian, which is the byte order of every browser platform.
+ *
+ * @param {ArrayBuffer} buffer - Shard file contents
+ * @returns {{count: number, ids: Uint32Array, weights: Float32Array, offsets: Uint32Array, genders: Uint8Array, strings: Uint8Array}} Shard views
+ * @throws {Error} If the buffer is not a valid shard
+ */
+function parseBundleShard(buffer) {
+    if (buffer.byteLength < BUNDLE_SHARD_HEADER_BYTES) {
+        throw new Error('Invalid name shard: file is too short');
+    }
+
+    const header = new DataView(buffer, 0, BUNDLE_SHARD_HEADER_BYTES);
+    const magic = String.fromCharCode(...new Uint8Array(buffer, 0, 4));
+    if (magic !== BUNDLE_MAGIC) {
+        throw new Error(`Invalid name shard: bad magic '${magic}'`);
+    }
+
+    const count = header.getUint32(4, true);
+    const stringBytes = header.getUint32(8, true);
+
+    let offset = BUNDLE_SHARD_HEADER_BYTES;
+    const ids = new Uint32Array(buffer, offset, count);
+    offset += count * 4;
+    const weights = new Float32Array(buffer, offset, count);
+    offset += count * 4;
+    const offsets = new Uint32Array(buffer, offset, count + 1);
+    offset += (count + 1) * 4;
+    const genders = new Uint8Array(buffer, offset, count);
+    offset += count;
+
+    if (offset + stringBytes !== buffer.byteLength || offsets[count] !== stringBytes) {
+        throw new Error('Invalid name shard: size does not match header');
+    }
+    const strings = new Uint8Array(buffer, offset, stringBytes);
+
+    return { count, ids, weights, offsets, genders, strings };
+}
+
+const shardTextDecoder = new TextDecoder();
+
+/**
+ * Decode the name at index i of a parsed shard.
+ *
+ * @param {Object} shard - Result of parseBundleShard()
+ * @param {number} i - Row index
+ * @returns {string} The name
+ */
+function getShardName(shard, i) {
+    return shardTextDecoder.decode(shard.strings.subarray(shard.offsets[i], shard.offsets[i + 1]));
+}
+
+/**
+ * Open the shard cache in Cache Storage, or null where it is unavailable
+ * (Node, insecure origins, private browsing modes that disable it).
+ *
+ * @returns {Promise<Cache|null>} The cache
+ */
+async function openShardStorage() {
+    if (typeof caches === 'undefined') {
+        return null;
+    }
+    try {
+        return await caches.open(BUNDLE_CACHE_NAME);
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Delete stored shards that the current manifest no longer lists.
+ */
+async function pruneShardStorage() {
+    const storage = await openShardStorage();
+    if (!storage) {
+        return;
+    }
+
+    const current = new Set();
+    Object.values(bundle.manifest.shards).forEach(entries => {
+        Object.values(entries).forEach(entry => current.add(entry.file));
+    });
+
+    const requests = await storage.keys();
+    await Promise.all(requests
+        .filter(request => !current.has(request.url.slice(request.url.lastIndexOf('/') + 1)))
+        .map(request => storage.delete(request)));
+}
+
+/**
+ * Fetch (or read from Cache Storage) and parse one shard.
+ *
+ * @param {string} file - Shard file name from the manifest
+ * @returns {Promise<Object>} Parsed shard
+ */
+async function fetchBundleShard(file) {
+    const url = `${bundle.baseUrl}${file}`;
+    const storage = await openShardStorage();
+
+    let response = storage ? await storage.match(url) : undefined;
+    if (response) {
+        cacheCounters.shardStorageHits++;
+    } else {
+        cacheCounters.shardFetches++;
+        response = await fetch(url);
+        if (!response.ok) {
+            throw new Error(`Failed to load name shard ${file}: ${response.statusText}`);
+        }
+        if (storage) {
+            await storage.put(url, response.clone());
         }
     }
 
-    // Add last name
-    fullName += ` ${lastName}`;
+    return parseBundleShard(await response.arrayBuffer());
+}
 
-    // Add title based on frequency
-    if (titleFrequency > 0 && Math.random() < titleFrequency) {
-        let titleSourceTagIds = sourceTagIds;
+/**
+ * Load a shard once per page; concurrent callers share the same request.
+ *
+ * @param {string} file - Shard file name from the manifest
+ * @returns {Promise<Object>} Parsed shard
+ */
+function loadBundleShard(file) {
+    let pending = shardCache.get(file);
+    if (!pending) {
+        pending = fetchBundleShard(file);
+        // Let a failed load be retried
+        pending.catch(() => shardCache.delete(file));
+        shardCache.set(file, pending);
+    }
+    return pending;
+}
 
-        // If fewer than threshold titles available, also include Default titles
-        if (sourceTagIds.length > 0) {
-            const titleCount = countNames('title', genders, sourceTagIds);
-            if (titleCount < THRESHOLD_TITLES_FOR_DEFAULT_FALLBACK) {
-                const defaultTagResult = db.exec("SELECT id FROM tags WHERE tag_name = 'Default'");
-                if (defaultTagResult.length > 0 && defaultTagResult[0].values.length > 0) {
-                    titleSourceTagIds = [...sourceTagIds, defaultTagResult[0].values[0][0]];
-                }
+/**
+ * Get the bundle's source tags, with per-position name counts that include
+ * child tags (the same numbers countNamesIncludingChildren() gives for all genders).
+ *
+ * @returns {Array<{id: number, name: string, parentId: number|null, parentName: string|null, counts: Object}>} Source tags
+ */
+function getBundleSourceTags() {
+    return bundle.manifest.sources.map(tag => ({ ...tag, counts: { ...tag.counts } }));
+}
+
+/**
+ * Bundle equivalent of getTagIdsForSources(): ids for the named tags and their children.
+ *
+ * @param {string[]} sourceNames - Array of source tag names
+ * @returns {number[]} Array of tag IDs
+ */
+function getBundleTagIdsForSources(sourceNames) {
+    const names = new Set(sourceNames);
+    const sources = bundle.manifest.sources;
+    const selected = new Set(sources.filter(tag => names.has(tag.name)).map(tag => tag.id));
+
+    sources.forEach(tag => {
+        if (tag.parentId !== null && selected.has(tag.parentId)) {
+            selected.add(tag.id);
+        }
+    });
+
+    return [...selected];
+}
+
+/**
+ * Get (loading shards and caching on first use) the alias sampler for a filter
+ * combination from the bundle. Matches getAliasSampler() on the same data.
+ *
+ * @param {string} position - Name position ('first', 'last', 'title', 'nickname')
+ * @param {string[]} genders - Array of allowed genders
+ * @param {number[]} sourceTagIds - Array of source tag IDs (empty = all names)
+ * @returns {Promise<{names: string[], table: {prob: Float64Array, alias: Uint32Array}|null}>} Candidate names and their alias table
+ */
+async function getBundleSampler(position, genders, sourceTagIds = []) {
+    const key = [
+        'bundle',
+        position,
+        [...genders].sort().join(','),
+        [...sourceTagIds].sort((a, b) => a - b).join(',')
+    ].join('|');
+
+    const cached = aliasTableCache.get(key);
+    if (cached) {
+        cacheCounters.aliasTableHits++;
+        aliasTableCache.delete(key);
+        aliasTableCache.set(key, cached);
+        return cached;
+    }
+    cacheCounters.aliasTableMisses++;
+
+    const entries = bundle.manifest.shards[position] || {};
+    const keys = sourceTagIds.length === 0 ? Object.keys(entries) : sourceTagIds.map(String);
+    const files = keys.filter(k => entries[k]).map(k => entries[k].file);
+    const shards = await Promise.all(files.map(loadBundleShard));
+
+    const allowed = new Set(genders);
+    const genderAllowed = bundle.manifest.genders.map(gender => allowed.has(gender));
+
+    // A name tagged with several selected sources appears in several shards
+    const candidates = new Map();
+    shards.forEach(shard => {
+        for (let i = 0; i < shard.count; i++) {
+            if (genderAllowed[shard.genders[i]] && !candidates.has(shard.ids[i])) {
+                candidates.set(shard.ids[i], [shard, i]);
             }
         }
+    });
+
+    // Same candidate order as the SQL sampler (by name id)
+    const ids = [...candidates.keys()].sort((a, b) => a - b);
+    const sampler = {
+        names: ids.map(id => getShardName(...candidates.get(id))),
+        table: buildAliasTable(ids.map(id => {
+            const [shard, i] = candidates.get(id);
+            return shard.weights[i];
+        }))
+    };
+
+    aliasTableCache.set(key, sampler);
+    if (aliasTableCache.size > ALIAS_TABLE_CACHE_SIZE) {
+        aliasTableCache.delete(aliasTableCache.keys().next().value);
+    }
+
+    return sampler;
+}
+
+/**
+ * Generate random names from the loaded bundle (see initBundle()).
+ * Only the shards for the selected sources are downloaded.
+ *
+ * @param {Object} options - Generation options (same as generateRandomName())
+ * @param {number} count - Number of names to generate
+ * @returns {Promise<string[]>} The generated full names
+ * @throws {Error} If no bundle is loaded, the options are invalid or required names are missing
+ *
+ * @example
+ * const names = await generateRandomNamesFromBundle({ genders: ['female', 'any'], sourceNames: ['Blades 68'] }, 10);
+ */
+async function generateRandomNamesFromBundle(options, count) {
+    if (!bundle) {
+        throw new Error('Name bundle not loaded. Call initBundle() first.');
+    }
 
-        const title = getWeightedName('title', genders, titleSourceTagIds);
-        if (title) {
-            fullName = `${title} ${fullName}`;
+    const { genders, sourceNames } = validateGenerationOptions(options, count);
+    const sourceTagIds = sourceNames.length > 0 ? getBundleTagIdsForSources(sourceNames) : [];
+
+    if (sourceNames.length > 0 && sourceTagIds.length === 0) {
+        throw new Error('No valid sources found in database');
+    }
+
+    // Resolve every sampler the batch may need up front, in parallel
+    const {
+        nicknameFrequency = DEFAULT_NICKNAME_FREQUENCY,
+        titleFrequency = DEFAULT_TITLE_FREQUENCY
+    } = options;
+    const defaultId = bundle.manifest.defaultTagId;
+    const requests = [['first', sourceTagIds], ['last', sourceTagIds]];
+    if (nicknameFrequency > 0) {
+        requests.push(['nickname', sourceTagIds]);
+    }
+    if (titleFrequency > 0) {
+        requests.push(['title', sourceTagIds]);
+        if (sourceTagIds.length > 0 && defaultId !== null) {
+            requests.push(['title', [...sourceTagIds, defaultId]]);
         }
     }
 
-    return fullName;
+    const loaded = new Map();
+    await Promise.all(requests.map(async ([position, tagIds]) => {
+        loaded.set(`${position}|${tagIds.join(',')}`, await getBundleSampler(position, genders, tagIds));
+    }));
+
+    const samplers = resolveSamplers(
+        (position, tagIds) => loaded.get(`${position}|${tagIds.join(',')}`),
+        sourceTagIds,
+        () => defaultId,
+        options
+    );
+
+    return drawFullNames(samplers, options, count);
 }
 
 // ============================================================================
@@ -694,11 +1672,23 @@ const NameGeneratorDB = {
     THRESHOLD_TITLES_FOR_DEFAULT_FALLBACK,
     DEFAULT_NICKNAME_FREQUENCY,
     DEFAULT_TITLE_FREQUENCY,
+    ALIAS_TABLE_CACHE_SIZE,
+    STATEMENT_CACHE_SIZE,
+    VIEWER_PAGE_SIZE,
+    MIN_FULL_TEXT_SEARCH_LENGTH,
+    NAME_VIEWER_COLUMNS,
+    BUNDLE_VERSION,
+    BUNDLE_CACHE_NAME,
 
     // Database functions
     initDatabase,
     getDatabase,
 
+    // Caches
+    getCachedStatement,
+    clearDatabaseCaches,
+    getCacheStats,
+
     // Helper functions
     execParams,
     escapeSQL,  // Deprecated - use execParams() instead
@@ -707,17 +1697,40 @@ const NameGeneratorDB = {
     getGenders,
     getPositions,
     getDatabaseStats,
+    hasTagCounts,
+    hasNameSearchIndex,
 
     // Query builders
     buildNameViewerQuery,
+    buildNameSearchQuery,
+    searchNames,
     buildSourceStatsQuery,
+    buildSourceStatsRollupQuery,
     isUndersupplied,
 
+    // Weighted sampling
+    buildAliasTable,
+    sampleAliasTable,
+    getAliasSampler,
+    clearAliasTableCache,
+
     // Name generation
     getWeightedName,
     countNames,
     countNamesIncludingChildren,
-    generateRandomName
+    getDefaultTagId,
+    generateRandomName,
+    generateRandomNames,
+
+    // Name bundle
+    initBundle,
+    getBundle,
+    parseBundleShard,
+    getShardName,
+    getBundleSourceTags,
+    getBundleTagIdsForSources,
+    getBundleSampler,
+    generateRandomNamesFromBundle
 };
 
 // Make available globally (for browser classic scripts)
@@ -130,6 +130,51 @@ describe('buildNameViewerQuery', () => {
     });
 });
 
+describe('buildNameSearchQuery', () => {
+    it('should bind every filter value as a parameter', () => {
+        const { sql, params } = DB.buildNameSearchQuery(
+            { position: "first'; --", gender: 'male', source: 'Test Source' },
+            { afterId: 10, limit: 50 }
+        );
+        expect(sql).not.toContain('Test Source');
+        expect(sql).not.toContain('first');
+        expect(params).toEqual([10, "first'; --", 'male', 'Test Source', 'Test Source', 50]);
+    });
+
+    it('should page by id instead of OFFSET', () => {
+        const { sql, params } = DB.buildNameSearchQuery({});
+        expect(sql).toContain('n.id > ?');
+        expect(sql).toContain('ORDER BY n.id');
+        expect(sql).not.toContain('OFFSET');
+        expect(params).toEqual([0, DB.VIEWER_PAGE_SIZE]);
+    });
+
+    it('should use a quoted MATCH phrase when full-text search is available', () => {
+        const { sql, params } = DB.buildNameSearchQuery({ text: 'an"n' }, { fullText: true });
+        expect(sql).toContain('names_fts MATCH ?');
+        expect(params).toContain('"an""n"');
+    });
+
+    it('should fall back to an escaped LIKE without full-text search', () => {
+        const { sql, params } = DB.buildNameSearchQuery({ text: '50%_off' });
+        expect(sql).not.toContain('names_fts');
+        expect(sql).toContain("LIKE ? ESCAPE");
+        expect(params.slice(1, 4)).toEqual(Array(3).fill('%50\\%\\_off%'));
+    });
+
+    it('should use LIKE for text shorter than a trigram', () => {
+        const { sql } = DB.buildNameSearchQuery({ text: 'an' }, { fullText: true });
+        expect(sql).not.toContain('names_fts');
+        expect(sql).toContain('LIKE ?');
+    });
+
+    it('should handle orphaned source filter without parameters', () => {
+        const { sql, params } = DB.buildNameSearchQuery({ source: '__ORPHANED__' });
+        expect(sql).toContain('NOT IN');
+        expect(params).toEqual([0, DB.VIEWER_PAGE_SIZE]);
+    });
+});
+
 describe('buildSourceStatsQuery', () => {
     it('should build valid SQL query', () => {
         const query = DB.buildSourceStatsQuery();
@@ -164,6 +209,25 @@ describe('buildSourceStatsQuery', () => {
     });
 });
 
+describe('buildSourceStatsRollupQuery', () => {
+    it('should read direct counts from the rollup table', () => {
+        const query = DB.buildSourceStatsRollupQuery();
+        expect(query).toContain('tag_position_gender_counts');
+        expect(query).toContain('c.direct_count');
+        expect(query).not.toContain('total_count');
+        expect(query).not.toContain('FROM names');
+    });
+
+    it('should keep the same filter and hierarchical order as buildSourceStatsQuery', () => {
+        const query = DB.buildSourceStatsRollupQuery();
+        expect(query).toContain("type_name = 'source'");
+        expect(query).toContain('CASE WHEN t.parent_tag_id IS NULL');
+        ['first', 'last', 'title', 'nickname'].forEach(position => {
+            expect(query).toContain(`pos.position = '${position}'`);
+        });
+    });
+});
+
 describe('Query Builder Edge Cases', () => {
     it('should handle special characters in filter values', () => {
         const specialChars = "Test's \"Name\" & <script>";
@@ -293,6 +357,150 @@ describe('execParams Security (SQL Injection Prevention)', () => {
     });
 });
 
+describe('Alias Method Sampling', () => {
+    // Probability of each index implied by an alias table
+    function impliedProbabilities(table) {
+        const n = table.prob.length;
+        const probs = new Array(n).fill(0);
+        for (let i = 0; i < n; i++) {
+            probs[i] += table.prob[i] / n;
+            probs[table.alias[i]] += (1 - table.prob[i]) / n;
+        }
+        return probs;
+    }
+
+    it('should reproduce the weights exactly', () => {
+        const weights = [1.0, 0.5, 0.3, 0.1, 0.8, 0.7];
+        const total = weights.reduce((a, b) => a + b, 0);
+        const probs = impliedProbabilities(DB.buildAliasTable(weights));
+
+        weights.forEach((w, i) => {
+            expect(probs[i]).toBeCloseTo(w / total, 12);
+        });
+    });
+
+    it('should never sample zero-weight entries', () => {
+        const probs = impliedProbabilities(DB.buildAliasTable([0, 2, 0, 2]));
+        expect(probs[0]).toBeCloseTo(0, 12);
+        expect(probs[2]).toBeCloseTo(0, 12);
+        expect(probs[1]).toBeCloseTo(0.5, 12);
+    });
+
+    it('should return null when no weight is positive', () => {
+        expect(DB.buildAliasTable([])).toBeNull();
+        expect(DB.buildAliasTable([0, -1, NaN])).toBeNull();
+    });
+
+    it('should use the bucket or its alias depending on the coin flip', () => {
+        const table = DB.buildAliasTable([3, 1]);
+        // Bucket 1 holds 0.5 of index 1 and aliases to index 0
+        expect(DB.sampleAliasTable(table, (() => { const r = [0.75, 0.25]; return () => r.shift(); })())).toBe(1);
+        expect(DB.sampleAliasTable(table, (() => { const r = [0.75, 0.75]; return () => r.shift(); })())).toBe(0);
+        // Bucket 0 is full
+        expect(DB.sampleAliasTable(table, (() => { const r = [0.1, 0.99]; return () => r.shift(); })())).toBe(0);
+    });
+});
+
+describe('generateRandomNames', () => {
+    it('should reject invalid counts before touching the database', () => {
+        expect(() => DB.generateRandomNames({ genders: ['male'] }, -1)).toThrow('Invalid name count');
+        expect(() => DB.generateRandomNames({ genders: ['male'] }, 2.5)).toThrow('Invalid name count');
+    });
+
+    it('should require at least one non-any gender', () => {
+        expect(() => DB.generateRandomNames({ genders: ['any'] }, 10)).toThrow('Please select at least one gender');
+    });
+});
+
+describe('Database Caches', () => {
+    it('should report statement, lookup and alias table cache statistics', () => {
+        const stats = DB.getCacheStats();
+
+        expect(stats.statements.capacity).toBe(DB.STATEMENT_CACHE_SIZE);
+        expect(stats.aliasTables.capacity).toBe(DB.ALIAS_TABLE_CACHE_SIZE);
+        ['hits', 'misses', 'size'].forEach(key => {
+            expect(typeof stats.statements[key]).toBe('number');
+            expect(typeof stats.lookups[key]).toBe('number');
+            expect(typeof stats.aliasTables[key]).toBe('number');
+        });
+    });
+
+    it('should empty every cache when cleared', () => {
+        DB.clearDatabaseCaches();
+        const stats = DB.getCacheStats();
+
+        expect(stats.statements.size).toBe(0);
+        expect(stats.lookups.size).toBe(0);
+        expect(stats.aliasTables.size).toBe(0);
+    });
+});
+
+describe('Name Bundle Shards', () => {
+    // Build a shard the way export_bundle.py lays it out
+    function encodeShard(rows) {
+        const encoder = new TextEncoder();
+        const names = rows.map(([, name]) => encoder.encode(name));
+        const stringBytes = names.reduce((sum, n) => sum + n.length, 0);
+        const count = rows.length;
+        const buffer = new ArrayBuffer(16 + count * 8 + (count + 1) * 4 + count + stringBytes);
+        const view = new DataView(buffer);
+
+        new Uint8Array(buffer, 0, 4).set(encoder.encode('NGB1'));
+        view.setUint32(4, count, true);
+        view.setUint32(8, stringBytes, true);
+
+        let offset = 16;
+        rows.forEach(([id], i) => view.setUint32(offset + i * 4, id, true));
+        offset += count * 4;
+        rows.forEach(([, , weight], i) => view.setFloat32(offset + i * 4, weight, true));
+        offset += count * 4;
+        let position = 0;
+        view.setUint32(offset, 0, true);
+        names.forEach((n, i) => {
+            position += n.length;
+            view.setUint32(offset + (i + 1) * 4, position, true);
+        });
+        offset += (count + 1) * 4;
+        rows.forEach(([, , , gender], i) => view.setUint8(offset + i, gender));
+        offset += count;
+        names.forEach(n => {
+            new Uint8Array(buffer, offset, n.length).set(n);
+            offset += n.length;
+        });
+
+        return buffer;
+    }
+
+    it('should read ids, weights, genders and names', () => {
+        const shard = DB.parseBundleShard(encodeShard([[3, 'Ann', 1.0, 2], [7, 'Zoë', 0.5, 0], [9, '', 0.25, 4]]));
+
+        expect(shard.count).toBe(3);
+        expect(Array.from(shard.ids)).toEqual([3, 7, 9]);
+        expect(Array.from(shard.weights)).toEqual([1.0, 0.5, 0.25]);
+        expect(Array.from(shard.genders)).toEqual([2, 0, 4]);
+        expect([0, 1, 2].map(i => DB.getShardName(shard, i))).toEqual(['Ann', 'Zoë', '']);
+    });
+
+    it('should handle an empty shard', () => {
+        const shard = DB.parseBundleShard(encodeShard([]));
+        expect(shard.count).toBe(0);
+        expect(shard.strings.length).toBe(0);
+    });
+
+    it('should reject bad magic and truncated files', () => {
+        const buffer = encodeShard([[1, 'Ann', 1.0, 1]]);
+        expect(() => DB.parseBundleShard(buffer.slice(0, buffer.byteLength - 1))).toThrow('size does not match');
+        expect(() => DB.parseBundleShard(buffer.slice(0, 8))).toThrow('too short');
+
+        new Uint8Array(buffer)[0] = 0;
+        expect(() => DB.parseBundleShard(buffer)).toThrow('bad magic');
+    });
+
+    it('should require initBundle() before generating from the bundle', async () => {
+        await expect(DB.generateRandomNamesFromBundle({ genders: ['male'] }, 1)).rejects.toThrow('initBundle');
+    });
+});
+
 describe('Module Exports', () => {
     it('should export all required constants', () => {
         expect(DB.THRESHOLD_FIRST_NAMES).toBeDefined();
@@ -305,8 +513,22 @@ describe('Module Exports', () => {
         expect(typeof DB.escapeSQL).toBe('function');
         expect(typeof DB.buildNameViewerQuery).toBe('function');
         expect(typeof DB.buildSourceStatsQuery).toBe('function');
+        expect(typeof DB.buildSourceStatsRollupQuery).toBe('function');
+        expect(typeof DB.hasTagCounts).toBe('function');
+        expect(typeof DB.buildNameSearchQuery).toBe('function');
+        expect(typeof DB.searchNames).toBe('function');
+        expect(typeof DB.hasNameSearchIndex).toBe('function');
         expect(typeof DB.isUndersupplied).toBe('function');
         expect(typeof DB.getDatabase).toBe('function');
         expect(typeof DB.initDatabase).toBe('function');
+        expect(typeof DB.buildAliasTable).toBe('function');
+        expect(typeof DB.sampleAliasTable).toBe('function');
+        expect(typeof DB.clearAliasTableCache).toBe('function');
+        expect(typeof DB.generateRandomNames).toBe('function');
+        expect(typeof DB.getCacheStats).toBe('function');
+        expect(typeof DB.clearDatabaseCaches).toBe('function');
+        expect(typeof DB.initBundle).toBe('function');
+        expect(typeof DB.parseBundleShard).toBe('function');
+        expect(typeof DB.generateRandomNamesFromBundle).toBe('function');
     });
 });
@@ -4,177 +4,279 @@ Script to clean and update names.csv:
 1. Clean all titles to have only 'Default' tag
 2. Review and reassign Akoran names to other heritages
 3. Review Red Water and Dagger Isles assignments
+
+Rows are streamed from input to output, so memory use does not grow with the
+size of the file. The heritage rules live in heritage_rules.json and are
+compiled into one regular expression per heritage when loaded.
+
+Usage:
+    python3 clean_csv.py [input_file] [output_file] [--rules heritage_rules.json] [--jobs N]
+
+    input_file: CSV to clean (default: names.csv)
+    output_file: Where to write the result (default: overwrite input_file)
+    --jobs N: Clean chunks of the file in N worker processes (0 = one per CPU).
+              The output is identical to a serial run.
 """
 
+import argparse
 import csv
-import sys
-
-def load_csv(filename='names.csv'):
-    """Load CSV and return rows."""
-    with open(filename, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        return list(reader)
-
-def save_csv(rows, filename='names.csv'):
-    """Save rows to CSV."""
-    with open(filename, 'w', encoding='utf-8', newline='') as f:
-        writer = csv.DictWriter(f, fieldnames=['Name', 'Position', 'Gender', 'Weight', 'Tags'])
-        writer.writeheader()
-        writer.writerows(rows)
-
-def clean_titles(rows):
-    """Clean all titles to have only 'Default' tag."""
-    changes = 0
-    for row in rows:
-        if row['Position'] == 'title':
-            if row['Tags'] != 'Default':
-                print(f"Cleaning title: {row['Name']} (was: {row['Tags']})")
-                row['Tags'] = 'Default'
-                changes += 1
-    print(f"\nCleaned {changes} title entries")
-    return rows
-
-def analyze_heritage_distribution(rows):
-    """Analyze distribution of names across heritages."""
-    heritage_counts = {}
+import io
+import json
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
 
-    for row in rows:
-        if row['Position'] in ['first', 'last', 'nickname']:
-            tags = row['Tags'].split('|')
-            for tag in tags:
-                if tag.startswith('Blades - '):
-                    heritage = tag.replace('Blades - ', '')
-                    if heritage not in heritage_counts:
-                        heritage_counts[heritage] = {'first': 0, 'last': 0, 'nickname': 0}
-                    heritage_counts[heritage][row['Position']] += 1
+from csv_chunks import apply_new_file_mode, read_chunk, resolve_jobs, split_csv
+
+CSV_FIELDS = ['Name', 'Position', 'Gender', 'Weight', 'Tags']
+DEFAULT_RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'heritage_rules.json')
+REPORT_LIMIT = 30  # Changes listed per step
+
+
+def compile_heritage_pattern(heritage):
+    """Compile a heritage's name list, prefixes, suffixes and substrings into one regex"""
+    def alternation(words):
+        # Longest first so the regex engine can't stop at a shorter alternative
+        return '|'.join(re.escape(w) for w in sorted(words, key=len, reverse=True))
+
+    branches = []
+    if heritage.get('names'):
+        branches.append(rf"\A(?:{alternation(heritage['names'])})\Z")
+    if heritage.get('prefixes'):
+        branches.append(rf"\A(?:{alternation(heritage['prefixes'])})")
+    if heritage.get('suffixes'):
+        branches.append(rf"(?:{alternation(heritage['suffixes'])})\Z")
+    if heritage.get('contains'):
+        branches.append(rf"(?:{alternation(heritage['contains'])})")
+
+    return re.compile('|'.join(branches)) if branches else None
+
+
+class HeritageRules:
+    """Heritage reassignment rules loaded from a JSON file and compiled once"""
+
+    def __init__(self, data):
+        self.source_tag = data['source_tag']
+        self.tag_prefix = data['tag_prefix']
+        self.positions = frozenset(data['positions'])
+        # Priority order: the first matching heritage wins
+        self.heritages = [
+            (heritage['name'], compile_heritage_pattern(heritage))
+            for heritage in data['heritages']
+        ]
+
+    @classmethod
+    def load(cls, filename=DEFAULT_RULES_FILE):
+        with open(filename, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
 
+    def classify(self, name):
+        """Return the first heritage whose pattern matches name, or None"""
+        name_lower = name.lower()
+        for heritage, pattern in self.heritages:
+            if pattern and pattern.search(name_lower):
+                return heritage
+        return None
+
+
+def count_heritages(heritage_counts, row, tag_prefix='Blades - '):
+    """Add one row to the per-heritage position counts."""
+    if row['Position'] in ('first', 'last', 'nickname'):
+        for tag in row['Tags'].split('|'):
+            if tag.startswith(tag_prefix):
+                heritage = tag.replace(tag_prefix, '')
+                if heritage not in heritage_counts:
+                    heritage_counts[heritage] = {'first': 0, 'last': 0, 'nickname': 0}
+                heritage_counts[heritage][row['Position']] += 1
+
+
+def print_heritage_distribution(heritage_counts):
+    """Print distribution of names across heritages."""
     print("\n=== Heritage Distribution ===")
     for heritage in sorted(heritage_counts.keys()):
         counts = heritage_counts[heritage]
         total = sum(counts.values())
         print(f"{heritage:20s}: {total:3d} total (first: {counts['first']:3d}, last: {counts['last']:3d}, nickname: {counts['nickname']:3d})")
 
-    return heritage_counts
 
-def reassign_names(rows):
-    """Reassign Akoran names to underrepresented heritages based on cultural patterns."""
-    changes = []
+def clean_title(row):
+    """Clean a title to have only the 'Default' tag. Returns a change description or None."""
+    if row['Position'] == 'title' and row['Tags'] != 'Default':
+        change = f"Cleaning title: {row['Name']} (was: {row['Tags']})"
+        row['Tags'] = 'Default'
+        return change
+    return None
+
+
+def reassign_name(row, rules):
+    """Reassign an Akoran name to a heritage matching its cultural pattern.
+
+    Returns a change description or None.
+    """
+    if row['Position'] not in rules.positions:
+        return None
+
+    tags = row['Tags'].split('|')
+
+    # Only process if it has the source heritage tag
+    if rules.source_tag not in tags:
+        return None
+
+    heritage = rules.classify(row['Name'])
+    if not heritage:
+        return None
+
+    new_heritage = f'{rules.tag_prefix}{heritage}'
+    old_heritage = rules.source_tag.replace(rules.tag_prefix, '')
+
+    # Replace the source heritage with the new one
+    new_tags = [tag for tag in tags if tag != rules.source_tag]
+    if new_heritage not in new_tags:
+        new_tags.append(new_heritage)
+    row['Tags'] = '|'.join(new_tags)
+    return f"{row['Name']} ({row['Position']}): {old_heritage} -> {heritage}"
 
-    def matches_pattern(name, heritage):
-        """Check if name matches cultural pattern for a heritage."""
-        name_lower = name.lower()
 
-        if heritage == 'Skovlan':
-            # Scottish/Celtic/Norse: names with specific patterns
-            skovlan_names = ['angus', 'arden', 'helles', 'rowan', 'arran', 'basran', 'boden',
-                            'brogan', 'clelland', 'dalmore', 'dunvil', 'haig', 'fergus',
-                            'malcolm', 'duncan', 'ewan', 'alastair', 'hamish', 'moira', 'fiona',
-                            'cairn', 'donal', 'gregor', 'rory', 'sean', 'aisling', 'ian',
-                            'finnegan', 'brennan', 'declan', 'donovan', 'flann', 'keegan']
-            # Scottish suffixes
-            if any(name_lower.endswith(s) for s in ['more', 'burn', 'field', 'ran', 'iron', 'gan', 'lan', 'don']):
-                return True
-            # Scottish prefixes
-            if name_lower.startswith('mc') or name_lower.startswith('mac') or name_lower.startswith('o\''):
-                return True
-            # Common Scottish/Irish patterns
-            if any(s in name_lower for s in ['donn', 'bren', 'finn']):
-                return True
-            return name_lower in skovlan_names
-
-        elif heritage == 'Iruvia':
-            # Middle Eastern/Persian/Arabic: specific sound patterns
-            iruvia_indicators = ['aa', 'ee', 'uu', 'oo', 'kh', 'gh', 'qw', 'aj', 'feh', 'barz']
-            # Common Arabic/Persian name elements
-            arabic_names = ['abdul', 'ahmad', 'ali', 'amir', 'ayodele', 'aziz', 'farid', 'hassan',
-                           'jalil', 'kamil', 'malik', 'nasir', 'omar', 'rashid', 'samir', 'tariq',
-                           'zahir', 'ishmael']
-            if name_lower in arabic_names:
-                return True
-            # Check for double vowels or specific consonants
-            return any(ind in name_lower for ind in iruvia_indicators)
-
-        elif heritage == 'Severos':
-            # Slavic/Eastern European/Mediterranean
-            # Greek names (like Papadopoulos)
-            if 'poulos' in name_lower or 'popov' in name_lower:
-                return True
-            # Slavic endings
-            if any(name_lower.endswith(s) for s in ['os', 'is', 'us', 'ov', 'ev', 'ul', 'yr', 'as', 'ius']):
-                return True
-            # Specific Slavic/Mediterranean names
-            severos_names = ['drav', 'kyran', 'milos', 'stavrul', 'veleris', 'vond', 'yury',
-                            'kyra', 'aldo', 'cato', 'dimitri', 'elias', 'marcus', 'basilio',
-                            'constantine', 'greco', 'romano', 'paulo', 'boris', 'dmitri',
-                            'ivan', 'kaspar', 'luka', 'marius', 'nikolai', 'petrov', 'sergei',
-                            'valentin', 'vladimir', 'zoran']
-            # Latin/Greek patterns
-            if any(s in name_lower for s in ['tus', 'lius', 'tius', 'dius']):
-                return True
-            return name_lower in severos_names
-
-        elif heritage == 'Tycheros':
-            # Far Eastern/exotic fantasy names
-            # Specific endings
-            if any(name_lower.endswith(s) for s in ['ath', 'eth', 'och', 'anu', 'alis', 'ax', 'ex', 'ix', 'yx']):
-                return True
-            # Specific patterns
-            tycheros_names = ['akut', 'ammog', 'bael', 'narcus', 'noggs', 'vaurin', 'waase',
-                             'sesereth', 'sethla', 'syra', 'veretta', 'vestine', 'volette',
-                             'athanoch', 'avrathi', 'daralis', 'klevanu', 'nox', 'vex', 'zyx']
-            # Fantasy/exotic patterns
-            if any(s in name_lower for s in ['vra', 'kle', 'dar', 'sese', 'ves', 'vol']):
-                return True
-            return name_lower in tycheros_names
-
-        return False
+class CleanStats:
+    """Change reports and before/after heritage counts for a run (or one chunk of it)"""
+
+    def __init__(self):
+        self.counts_before = {}
+        self.counts_after = {}
+        self.title_changes = []
+        self.title_total = 0
+        self.reassignments = []
+        self.reassign_total = 0
+
+    def merge(self, other):
+        """Add the stats of the chunk that follows this one"""
+        for mine, theirs in ((self.counts_before, other.counts_before),
+                             (self.counts_after, other.counts_after)):
+            for heritage, counts in theirs.items():
+                totals = mine.setdefault(heritage, {'first': 0, 'last': 0, 'nickname': 0})
+                for position, count in counts.items():
+                    totals[position] += count
+
+        self.title_changes.extend(other.title_changes[:REPORT_LIMIT - len(self.title_changes)])
+        self.title_total += other.title_total
+        self.reassignments.extend(other.reassignments[:REPORT_LIMIT - len(self.reassignments)])
+        self.reassign_total += other.reassign_total
+
+
+def clean_rows(rows, rules, writer):
+    """Clean a stream of rows, writing each one and returning CleanStats"""
+    stats = CleanStats()
 
     for row in rows:
-        if row['Position'] in ['first', 'last', 'nickname']:
-            tags = row['Tags'].split('|')
-
-            # Only process if it has Blades - Akoros and not already multi-heritage
-            if 'Blades - Akoros' in tags:
-                name = row['Name']
-                new_heritage = None
-
-                # Check each heritage in priority order (most undersupplied first)
-                for heritage in ['Severos', 'Tycheros', 'Iruvia', 'Skovlan']:
-                    if matches_pattern(name, heritage):
-                        new_heritage = f'Blades - {heritage}'
-                        break
-
-                if new_heritage:
-                    # Replace Blades - Akoros with new heritage
-                    new_tags = [tag for tag in tags if tag != 'Blades - Akoros']
-                    if new_heritage not in new_tags:
-                        new_tags.append(new_heritage)
-                    row['Tags'] = '|'.join(new_tags)
-                    changes.append(f"{name} ({row['Position']}): Akoros -> {new_heritage.replace('Blades - ', '')}")
-
-    print(f"\n=== Reassigned {len(changes)} Names ===")
-    for change in changes[:30]:  # Show first 30
+        count_heritages(stats.counts_before, row, rules.tag_prefix)
+
+        title_change = clean_title(row)
+        if title_change:
+            stats.title_total += 1
+            if len(stats.title_changes) < REPORT_LIMIT:
+                stats.title_changes.append(title_change)
+
+        reassignment = reassign_name(row, rules)
+        if reassignment:
+            stats.reassign_total += 1
+            if len(stats.reassignments) < REPORT_LIMIT:
+                stats.reassignments.append(reassignment)
+
+        count_heritages(stats.counts_after, row, rules.tag_prefix)
+        writer.writerow(row)
+
+    return stats
+
+
+_worker_rules = None
+
+
+def _init_worker(rules):
+    global _worker_rules
+    _worker_rules = rules
+
+
+def _clean_chunk(task):
+    """Worker: clean one byte range, returning (csv_text, CleanStats)"""
+    filename, start, end, fieldnames = task
+    output = io.StringIO(newline='')
+    writer = csv.DictWriter(output, fieldnames=CSV_FIELDS, extrasaction='ignore')
+    stats = clean_rows(read_chunk(filename, start, end, fieldnames), _worker_rules, writer)
+    return output.getvalue(), stats
+
+
+def print_changes(title, changes, total):
+    print(f"\n=== {title}: {total} ===")
+    for change in changes:
         print(change)
-    if len(changes) > 30:
-        print(f"... and {len(changes) - 30} more")
+    if total > len(changes):
+        print(f"... and {total - len(changes)} more")
 
-    return rows
 
-if __name__ == '__main__':
-    rows = load_csv('names.csv')
+def clean_csv(input_file='names.csv', output_file=None, rules=None, jobs=1):
+    """Stream input_file through the cleaning steps into output_file
+
+    Writing goes to a temporary file that replaces output_file at the end, so
+    cleaning a file in place is safe. With jobs > 1 the file is split into
+    chunks that are cleaned in worker processes and written back in order.
+    """
+    rules = rules or HeritageRules.load()
+    output_file = output_file or input_file
+    jobs = resolve_jobs(jobs)
+
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    fd, temp_path = tempfile.mkstemp(suffix='.csv', dir=output_dir)
+
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as outfile:
+            writer = csv.DictWriter(outfile, fieldnames=CSV_FIELDS, extrasaction='ignore')
+            writer.writeheader()
+
+            if jobs == 1:
+                with open(input_file, 'r', encoding='utf-8', newline='') as infile:
+                    stats = clean_rows(csv.DictReader(infile), rules, writer)
+            else:
+                fieldnames, ranges = split_csv(input_file, jobs)
+                tasks = [(input_file, start, end, fieldnames) for start, end in ranges]
+                stats = CleanStats()
+                with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(rules,)) as executor:
+                    for text, chunk_stats in executor.map(_clean_chunk, tasks):
+                        outfile.write(text)
+                        stats.merge(chunk_stats)
+
+        # Keep the permissions of the file being replaced (mkstemp creates 0600)
+        if os.path.exists(output_file):
+            shutil.copymode(output_file, temp_path)
+        else:
+            apply_new_file_mode(temp_path)
+        os.replace(temp_path, output_file)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
 
     print("=== Step 1: Clean Titles ===")
-    rows = clean_titles(rows)
+    print_changes("Cleaned Title Entries", stats.title_changes, stats.title_total)
 
-    print("\n=== Step 2: Analyze Heritage Distribution (Before) ===")
-    analyze_heritage_distribution(rows)
+    print("\n=== Step 2: Heritage Distribution (Before) ===")
+    print_heritage_distribution(stats.counts_before)
 
     print("\n=== Step 3: Reassign Names ===")
-    rows = reassign_names(rows)
+    print_changes("Reassigned Names", stats.reassignments, stats.reassign_total)
+
+    print("\n=== Step 4: Heritage Distribution (After) ===")
+    print_heritage_distribution(stats.counts_after)
 
-    print("\n=== Step 4: Analyze Heritage Distribution (After) ===")
-    analyze_heritage_distribution(rows)
+    print(f"\n✓ Saved cleaned CSV to {output_file}")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Clean titles and reassign heritages in a names CSV.')
+    parser.add_argument('input_file', nargs='?', default='names.csv')
+    parser.add_argument('output_file', nargs='?')
+    parser.add_argument('--rules', default=DEFAULT_RULES_FILE, help='Heritage rules JSON file')
+    parser.add_argument('--jobs', type=int, default=1, help='Worker processes (0 = one per CPU)')
+    args = parser.parse_args()
 
-    # Save cleaned CSV
-    save_csv(rows, 'names.csv')
-    print("\n✓ Saved cleaned CSV")
+    clean_csv(args.input_file, args.output_file, HeritageRules.load(args.rules), args.jobs)
@@ -1,37 +1,41 @@
 #!/usr/bin/env python3
 """
 Script to create the names.db SQLite database schema for Name Generator
-"""
 
-import sqlite3
+The schema is built from a list of numbered migrations. PRAGMA user_version
+records the last one applied, so running this script against an existing
+database only applies the migrations it is missing. Afterwards ANALYZE
+refreshes the planner statistics and the hot queries from DataAccess.js are
+checked with EXPLAIN QUERY PLAN; the script exits with status 1 if any of
+them would scan names or name_tags.
 
-def create_database():
-    """Create the names.db database with all tables and basic reference data"""
+Usage:
+    python3 create_database.py [--db names.db] [--check]
 
-    # Connect to database (creates if doesn't exist)
-    conn = sqlite3.connect('names.db')
-    cursor = conn.cursor()
+    --check: Only run the query plan checks
+"""
 
-    print("Creating tables...")
+import argparse
+import re
+import sqlite3
+import sys
 
-    # Create positions table
-    cursor.execute('''
+# Numbered schema migrations: (version, description, statements)
+MIGRATIONS = [
+    (1, 'Initial schema', [
+        '''
         CREATE TABLE IF NOT EXISTS positions (
             id INTEGER PRIMARY KEY,
             position TEXT UNIQUE
         )
-    ''')
-
-    # Create genders table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS genders (
             id INTEGER PRIMARY KEY,
             gender TEXT UNIQUE
         )
-    ''')
-
-    # Create names table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS names (
             id INTEGER PRIMARY KEY,
             name TEXT UNIQUE NOT NULL,
@@ -41,18 +45,14 @@ def create_database():
             position_id INTEGER REFERENCES positions(id),
             gender_id INTEGER REFERENCES genders(id)
         )
-    ''')
-
-    # Create tag_types table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS tag_types (
             id INTEGER PRIMARY KEY,
             type_name TEXT UNIQUE NOT NULL
         )
-    ''')
-
-    # Create tags table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS tags (
             id INTEGER PRIMARY KEY,
             tag_type_id INTEGER REFERENCES tag_types(id),
@@ -61,25 +61,221 @@ def create_database():
             metadata_json TEXT,
             UNIQUE(tag_type_id, tag_name)
         )
-    ''')
-
-    # Create name_tags junction table
-    cursor.execute('''
+        ''',
+        '''
         CREATE TABLE IF NOT EXISTS name_tags (
             name_id INTEGER REFERENCES names(id) ON DELETE CASCADE,
             tag_id INTEGER REFERENCES tags(id) ON DELETE CASCADE,
             PRIMARY KEY (name_id, tag_id)
         )
-    ''')
+        ''',
+        'CREATE INDEX IF NOT EXISTS idx_names_position ON names(position_id)',
+        'CREATE INDEX IF NOT EXISTS idx_names_gender ON names(gender_id)',
+        'CREATE INDEX IF NOT EXISTS idx_tags_type ON tags(tag_type_id)',
+        'CREATE INDEX IF NOT EXISTS idx_tags_parent ON tags(parent_tag_id)',
+    ]),
+    (2, 'Covering indexes for tag and position/gender lookups', [
+        # Tag filters go tag -> names; the primary key only serves name -> tags
+        'CREATE INDEX IF NOT EXISTS idx_name_tags_tag ON name_tags(tag_id, name_id)',
+        # Position/gender filters and weighted sampling without touching the table
+        '''
+        CREATE INDEX IF NOT EXISTS idx_names_position_gender
+        ON names(position_id, gender_id, frequency_weight)
+        ''',
+    ]),
+    (3, 'Per-tag name count rollup', [
+        # direct_count: names tagged with tag_id itself (Source Dashboard)
+        # total_count: names tagged with tag_id or one of its children (source picker)
+        '''
+        CREATE TABLE IF NOT EXISTS tag_position_gender_counts (
+            tag_id INTEGER NOT NULL REFERENCES tags(id) ON DELETE CASCADE,
+            position_id INTEGER NOT NULL REFERENCES positions(id),
+            gender_id INTEGER NOT NULL REFERENCES genders(id),
+            direct_count INTEGER NOT NULL,
+            total_count INTEGER NOT NULL,
+            PRIMARY KEY (tag_id, position_id, gender_id)
+        ) WITHOUT ROWID
+        ''',
+    ]),
+    (4, 'Full-text search index for the Database Viewer', [
+        # Trigram tokens give substring matches for search-as-you-type.
+        # External content: the text lives only in names, triggers keep the index current.
+        '''
+        CREATE VIRTUAL TABLE IF NOT EXISTS names_fts USING fts5(
+            name, pronunciation, meaning,
+            content='names', content_rowid='id', tokenize='trigram'
+        )
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS names_fts_insert AFTER INSERT ON names BEGIN
+            INSERT INTO names_fts (rowid, name, pronunciation, meaning)
+            VALUES (new.id, new.name, new.pronunciation, new.meaning);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS names_fts_delete AFTER DELETE ON names BEGIN
+            INSERT INTO names_fts (names_fts, rowid, name, pronunciation, meaning)
+            VALUES ('delete', old.id, old.name, old.pronunciation, old.meaning);
+        END
+        ''',
+        '''
+        CREATE TRIGGER IF NOT EXISTS names_fts_update AFTER UPDATE OF name, pronunciation, meaning ON names BEGIN
+            INSERT INTO names_fts (names_fts, rowid, name, pronunciation, meaning)
+            VALUES ('delete', old.id, old.name, old.pronunciation, old.meaning);
+            INSERT INTO names_fts (rowid, name, pronunciation, meaning)
+            VALUES (new.id, new.name, new.pronunciation, new.meaning);
+        END
+        ''',
+        "INSERT INTO names_fts (names_fts) VALUES ('rebuild')",
+    ]),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+REFRESH_TAG_COUNTS_SQL = '''
+    INSERT INTO tag_position_gender_counts
+        (tag_id, position_id, gender_id, direct_count, total_count)
+    WITH tag_scope(tag_id, member_tag_id) AS (
+        SELECT id, id FROM tags
+        UNION ALL
+        SELECT parent_tag_id, id FROM tags WHERE parent_tag_id IS NOT NULL
+    ),
+    direct AS (
+        SELECT nt.tag_id, n.position_id, n.gender_id, COUNT(*) AS name_count
+        FROM name_tags nt
+        JOIN names n ON n.id = nt.name_id
+        GROUP BY nt.tag_id, n.position_id, n.gender_id
+    ),
+    total AS (
+        SELECT s.tag_id, n.position_id, n.gender_id, COUNT(DISTINCT n.id) AS name_count
+        FROM tag_scope s
+        JOIN name_tags nt ON nt.tag_id = s.member_tag_id
+        JOIN names n ON n.id = nt.name_id
+        GROUP BY s.tag_id, n.position_id, n.gender_id
+    )
+    SELECT total.tag_id, total.position_id, total.gender_id,
+           COALESCE(direct.name_count, 0), total.name_count
+    FROM total
+    LEFT JOIN direct USING (tag_id, position_id, gender_id)
+'''
+
+# Hot queries from DataAccess.js (keep in sync) with representative parameters
+HOT_QUERIES = [
+    ('getAliasSampler', '''
+        SELECT n.name, n.frequency_weight FROM names n
+        WHERE n.position_id = (SELECT id FROM positions WHERE position = ?)
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (json_array_length(?) = 0
+               OR n.id IN (SELECT nt.name_id FROM json_each(?) AS tag
+                           CROSS JOIN name_tags nt ON nt.tag_id = tag.value))
+        ORDER BY n.id
+    ''', ('first', '["male", "female", "any"]', '[6, 7]', '[6, 7]')),
+    ('countNames', '''
+        SELECT COUNT(DISTINCT n.id) FROM names n
+        WHERE n.position_id = (SELECT id FROM positions WHERE position = ?)
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (json_array_length(?) = 0
+               OR n.id IN (SELECT nt.name_id FROM json_each(?) AS tag
+                           CROSS JOIN name_tags nt ON nt.tag_id = tag.value))
+    ''', ('first', '["male", "female", "any"]', '[6, 7]', '[6, 7]')),
+    ('countNamesIncludingChildren', '''
+        SELECT COUNT(DISTINCT n.id) FROM names n
+        JOIN positions pos ON n.position_id = pos.id
+        JOIN name_tags nt ON n.id = nt.name_id
+        WHERE pos.position = ?
+          AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(?)))
+          AND (nt.tag_id = ?
+               OR nt.tag_id IN (SELECT id FROM tags WHERE parent_tag_id = ?))
+    ''', ('first', '["male", "female", "any"]', 1, 1)),
+]
+
+# Tables (by alias used in HOT_QUERIES) that hot queries must not scan
+LARGE_TABLES = {'n': 'names', 'names': 'names', 'nt': 'name_tags', 'name_tags': 'name_tags'}
+
+# Below this many rows a scan is genuinely cheaper, and the planner picks one
+FULL_SCAN_MIN_ROWS = 1000
+
+
+def migrate(conn):
+    """Apply pending migrations, each in its own transaction. Returns the versions applied."""
+    current = conn.execute('PRAGMA user_version').fetchone()[0]
+    applied = []
+
+    for version, description, statements in MIGRATIONS:
+        if version <= current:
+            continue
+
+        print(f"Applying migration {version}: {description}...")
+        conn.execute('BEGIN')
+        try:
+            for statement in statements:
+                conn.execute(statement)
+            conn.execute(f'PRAGMA user_version = {version}')
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        applied.append(version)
+
+    return applied
+
+
+def refresh_tag_counts(cursor):
+    """Rebuild tag_position_gender_counts from names/name_tags
+
+    Call it inside the transaction that changed the names so readers never see
+    stale counts. Returns the number of rollup rows.
+    """
+    cursor.execute('DELETE FROM tag_position_gender_counts')
+    cursor.execute(REFRESH_TAG_COUNTS_SQL)
+    return cursor.execute('SELECT COUNT(*) FROM tag_position_gender_counts').fetchone()[0]
+
+
+def check_query_plans(conn):
+    """Print EXPLAIN QUERY PLAN for each hot query. Returns the names of queries that scan a large table."""
+    failures = []
+    # Automatic indexes are built by scanning the table on every execution
+    scan = re.compile(r'^(?:SCAN|SEARCH) (\w+)(?: USING AUTOMATIC|$| USING (?:COVERING )?INDEX \w+$)')
+    row_counts = {
+        table: conn.execute(f'SELECT COUNT(*) FROM {table}').fetchone()[0]
+        for table in set(LARGE_TABLES.values())
+    }
+
+    print("\nQuery plan checks:")
+    for label, sql, params in HOT_QUERIES:
+        plan = [row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}', params)]
+        scanned = [
+            m.group(1) for m in map(scan.match, plan)
+            if m and m.group(1) in LARGE_TABLES
+            and row_counts[LARGE_TABLES[m.group(1)]] >= FULL_SCAN_MIN_ROWS
+        ]
+
+        print(f"  {'✗' if scanned else '✓'} {label}")
+        for detail in plan:
+            print(f"      {detail}")
+        if scanned:
+            failures.append(label)
+
+    return failures
+
+
+def create_database(db_path='names.db'):
+    """Create or migrate the database and fill in the basic reference data"""
+
+    # Connect to database (creates if doesn't exist)
+    conn = sqlite3.connect(db_path)
+    conn.isolation_level = None  # Migrations manage their own transactions
 
-    # Create indexes
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_names_position ON names(position_id)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_names_gender ON names(gender_id)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_type ON tags(tag_type_id)')
-    cursor.execute('CREATE INDEX IF NOT EXISTS idx_tags_parent ON tags(parent_tag_id)')
+    print("Creating tables...")
+    applied = migrate(conn)
+    if not applied:
+        print(f"  Schema already at version {SCHEMA_VERSION}")
 
     print("Tables created successfully!")
 
+    conn.execute('BEGIN')
+    cursor = conn.cursor()
+
     # Populate positions
     print("Populating positions...")
     positions = ["first", "last", "title", "nickname"]
@@ -236,8 +432,14 @@ def create_database():
 
     print(f"  Added {len(default_titles)} default titles")
 
+    print("Refreshing tag counts...")
+    refresh_tag_counts(cursor)
+
     # Commit changes
-    conn.commit()
+    conn.execute('COMMIT')
+
+    # Refresh planner statistics for the new indexes
+    conn.execute('ANALYZE')
 
     # Verify the schema
     print("\n" + "="*50)
@@ -256,13 +458,32 @@ def create_database():
     cursor.execute('SELECT COUNT(*) FROM tags')
     print(f"Tags: {cursor.fetchone()[0]}")
 
+    print(f"Schema version: {SCHEMA_VERSION}")
+
     print("="*50)
     print("\nDatabase ready for data import!")
     print("Run import_test_names.py to populate with test data.")
     print("="*50)
 
+    failures = check_query_plans(conn)
+
     # Close connection
     conn.close()
+    return not failures
 
 if __name__ == '__main__':
-    create_database()
+    parser = argparse.ArgumentParser(description='Create or migrate the names database.')
+    parser.add_argument('--db', default='names.db')
+    parser.add_argument('--check', action='store_true', help='Only run the query plan checks')
+    args = parser.parse_args()
+
+    if args.check:
+        conn = sqlite3.connect(args.db)
+        ok = not check_query_plans(conn)
+        conn.close()
+    else:
+        ok = create_database(args.db)
+
+    if not ok:
+        print("\n✗ Hot queries fall back to full scans - check the indexes above")
+        sys.exit(1)
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Helpers for processing a large CSV in parallel
+
+split_csv() cuts a file into byte ranges that start and end on record
+boundaries (newlines outside quoted fields), and read_chunk() parses one
+range. Workers in a ProcessPoolExecutor each take a range; because the
+ranges are in file order, executor.map() hands results back in the same
+order a serial pass would produce them.
+
+apply_new_file_mode() gives a file written with tempfile.mkstemp() (always
+0600) the mode a plain open() would have created it with, before it replaces
+the real output.
+"""
+
+import csv
+import io
+import os
+
+MIN_CHUNK_BYTES = 1 << 20     # 1 MiB
+MAX_CHUNK_BYTES = 64 << 20    # Bounds per-worker memory
+CHUNKS_PER_JOB = 4            # More chunks than workers keeps every core busy
+SCAN_BLOCK_BYTES = 1 << 20
+
+
+def apply_new_file_mode(path):
+    """chmod path to the mode a newly created file in its directory gets
+
+    The mode is read from a probe file created next to path, so the
+    process-wide umask is never changed.
+    """
+    probe = f'{path}.mode'
+    os.close(os.open(probe, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666))
+    try:
+        os.chmod(path, os.stat(probe).st_mode & 0o777)
+    finally:
+        os.unlink(probe)
+
+
+def resolve_jobs(jobs):
+    """Turn a --jobs value into a worker count (0 means one per CPU)"""
+    if jobs is None or jobs < 0:
+        raise ValueError(f"Invalid job count: {jobs}")
+    return jobs or os.cpu_count() or 1
+
+
+def split_csv(filename, jobs):
+    """Split a CSV file into byte ranges aligned to record boundaries
+
+    Returns (fieldnames, ranges) where ranges is a list of (start, end) byte
+    offsets covering every record after the header, in file order.
+    """
+    size = os.path.getsize(filename)
+
+    with open(filename, 'rb') as f:
+        header = f.readline()
+        data_start = f.tell()
+
+        fieldnames = next(csv.reader([header.decode('utf-8')]), [])
+        if data_start >= size:
+            return fieldnames, []
+
+        chunk_bytes = (size - data_start) // (jobs * CHUNKS_PER_JOB)
+        chunk_bytes = min(MAX_CHUNK_BYTES, max(MIN_CHUNK_BYTES, chunk_bytes))
+
+        boundaries = [data_start]
+        target = data_start + chunk_bytes
+        quotes = 0  # Quote characters seen before the current block ("" escapes keep parity)
+        block_start = data_start
+        f.seek(block_start)
+
+        while target < size:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if not block:
+                break
+            block_end = block_start + len(block)
+
+            # Find the first newline at or after target that is outside quotes
+            while target < block_end:
+                pos = block.find(b'\n', max(target - block_start, 0))
+                while pos != -1 and (quotes + block.count(b'"', 0, pos)) % 2:
+                    pos = block.find(b'\n', pos + 1)
+                if pos == -1:
+                    break
+                boundary = block_start + pos + 1
+                if boundary >= size:
+                    target = size
+                    break
+                boundaries.append(boundary)
+                target = boundary + chunk_bytes
+
+            quotes += block.count(b'"')
+            block_start = block_end
+
+    boundaries.append(size)
+    return fieldnames, list(zip(boundaries, boundaries[1:]))
+
+
+def read_chunk(filename, start, end, fieldnames, newline=''):
+    """Parse the records in one byte range as dicts keyed by fieldnames
+
+    newline should match how the serial code opens the file ('' or None).
+    """
+    with open(filename, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8')
+    return csv.DictReader(io.StringIO(text, newline=newline), fieldnames=fieldnames)
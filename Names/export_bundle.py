@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Script to export names.db as a compact, sharded binary bundle for random.html
+
+The generator page only needs names, weights and genders for the sources the
+user picks. Instead of downloading the whole SQLite file, it can load a
+manifest plus one small shard per (position, source tag):
+
+    bundle/
+        manifest.json              Genders, positions, source tags with counts, shard list
+        first-6-1a2b3c4d.bin       First names tagged 'Blades 68'
+        first-untagged-....bin     First names with no source tag
+        ...
+
+Shard layout (little-endian, every array 4-byte aligned):
+
+    magic     4 bytes   b'NGB1'
+    count     uint32    Number of names
+    strBytes  uint32    Length of the string table
+    reserved  uint32    0
+    ids       uint32[count]      Name ids (a name tagged with several sources is in several shards)
+    weights   float32[count]     frequency_weight
+    offsets   uint32[count + 1]  Start of each name in the string table
+    genders   uint8[count]       Index into manifest 'genders'
+    strings   UTF-8 string table
+
+Shard file names include a hash of their contents, so browsers can cache
+them forever. Shards that are no longer in the manifest are deleted.
+
+Usage:
+    python3 export_bundle.py [output_dir] [--db names.db]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+import sys
+import tempfile
+import time
+
+from csv_chunks import apply_new_file_mode
+
+BUNDLE_MAGIC = b'NGB1'
+BUNDLE_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+UNTAGGED = 'untagged'  # Shard key for names without any source tag
+
+SHARD_SQL = '''
+    SELECT n.id, n.name, n.frequency_weight, n.gender_id
+    FROM names n
+    WHERE n.position_id = ?
+      AND n.id IN (SELECT name_id FROM name_tags WHERE tag_id = ?)
+    ORDER BY n.id
+'''
+
+UNTAGGED_SQL = '''
+    SELECT n.id, n.name, n.frequency_weight, n.gender_id
+    FROM names n
+    WHERE n.position_id = ?
+      AND n.id NOT IN (
+          SELECT nt.name_id FROM name_tags nt
+          JOIN tags t ON nt.tag_id = t.id
+          JOIN tag_types tt ON t.tag_type_id = tt.id
+          WHERE tt.type_name = 'source'
+      )
+    ORDER BY n.id
+'''
+
+# Same order as getSourceTags() in DataAccess.js
+SOURCE_TAGS_SQL = '''
+    SELECT t.id, t.tag_name, t.parent_tag_id, p.tag_name
+    FROM tags t
+    LEFT JOIN tags p ON t.parent_tag_id = p.id
+    WHERE t.tag_type_id = (SELECT id FROM tag_types WHERE type_name = 'source')
+    ORDER BY
+        CASE WHEN t.parent_tag_id IS NULL THEN t.tag_name ELSE p.tag_name END,
+        CASE WHEN t.parent_tag_id IS NULL THEN 0 ELSE 1 END,
+        t.tag_name
+'''
+
+# Names per position for a tag plus its children (what the source picker shows)
+TAG_COUNTS_SQL = '''
+    SELECT p.position, COUNT(DISTINCT n.id)
+    FROM names n
+    JOIN positions p ON n.position_id = p.id
+    JOIN name_tags nt ON n.id = nt.name_id
+    WHERE nt.tag_id = ? OR nt.tag_id IN (SELECT id FROM tags WHERE parent_tag_id = ?)
+    GROUP BY p.position
+'''
+
+
+def encode_shard(rows, gender_index):
+    """Pack (id, name, weight, gender_id) rows into the shard layout"""
+    count = len(rows)
+    encoded = [name.encode('utf-8') for _, name, _, _ in rows]
+
+    offsets = [0]
+    for name in encoded:
+        offsets.append(offsets[-1] + len(name))
+    strings = b''.join(encoded)
+
+    return b''.join([
+        BUNDLE_MAGIC,
+        struct.pack('<III', count, len(strings), 0),
+        struct.pack(f'<{count}I', *(row[0] for row in rows)),
+        struct.pack(f'<{count}f', *(row[2] for row in rows)),
+        struct.pack(f'<{count + 1}I', *offsets),
+        bytes(gender_index[row[3]] for row in rows),
+        strings,
+    ])
+
+
+def write_shard(output_dir, position, key, data):
+    """Write a shard under a content-hashed name; returns its manifest entry"""
+    digest = hashlib.blake2b(data, digest_size=4).hexdigest()
+    filename = f"{position}-{key}-{digest}.bin"
+    path = os.path.join(output_dir, filename)
+
+    if not os.path.exists(path):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    return filename
+
+
+def export_bundle(output_dir='bundle', db_path='names.db'):
+    """Export every (position, source tag) shard plus the manifest
+
+    Returns the manifest dict.
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database not found: {db_path}")
+
+    os.makedirs(output_dir, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    start = time.perf_counter()
+
+    genders = conn.execute('SELECT id, gender FROM genders ORDER BY id').fetchall()
+    gender_index = {gender_id: i for i, (gender_id, _) in enumerate(genders)}
+    positions = conn.execute('SELECT id, position FROM positions ORDER BY position').fetchall()
+    source_tags = conn.execute(SOURCE_TAGS_SQL).fetchall()
+    default_tag = conn.execute("SELECT id FROM tags WHERE tag_name = 'Default'").fetchone()
+
+    sources = []
+    for tag_id, name, parent_id, parent_name in source_tags:
+        counts = dict(conn.execute(TAG_COUNTS_SQL, (tag_id, tag_id)).fetchall())
+        sources.append({
+            'id': tag_id,
+            'name': name,
+            'parentId': parent_id,
+            'parentName': parent_name,
+            'counts': {position: counts.get(position, 0) for _, position in positions},
+        })
+
+    shards = {}
+    total_bytes = 0
+    for position_id, position in positions:
+        shards[position] = {}
+        queries = [(str(tag_id), SHARD_SQL, (position_id, tag_id)) for tag_id, *_ in source_tags]
+        queries.append((UNTAGGED, UNTAGGED_SQL, (position_id,)))
+
+        for key, sql, params in queries:
+            rows = conn.execute(sql, params).fetchall()
+            if not rows:
+                continue
+            data = encode_shard(rows, gender_index)
+            shards[position][key] = {
+                'file': write_shard(output_dir, position, key, data),
+                'count': len(rows),
+                'bytes': len(data),
+            }
+            total_bytes += len(data)
+
+    conn.close()
+
+    manifest = {
+        'version': BUNDLE_VERSION,
+        'genders': [gender for _, gender in genders],
+        'positions': [position for _, position in positions],
+        'defaultTagId': default_tag[0] if default_tag else None,
+        'sources': sources,
+        'shards': shards,
+    }
+
+    # Replace the manifest atomically so a page never sees one pointing at missing shards
+    fd, temp_path = tempfile.mkstemp(suffix='.json', dir=output_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+    # Readable like the shards: mkstemp creates 0600, which a static host may not be able to read
+    apply_new_file_mode(temp_path)
+    os.replace(temp_path, os.path.join(output_dir, MANIFEST_FILE))
+
+    # Remove shards from earlier exports
+    current = {entry['file'] for entries in shards.values() for entry in entries.values()}
+    removed = 0
+    for filename in os.listdir(output_dir):
+        if filename.endswith('.bin') and filename not in current:
+            os.remove(os.path.join(output_dir, filename))
+            removed += 1
+
+    elapsed = time.perf_counter() - start
+    print(f"✓ Exported {len(current)} shards ({total_bytes:,} bytes) to {output_dir}/ in {elapsed:.2f}s")
+    if removed:
+        print(f"  Removed {removed} stale shard(s)")
+
+    return manifest
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Export names.db as a sharded binary bundle.')
+    parser.add_argument('output_dir', nargs='?', default='bundle')
+    parser.add_argument('--db', default='names.db')
+    args = parser.parse_args()
+
+    try:
+        export_bundle(args.output_dir, args.db)
+    except (sqlite3.Error, OSError) as e:
+        print(f"✗ Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -1,65 +1,120 @@
 #!/usr/bin/env python3
 """
-Script to export all names from names.db to a CSV file
+Script to export all names from names.db to a CSV (or JSON Lines) file
 Format: Name, Position, Gender, Weight, Tags
+
+Tags are aggregated in the same query as the names, so the export is a single
+pass over the database regardless of its size.
+
+Usage:
+    python3 export_names_to_csv.py [output_file] [--format csv|jsonl]
 """
 
-import sqlite3
+import argparse
 import csv
+import json
+import sqlite3
 import sys
+import time
+
+FORMATS = ('csv', 'jsonl')
+PROGRESS_INTERVAL = 50000  # Rows between progress lines
 
-def export_names_to_csv(output_file='names.csv'):
-    """Export all names to CSV with human-readable values"""
-
-    conn = sqlite3.connect('names.db')
-    cursor = conn.cursor()
-
-    print(f"Exporting names to {output_file}...")
-
-    # Query all names with their positions and genders
-    cursor.execute('''
-        SELECT
-            n.id,
-            n.name,
-            p.position,
-            g.gender,
-            n.frequency_weight
-        FROM names n
-        JOIN positions p ON n.position_id = p.id
-        JOIN genders g ON n.gender_id = g.id
-        ORDER BY n.id
-    ''')
-
-    names_data = cursor.fetchall()
-
-    # Open CSV file for writing
-    with open(output_file, 'w', newline='', encoding='utf-8') as csvfile:
-        writer = csv.writer(csvfile)
-
-        # Write header
-        writer.writerow(['Name', 'Position', 'Gender', 'Weight', 'Tags'])
-
-        # Write each name
-        for name_id, name, position, gender, weight in names_data:
-            # Get all tags for this name
-            cursor.execute('''
+# One row per name; tags are sorted inside the subquery before group_concat
+EXPORT_SQL = '''
+    SELECT
+        n.name,
+        p.position,
+        g.gender,
+        n.frequency_weight,
+        COALESCE((
+            SELECT group_concat(tag_name, '|') FROM (
                 SELECT t.tag_name
-                FROM tags t
-                JOIN name_tags nt ON t.id = nt.tag_id
-                WHERE nt.name_id = ?
+                FROM name_tags nt
+                JOIN tags t ON t.id = nt.tag_id
+                WHERE nt.name_id = n.id
                 ORDER BY t.tag_name
-            ''', (name_id,))
+            )
+        ), '')
+    FROM names n
+    JOIN positions p ON n.position_id = p.id
+    JOIN genders g ON n.gender_id = g.id
+    ORDER BY n.id
+'''
+
+
+def write_csv(rows, outfile):
+    """Write rows as CSV with pipe-separated tags, yielding after each row"""
+    writer = csv.writer(outfile)
+    writer.writerow(['Name', 'Position', 'Gender', 'Weight', 'Tags'])
+    for row in rows:
+        writer.writerow(row)
+        yield
+
+
+def write_jsonl(rows, outfile):
+    """Write rows as one JSON object per line, yielding after each row"""
+    for name, position, gender, weight, tags in rows:
+        record = {
+            'name': name,
+            'position': position,
+            'gender': gender,
+            'weight': weight,
+            'tags': tags.split('|') if tags else [],
+        }
+        outfile.write(json.dumps(record, ensure_ascii=False) + '\n')
+        yield
 
-            tag_rows = cursor.fetchall()
-            tags = '|'.join(tag[0] for tag in tag_rows)  # Pipe-separated tags
 
-            writer.writerow([name, position, gender, weight, tags])
+WRITERS = {'csv': write_csv, 'jsonl': write_jsonl}
+
+
+def export_names_to_csv(output_file='names.csv', output_format='csv', db_path='names.db'):
+    """Export all names with human-readable values
+
+    Returns the number of names exported.
+    """
+    if output_format not in WRITERS:
+        raise ValueError(f"Unknown format '{output_format}'. Expected one of: {', '.join(FORMATS)}")
+
+    conn = sqlite3.connect(db_path)
+    total = conn.execute('SELECT COUNT(*) FROM names').fetchone()[0]
+
+    print(f"Exporting {total} names to {output_file} ({output_format})...")
+    start = time.perf_counter()
+    count = 0
+
+    # Iterate the cursor directly so rows stream to disk instead of being held in memory
+    with open(output_file, 'w', newline='', encoding='utf-8') as outfile:
+        for _ in WRITERS[output_format](conn.execute(EXPORT_SQL), outfile):
+            count += 1
+            if count % PROGRESS_INTERVAL == 0:
+                print(f"  {count}/{total} names written...")
 
     conn.close()
+    elapsed = time.perf_counter() - start
+
+    rate = count / elapsed if elapsed > 0 else 0
+    print(f"✓ Exported {count} names to {output_file} in {elapsed:.2f}s ({rate:,.0f} names/s)")
+    if output_format == 'csv':
+        print(f"  Format: Name, Position, Gender, Weight, Tags (pipe-separated)")
+    else:
+        print(f"  Format: JSON Lines with name, position, gender, weight, tags (list)")
+
+    return count
 
-    print(f"✓ Exported {len(names_data)} names to {output_file}")
-    print(f"  Format: Name, Position, Gender, Weight, Tags (pipe-separated)")
 
 if __name__ == '__main__':
-    output_file = sys.argv[1] if len(sys.argv) > 1 else 'names.csv'
-    export_names_to_csv(output_file)
+    parser = argparse.ArgumentParser(description='Export names from names.db.')
+    parser.add_argument('output_file', nargs='?',
+                        help='Output path (default: names.csv or names.jsonl)')
+    parser.add_argument('--format', choices=FORMATS, default='csv', dest='output_format')
+    parser.add_argument('--db', default='names.db')
+    args = parser.parse_args()
+
+    output_file = args.output_file or f"names.{args.output_format}"
+    try:
+        export_names_to_csv(output_file, args.output_format, args.db)
+    except sqlite3.Error as e:
+        print(f"✗ Export failed: {e}", file=sys.stderr)
+        sys.exit(1)
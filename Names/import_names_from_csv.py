@@ -4,129 +4,441 @@ Script to import names from a CSV file into names.db
 Format: Name, Position, Gender, Weight, Tags (pipe-separated)
 
 Usage:
-    python3 import_names_from_csv.py [filename] [-reset]
+    python3 import_names_from_csv.py [filename] [-reset] [-bulk] [--jobs N]
+    python3 import_names_from_csv.py [filename] -sync [-dry-run] [--jobs N]
 
     filename: Path to CSV file (default: names.csv)
     -reset: Clear all existing names before importing
+    -bulk: Fast load settings (WAL, relaxed sync, index rebuild). Used
+           automatically for CSVs with BULK_ROW_THRESHOLD or more valid rows.
+    -sync: Make the database match the CSV, applying only the differences
+           (inserts, updates, tag changes, deletes) in one transaction.
+           Existing names keep their ids.
+    -dry-run: With -sync, report the differences without changing anything
+    --jobs N: Validate chunks of the CSV in N worker processes (0 = one per
+              CPU). Results and error reports match a serial run.
+
+The whole CSV is validated first, then valid rows are inserted with
+executemany() in chunked transactions. Each chunk is committed on its own, so
+a failing row never discards rows that were already imported.
 """
 
 import sqlite3
 import csv
+import hashlib
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
 
-def validate_and_import_csv(csv_file='names.csv', reset=False):
-    """Import names from CSV with validation and error reporting"""
+from create_database import migrate, refresh_tag_counts
+from csv_chunks import read_chunk, resolve_jobs, split_csv
 
-    conn = sqlite3.connect('names.db')
-    cursor = conn.cursor()
-
-    print(f"Importing names from {csv_file}...")
-
-    # Handle reset flag
-    if reset:
-        print("⚠ Resetting database - deleting all existing names...")
-        cursor.execute('DELETE FROM name_tags')
-        cursor.execute('DELETE FROM names')
-        conn.commit()
-        print("  All existing names cleared.")
+CHUNK_SIZE = 50000            # Rows per transaction
+BULK_ROW_THRESHOLD = 100000   # Valid rows at which bulk mode turns on automatically
 
-    # Get valid positions
-    cursor.execute('SELECT position FROM positions')
-    valid_positions = {row[0] for row in cursor.fetchall()}
+# Tables whose secondary indexes and triggers are dropped and rebuilt around a bulk load
+BULK_INDEXED_TABLES = ('names', 'name_tags')
 
-    # Get valid genders
-    cursor.execute('SELECT gender FROM genders')
-    valid_genders = {row[0] for row in cursor.fetchall()}
+SYNC_REPORT_LIMIT = 20        # Changes listed per category in the sync report
 
-    # Get valid tags (by name)
-    cursor.execute('SELECT id, tag_name FROM tags')
-    tag_name_to_id = {row[1]: row[0] for row in cursor.fetchall()}
 
-    # Get position and gender IDs for lookups
+def load_lookups(cursor):
+    """Read the reference tables needed to validate and resolve CSV rows"""
     cursor.execute('SELECT position, id FROM positions')
     position_to_id = {row[0]: row[1] for row in cursor.fetchall()}
 
     cursor.execute('SELECT gender, id FROM genders')
     gender_to_id = {row[0]: row[1] for row in cursor.fetchall()}
 
-    # Read and process CSV
+    cursor.execute('SELECT id, tag_name FROM tags')
+    tag_name_to_id = {row[1]: row[0] for row in cursor.fetchall()}
+
+    cursor.execute('SELECT name FROM names')
+    existing_names = {row[0] for row in cursor.fetchall()}
+
+    return {
+        'positions': position_to_id,
+        'genders': gender_to_id,
+        'tags': tag_name_to_id,
+        'existing_names': existing_names,
+    }
+
+
+def validate_row(row, lookups):
+    """Validate one CSV row
+
+    Returns (record, errors). record is (name, position_id, gender_id, weight,
+    tag_ids) and is None when there are errors.
+    """
+    errors = []
+
+    # Validate required fields
+    if not row.get('Name') or not row['Name'].strip():
+        errors.append("missing or empty Name")
+
+    if not row.get('Position'):
+        errors.append("missing Position")
+    elif row['Position'] not in lookups['positions']:
+        errors.append(f"unknown position '{row['Position']}'")
+
+    if not row.get('Gender'):
+        errors.append("missing Gender")
+    elif row['Gender'] not in lookups['genders']:
+        errors.append(f"unknown gender '{row['Gender']}'")
+
+    # Validate weight
+    try:
+        weight = float(row.get('Weight', 1.0))
+        if weight <= 0:
+            errors.append(f"invalid weight '{weight}' (must be > 0)")
+    except (ValueError, TypeError):
+        errors.append(f"invalid weight '{row.get('Weight')}' (must be a number)")
+        weight = 1.0
+
+    # Validate tags
+    tag_list = []
+    if row.get('Tags'):
+        tags_str = row['Tags'].strip()
+        if tags_str:
+            tag_list = [t.strip() for t in tags_str.split('|') if t.strip()]
+            for tag in tag_list:
+                if tag not in lookups['tags']:
+                    errors.append(f"unknown tag '{tag}'")
+            if len(set(tag_list)) != len(tag_list):
+                errors.append("duplicate tags")
+
+    if errors:
+        return None, errors
+
+    record = (
+        row['Name'].strip(),
+        lookups['positions'][row['Position']],
+        lookups['genders'][row['Gender']],
+        weight,
+        tuple(lookups['tags'][tag] for tag in tag_list)
+    )
+    return record, []
+
+
+_worker_lookups = None
+
+
+def _init_worker(lookups):
+    global _worker_lookups
+    _worker_lookups = lookups
+
+
+def _validate_chunk(task):
+    """Worker: validate the rows in one byte range, returning [(record, errors), ...]"""
+    csv_file, start, end, fieldnames = task
+    return [validate_row(row, _worker_lookups)
+            for row in read_chunk(csv_file, start, end, fieldnames, newline=None)]
+
+
+def validate_rows(csv_file, lookups, jobs=1):
+    """Yield (record, errors) for every CSV row in file order
+
+    With jobs > 1 the file is split into chunks validated in worker processes.
+    """
+    if jobs == 1:
+        with open(csv_file, 'r', encoding='utf-8') as csvfile:
+            for row in csv.DictReader(csvfile):
+                yield validate_row(row, lookups)
+        return
+
+    fieldnames, ranges = split_csv(csv_file, jobs)
+
+    # Workers only need the reference tables, not the (possibly huge) name set
+    worker_lookups = {k: lookups[k] for k in ('positions', 'genders', 'tags')}
+    tasks = [(csv_file, start, end, fieldnames) for start, end in ranges]
+    with ProcessPoolExecutor(jobs, initializer=_init_worker, initargs=(worker_lookups,)) as executor:
+        for results in executor.map(_validate_chunk, tasks):
+            yield from results
+
+
+def validate_csv(csv_file, lookups, allow_existing=False, jobs=1):
+    """First pass: validate every row and check names are unique
+
+    allow_existing skips the check against names already in the database
+    (sync mode updates them instead). Row checks can run in jobs worker
+    processes; the uniqueness checks always run here, in file order.
+
+    Returns (records, failures) where records is a list of (row_num, record)
+    and failures a list of (row_num, message).
+    """
+    records = []
+    failures = []
+    seen_names = {}
+
+    # Start at 2 (1 is header)
+    for row_num, (record, errors) in enumerate(validate_rows(csv_file, lookups, jobs), start=2):
+        if record:
+            name = record[0]
+            if not allow_existing and name in lookups['existing_names']:
+                errors.append(f"name '{name}' already exists in database")
+            elif name in seen_names:
+                errors.append(f"duplicate name '{name}' (first seen on row {seen_names[name]})")
+            else:
+                seen_names[name] = row_num
+
+        if errors:
+            failures.append((row_num, ", ".join(errors)))
+        else:
+            records.append((row_num, record))
+
+    return records, failures
+
+
+def get_secondary_indexes(cursor):
+    """Return (type, name, sql) for the explicitly created indexes and triggers on the bulk-loaded tables"""
+    placeholders = ', '.join('?' for _ in BULK_INDEXED_TABLES)
+    cursor.execute(f'''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        ORDER BY type, name
+    ''', BULK_INDEXED_TABLES)
+    return cursor.fetchall()
+
+
+def has_table(cursor, table_name):
+    cursor.execute("SELECT 1 FROM sqlite_master WHERE name = ?", (table_name,))
+    return cursor.fetchone() is not None
+
+
+def insert_chunk(cursor, chunk, first_id):
+    """Insert a chunk of validated records with executemany, assigning ids from first_id"""
+    name_rows = []
+    tag_rows = []
+    for offset, (_, (name, position_id, gender_id, weight, tag_ids)) in enumerate(chunk):
+        name_id = first_id + offset
+        name_rows.append((name_id, name, position_id, gender_id, weight))
+        tag_rows.extend((name_id, tag_id) for tag_id in tag_ids)
+
+    cursor.executemany('''
+        INSERT INTO names (id, name, position_id, gender_id, frequency_weight)
+        VALUES (?, ?, ?, ?, ?)
+    ''', name_rows)
+    cursor.executemany('INSERT INTO name_tags (name_id, tag_id) VALUES (?, ?)', tag_rows)
+
+
+def insert_rows_individually(cursor, chunk, first_id):
+    """Slow path for a chunk that failed: insert row by row, isolating failures with savepoints
+
+    Returns (successes, failures).
+    """
+    successes = 0
+    failures = []
+    next_id = first_id
+
+    for item in chunk:
+        row_num = item[0]
+        cursor.execute('SAVEPOINT import_row')
+        try:
+            insert_chunk(cursor, [item], next_id)
+            cursor.execute('RELEASE import_row')
+            successes += 1
+            next_id += 1
+        except sqlite3.IntegrityError as e:
+            cursor.execute('ROLLBACK TO import_row')
+            cursor.execute('RELEASE import_row')
+            failures.append((row_num, f"database error - {str(e)}"))
+
+    return successes, failures
+
+
+def insert_records(conn, records, chunk_size=CHUNK_SIZE):
+    """Second pass: insert validated records in chunked transactions
+
+    Returns (successes, failures).
+    """
+    cursor = conn.cursor()
     successes = 0
     failures = []
 
+    cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM names')
+    next_id = cursor.fetchone()[0]
+
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+
+        cursor.execute('BEGIN')
+        try:
+            insert_chunk(cursor, chunk, next_id)
+            chunk_successes, chunk_failures = len(chunk), []
+        except sqlite3.IntegrityError:
+            # Only this chunk is rolled back; earlier chunks are already committed
+            cursor.execute('ROLLBACK')
+            cursor.execute('BEGIN')
+            chunk_successes, chunk_failures = insert_rows_individually(cursor, chunk, next_id)
+        cursor.execute('COMMIT')
+
+        successes += chunk_successes
+        failures.extend(chunk_failures)
+        next_id += chunk_successes
+
+        if len(records) > chunk_size:
+            print(f"  {min(start + chunk_size, len(records))}/{len(records)} rows inserted...")
+
+    return successes, failures
+
+
+def row_digest(position_id, gender_id, weight, tag_ids):
+    """Hash the syncable fields of a name so CSV rows and database rows compare cheaply"""
+    canonical = f"{position_id}|{gender_id}|{float(weight)!r}|{','.join(map(str, sorted(tag_ids)))}"
+    return hashlib.blake2b(canonical.encode('utf-8'), digest_size=16).digest()
+
+
+def load_db_state(cursor):
+    """Read every name with its fields and tag ids in one query
+
+    Returns {name: (id, digest, position_id, gender_id, weight, tag_ids)}.
+    """
+    cursor.execute('''
+        SELECT n.id, n.name, n.position_id, n.gender_id, n.frequency_weight,
+               (SELECT group_concat(nt.tag_id) FROM name_tags nt WHERE nt.name_id = n.id)
+        FROM names n
+    ''')
+
+    state = {}
+    for name_id, name, position_id, gender_id, weight, tag_ids in cursor:
+        tag_ids = frozenset(int(t) for t in tag_ids.split(',')) if tag_ids else frozenset()
+        digest = row_digest(position_id, gender_id, weight, tag_ids)
+        state[name] = (name_id, digest, position_id, gender_id, weight, tag_ids)
+    return state
+
+
+def diff_records(records, db_state):
+    """Compare validated CSV records against the database state
+
+    Returns a dict of change lists:
+        inserts:     (row_num, record)
+        updates:     (row_num, name_id, record, old_fields) for position/gender/weight changes
+        tag_changes: (row_num, name_id, name, added_tag_ids, removed_tag_ids)
+        deletes:     (name_id, name)
+    """
+    diff = {'inserts': [], 'updates': [], 'tag_changes': [], 'deletes': []}
+    seen = set()
+
+    for row_num, record in records:
+        name, position_id, gender_id, weight, tag_ids = record
+        seen.add(name)
+
+        existing = db_state.get(name)
+        if existing is None:
+            diff['inserts'].append((row_num, record))
+            continue
+
+        name_id, digest, old_position_id, old_gender_id, old_weight, old_tag_ids = existing
+        if row_digest(position_id, gender_id, weight, tag_ids) == digest:
+            continue
+
+        old_fields = (old_position_id, old_gender_id, old_weight)
+        if (position_id, gender_id, weight) != old_fields:
+            diff['updates'].append((row_num, name_id, record, old_fields))
+
+        new_tag_ids = frozenset(tag_ids)
+        if new_tag_ids != old_tag_ids:
+            diff['tag_changes'].append((
+                row_num, name_id, name,
+                sorted(new_tag_ids - old_tag_ids),
+                sorted(old_tag_ids - new_tag_ids)
+            ))
+
+    for name, (name_id, *_) in db_state.items():
+        if name not in seen:
+            diff['deletes'].append((name_id, name))
+    diff['deletes'].sort()
+
+    return diff
+
+
+def apply_diff(conn, diff):
+    """Apply a sync diff in a single transaction (all or nothing)"""
+    cursor = conn.cursor()
+    cursor.execute('BEGIN')
     try:
-        with open(csv_file, 'r', encoding='utf-8') as csvfile:
-            reader = csv.DictReader(csvfile)
-
-            for row_num, row in enumerate(reader, start=2):  # Start at 2 (1 is header)
-                errors = []
-
-                # Validate required fields
-                if not row.get('Name') or not row['Name'].strip():
-                    errors.append("missing or empty Name")
-
-                if not row.get('Position'):
-                    errors.append("missing Position")
-                elif row['Position'] not in valid_positions:
-                    errors.append(f"unknown position '{row['Position']}'")
-
-                if not row.get('Gender'):
-                    errors.append("missing Gender")
-                elif row['Gender'] not in valid_genders:
-                    errors.append(f"unknown gender '{row['Gender']}'")
-
-                # Validate weight
-                try:
-                    weight = float(row.get('Weight', 1.0))
-                    if weight <= 0:
-                        errors.append(f"invalid weight '{weight}' (must be > 0)")
-                except (ValueError, TypeError):
-                    errors.append(f"invalid weight '{row.get('Weight')}' (must be a number)")
-                    weight = 1.0
-
-                # Validate tags
-                tag_list = []
-                if row.get('Tags'):
-                    tags_str = row['Tags'].strip()
-                    if tags_str:
-                        tag_list = [t.strip() for t in tags_str.split('|') if t.strip()]
-                        for tag in tag_list:
-                            if tag not in tag_name_to_id:
-                                errors.append(f"unknown tag '{tag}'")
-
-                # If there are validation errors, record them
-                if errors:
-                    error_msg = f"Row {row_num}: " + ", ".join(errors)
-                    failures.append(error_msg)
-                    continue
-
-                # Insert the name
-                try:
-                    cursor.execute('''
-                        INSERT INTO names (name, position_id, gender_id, frequency_weight)
-                        VALUES (?, ?, ?, ?)
-                    ''', (
-                        row['Name'].strip(),
-                        position_to_id[row['Position']],
-                        gender_to_id[row['Gender']],
-                        weight
-                    ))
-
-                    # Get the inserted name's ID
-                    name_id = cursor.lastrowid
-
-                    # Insert tag associations
-                    for tag in tag_list:
-                        cursor.execute('''
-                            INSERT INTO name_tags (name_id, tag_id)
-                            VALUES (?, ?)
-                        ''', (name_id, tag_name_to_id[tag]))
-
-                    successes += 1
-
-                except sqlite3.IntegrityError as e:
-                    failures.append(f"Row {row_num}: database error - {str(e)}")
-                    conn.rollback()
+        delete_ids = [(name_id,) for name_id, _ in diff['deletes']]
+        cursor.executemany('DELETE FROM name_tags WHERE name_id = ?', delete_ids)
+        cursor.executemany('DELETE FROM names WHERE id = ?', delete_ids)
+
+        cursor.executemany('''
+            UPDATE names SET position_id = ?, gender_id = ?, frequency_weight = ?
+            WHERE id = ?
+        ''', [(record[1], record[2], record[3], name_id)
+              for _, name_id, record, _ in diff['updates']])
+
+        cursor.executemany('DELETE FROM name_tags WHERE name_id = ? AND tag_id = ?', [
+            (name_id, tag_id)
+            for _, name_id, _, _, removed in diff['tag_changes'] for tag_id in removed
+        ])
+        cursor.executemany('INSERT INTO name_tags (name_id, tag_id) VALUES (?, ?)', [
+            (name_id, tag_id)
+            for _, name_id, _, added, _ in diff['tag_changes'] for tag_id in added
+        ])
+
+        if diff['inserts']:
+            cursor.execute('SELECT COALESCE(MAX(id), 0) + 1 FROM names')
+            insert_chunk(cursor, diff['inserts'], cursor.fetchone()[0])
+
+        refresh_tag_counts(cursor)
+        cursor.execute('COMMIT')
+    except sqlite3.Error:
+        cursor.execute('ROLLBACK')
+        raise
+
+
+def print_diff(diff, lookups):
+    """Print the sync diff, listing up to SYNC_REPORT_LIMIT changes per category"""
+    id_to_position = {v: k for k, v in lookups['positions'].items()}
+    id_to_gender = {v: k for k, v in lookups['genders'].items()}
+    id_to_tag = {v: k for k, v in lookups['tags'].items()}
+
+    def describe(position_id, gender_id, weight):
+        return f"{id_to_position[position_id]}, {id_to_gender[gender_id]}, {weight}"
+
+    def tag_names(tag_ids):
+        return '|'.join(id_to_tag[t] for t in tag_ids)
+
+    sections = [
+        ('Inserts', diff['inserts'], lambda c: (
+            f"Row {c[0]}: + {c[1][0]} ({describe(*c[1][1:4])})")),
+        ('Updates', diff['updates'], lambda c: (
+            f"Row {c[0]}: ~ {c[2][0]} ({describe(*c[3])} -> {describe(*c[2][1:4])})")),
+        ('Tag changes', diff['tag_changes'], lambda c: (
+            f"Row {c[0]}: ~ {c[2]}" +
+            (f" +[{tag_names(c[3])}]" if c[3] else '') +
+            (f" -[{tag_names(c[4])}]" if c[4] else ''))),
+        ('Deletes', diff['deletes'], lambda c: f"- {c[1]}"),
+    ]
+
+    for title, changes, line in sections:
+        print(f"{title}: {len(changes)}")
+        for change in changes[:SYNC_REPORT_LIMIT]:
+            print(f"  * {line(change)}")
+        if len(changes) > SYNC_REPORT_LIMIT:
+            print(f"  ... and {len(changes) - SYNC_REPORT_LIMIT} more")
+
+
+def sync_csv(csv_file='names.csv', dry_run=False, jobs=1):
+    """Make names.db match the CSV by applying only the differences
+
+    The CSV is treated as the complete list: names missing from it are deleted.
+    Nothing is changed if any row fails validation.
+    """
+
+    conn = sqlite3.connect('names.db')
+    conn.isolation_level = None  # Transactions are managed explicitly
+    cursor = conn.cursor()
+
+    print(f"Syncing names.db with {csv_file}{' (dry run)' if dry_run else ''}...")
+    start_time = time.perf_counter()
+    migrate(conn)
 
+    lookups = load_lookups(cursor)
+
+    try:
+        records, failures = validate_csv(csv_file, lookups, allow_existing=True,
+                                         jobs=resolve_jobs(jobs))
     except FileNotFoundError:
         print(f"✗ Error: File '{csv_file}' not found")
         conn.close()
@@ -137,8 +449,109 @@ def validate_and_import_csv(csv_file='names.csv', reset=False):
         conn.close()
         return
 
-    # Commit all successful inserts
-    conn.commit()
+    if failures:
+        # An invalid row would otherwise look like a deleted name
+        print(f"✗ {len(failures)} invalid rows - nothing was changed. Fix these and sync again:")
+        for row_num, message in failures:
+            print(f"  * Row {row_num}: {message}")
+        conn.close()
+        return
+
+    diff = diff_records(records, load_db_state(cursor))
+
+    print(f"\n{'='*60}")
+    print_diff(diff, lookups)
+    print(f"{'='*60}")
+
+    if not any(diff.values()):
+        print("Already in sync - nothing to do.")
+    elif dry_run:
+        print("Dry run - no changes were made.")
+    else:
+        apply_diff(conn, diff)
+        print("✓ Changes applied.")
+
+    print(f"Elapsed: {time.perf_counter() - start_time:.2f}s")
+
+    cursor.execute('SELECT COUNT(*) FROM names')
+    print(f"Total names in database: {cursor.fetchone()[0]}")
+
+    conn.close()
+
+
+def validate_and_import_csv(csv_file='names.csv', reset=False, bulk=None, jobs=1):
+    """Import names from CSV with validation and error reporting
+
+    bulk=None picks bulk mode automatically based on the number of valid rows.
+    jobs > 1 validates the CSV in that many worker processes.
+    """
+
+    conn = sqlite3.connect('names.db')
+    conn.isolation_level = None  # Transactions are managed explicitly
+    cursor = conn.cursor()
+
+    print(f"Importing names from {csv_file}...")
+    start_time = time.perf_counter()
+    migrate(conn)
+
+    # Handle reset flag
+    if reset:
+        print("⚠ Resetting database - deleting all existing names...")
+        cursor.execute('BEGIN')
+        cursor.execute('DELETE FROM name_tags')
+        cursor.execute('DELETE FROM names')
+        cursor.execute('COMMIT')
+        print("  All existing names cleared.")
+
+    lookups = load_lookups(cursor)
+
+    # Pass 1: validate everything before touching the database
+    try:
+        records, failures = validate_csv(csv_file, lookups, jobs=resolve_jobs(jobs))
+    except FileNotFoundError:
+        print(f"✗ Error: File '{csv_file}' not found")
+        conn.close()
+        return
+    except (csv.Error, UnicodeDecodeError, KeyError) as e:
+        print(f"✗ Error reading CSV: {str(e)}")
+        print(f"   This usually means the CSV file is malformed or has missing columns.")
+        conn.close()
+        return
+
+    if bulk is None:
+        bulk = len(records) >= BULK_ROW_THRESHOLD
+
+    # Pass 2: load
+    indexes = []
+    if bulk:
+        print(f"  Bulk mode: WAL journal, synchronous=NORMAL, rebuilding indexes after load")
+        cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        indexes = get_secondary_indexes(cursor)
+        for object_type, object_name, _ in indexes:
+            cursor.execute(f'DROP {object_type.upper()} IF EXISTS "{object_name}"')
+
+    try:
+        successes, insert_failures = insert_records(conn, records)
+    finally:
+        if bulk:
+            for _, _, object_sql in indexes:
+                cursor.execute(object_sql)
+            # The search index triggers were off during the load; rebuild it in one pass
+            if has_table(cursor, 'names_fts'):
+                cursor.execute("INSERT INTO names_fts (names_fts) VALUES ('rebuild')")
+            # Planner statistics for the new data (see create_database.py)
+            cursor.execute('ANALYZE')
+            # sql.js cannot open WAL databases, so leave the file in rollback-journal mode
+            cursor.execute('PRAGMA journal_mode = DELETE')
+            cursor.execute('PRAGMA synchronous = FULL')
+
+    cursor.execute('BEGIN')
+    refresh_tag_counts(cursor)
+    cursor.execute('COMMIT')
+
+    failures = sorted(failures + insert_failures)
+    elapsed = time.perf_counter() - start_time
 
     # Report results
     total = successes + len(failures)
@@ -146,11 +559,12 @@ def validate_and_import_csv(csv_file='names.csv', reset=False):
     print(f"Import complete!")
     print(f"{'='*60}")
     print(f"Loaded {total} rows. {successes} successes. {len(failures)} failures.")
+    print(f"Elapsed: {elapsed:.2f}s")
 
     if failures:
         print(f"\nErrors:")
-        for failure in failures:
-            print(f"  * {failure}")
+        for row_num, message in failures:
+            print(f"  * Row {row_num}: {message}")
 
     print(f"{'='*60}")
 
@@ -165,11 +579,29 @@ if __name__ == '__main__':
     # Parse command-line arguments
     csv_file = 'names.csv'
     reset = False
-
-    for arg in sys.argv[1:]:
-        if arg == '-reset':
+    bulk = None
+    sync = False
+    dry_run = False
+    jobs = 1
+
+    args = iter(sys.argv[1:])
+    for arg in args:
+        if arg == '--jobs':
+            jobs = int(next(args, '1'))
+        elif arg.startswith('--jobs='):
+            jobs = int(arg.split('=', 1)[1])
+        elif arg == '-reset':
             reset = True
+        elif arg == '-bulk':
+            bulk = True
+        elif arg == '-sync':
+            sync = True
+        elif arg == '-dry-run':
+            dry_run = True
         elif not arg.startswith('-'):
             csv_file = arg
 
-    validate_and_import_csv(csv_file, reset)
+    if sync:
+        sync_csv(csv_file, dry_run, jobs)
+    else:
+        validate_and_import_csv(csv_file, reset, bulk, jobs)
@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Server-side name generation over names.db
+
+Python counterpart of generateRandomName() in DataAccess.js: same filters
+(genders, source tags including child tags), same nickname/title rules and
+Default-title fallback. Used by server.py's /api/names endpoint so thin
+clients can get a batch of names without downloading the database.
+
+Queries keep a fixed SQL text (list filters are passed as JSON arrays through
+json_each), so each pooled connection compiles them once and reuses the
+prepared statements from sqlite3's statement cache.
+
+Usage:
+    python3 name_generator.py [count] [--genders male,female] [--sources "Blades 68"]
+"""
+
+import argparse
+import contextlib
+import itertools
+import json
+import os
+import queue
+import random
+import sqlite3
+import urllib.parse
+
+# Keep in sync with the constants in DataAccess.js
+THRESHOLD_TITLES_FOR_DEFAULT_FALLBACK = 25
+DEFAULT_NICKNAME_FREQUENCY = 0.25
+DEFAULT_TITLE_FREQUENCY = 0.10
+
+DEFAULT_POOL_SIZE = 4
+
+TAG_IDS_FOR_SOURCES_SQL = '''
+    SELECT id FROM tags WHERE tag_name IN (SELECT value FROM json_each(:sources))
+    UNION
+    SELECT id FROM tags WHERE parent_tag_id IN (
+        SELECT id FROM tags WHERE tag_name IN (SELECT value FROM json_each(:sources))
+    )
+'''
+
+CANDIDATES_SQL = '''
+    SELECT n.name, n.frequency_weight FROM names n
+    WHERE n.position_id = (SELECT id FROM positions WHERE position = :position)
+      AND n.gender_id IN (SELECT id FROM genders WHERE gender IN (SELECT value FROM json_each(:genders)))
+      AND (json_array_length(:tag_ids) = 0
+           OR n.id IN (SELECT nt.name_id FROM json_each(:tag_ids) AS tag
+                       CROSS JOIN name_tags nt ON nt.tag_id = tag.value))
+    ORDER BY n.id
+'''
+
+DEFAULT_TAG_SQL = "SELECT id FROM tags WHERE tag_name = 'Default'"
+
+
+class ConnectionPool:
+    """Fixed-size pool of read-only SQLite connections shared between threads"""
+
+    def __init__(self, db_path='names.db', size=DEFAULT_POOL_SIZE):
+        uri = f"file:{urllib.parse.quote(os.path.abspath(db_path))}?mode=ro"
+        self._idle = queue.Queue()
+        self._connections = []
+
+        for _ in range(size):
+            conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+            self._connections.append(conn)
+            self._idle.put(conn)
+
+    @contextlib.contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of a with-block"""
+        conn = self._idle.get()
+        try:
+            yield conn
+        finally:
+            self._idle.put(conn)
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+
+
+class WeightedNames:
+    """Candidate names for one position, sampled in proportion to frequency_weight"""
+
+    def __init__(self, rows):
+        self.names = [name for name, _ in rows]
+        self.cum_weights = list(itertools.accumulate(weight for _, weight in rows))
+
+    def __len__(self):
+        return len(self.names)
+
+    def pick(self, rng):
+        if not self.names:
+            return None
+        return rng.choices(self.names, cum_weights=self.cum_weights)[0]
+
+
+def get_tag_ids_for_sources(conn, source_names):
+    """Convert source tag names to tag IDs, including child tags"""
+    cursor = conn.execute(TAG_IDS_FOR_SOURCES_SQL, {'sources': json.dumps(list(source_names))})
+    return [row[0] for row in cursor]
+
+
+def get_candidates(conn, position, genders, tag_ids):
+    """Fetch the weighted candidate names for a position/gender/tag filter"""
+    cursor = conn.execute(CANDIDATES_SQL, {
+        'position': position,
+        'genders': json.dumps(list(genders)),
+        'tag_ids': json.dumps(list(tag_ids)),
+    })
+    return WeightedNames(cursor.fetchall())
+
+
+def generate_random_names(conn, genders, source_names=(), count=1,
+                          nickname_frequency=DEFAULT_NICKNAME_FREQUENCY,
+                          title_frequency=DEFAULT_TITLE_FREQUENCY, rng=random):
+    """Generate a batch of full names with optional nicknames and titles
+
+    Candidate lists are fetched once per batch, so the cost is a handful of
+    queries regardless of count.
+
+    Raises ValueError for invalid options or when required names are missing.
+    """
+    genders = list(genders)
+    source_names = list(source_names)
+
+    if not [g for g in genders if g != 'any']:
+        raise ValueError('Please select at least one gender (male, female, ambiguous, or queer)')
+
+    tag_ids = get_tag_ids_for_sources(conn, source_names) if source_names else []
+    if source_names and not tag_ids:
+        raise ValueError('No valid sources found in database')
+
+    first_names = get_candidates(conn, 'first', genders, tag_ids)
+    last_names = get_candidates(conn, 'last', genders, tag_ids)
+    if not first_names or not last_names:
+        raise ValueError('Could not find required first or last names in database '
+                         'with selected genders and sources')
+
+    nicknames = None
+    if nickname_frequency > 0:
+        nicknames = get_candidates(conn, 'nickname', genders, tag_ids)
+
+    titles = None
+    if title_frequency > 0:
+        titles = get_candidates(conn, 'title', genders, tag_ids)
+        # Sources with few titles also draw from the Default titles
+        if tag_ids and len(titles) < THRESHOLD_TITLES_FOR_DEFAULT_FALLBACK:
+            default_tag = conn.execute(DEFAULT_TAG_SQL).fetchone()
+            if default_tag:
+                titles = get_candidates(conn, 'title', genders, tag_ids + [default_tag[0]])
+
+    results = []
+    for _ in range(count):
+        full_name = first_names.pick(rng)
+        last_name = last_names.pick(rng)
+
+        if nicknames is not None and rng.random() < nickname_frequency:
+            # No nicknames available: use a first name. Otherwise 50/50.
+            if not nicknames or rng.random() >= 0.5:
+                nickname = first_names.pick(rng)
+            else:
+                nickname = nicknames.pick(rng)
+            if nickname:
+                full_name += f' "{nickname}"'
+
+        full_name += f' {last_name}'
+
+        if titles is not None and rng.random() < title_frequency:
+            title = titles.pick(rng)
+            if title:
+                full_name = f'{title} {full_name}'
+
+        results.append(full_name)
+
+    return results
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Generate random names from names.db.')
+    parser.add_argument('count', nargs='?', type=int, default=10)
+    parser.add_argument('--genders', default='male,female,ambiguous,queer,any')
+    parser.add_argument('--sources', default='')
+    parser.add_argument('--db', default='names.db')
+    args = parser.parse_args()
+
+    pool = ConnectionPool(args.db, size=1)
+    with pool.connection() as conn:
+        names = generate_random_names(
+            conn,
+            [g for g in args.genders.split(',') if g],
+            [s for s in args.sources.split(',') if s],
+            args.count
+        )
+    pool.close()
+
+    for name in names:
+        print(name)
@@ -0,0 +1,285 @@
+/**
+ * Random.js - Pluggable random number generators
+ *
+ * Pure functions with NO DOM dependencies. Every roller and shuffler takes an
+ * optional rng argument implementing this interface:
+ *
+ *   rng.nextUint32()   - uniform integer in [0, 2^32)
+ *   rng.nextFloat()    - uniform float in [0, 1)
+ *   rng.nextInt(bound) - uniform integer in [0, bound)
+ *   rng.fill(array)    - fill a Uint32Array with uniform words
+ *
+ * Three generators are provided:
+ *   - mathRandomRng: Math.random(), the default
+ *   - createSeededRng(seed): xoshiro128**, fast and reproducible
+ *   - createCryptoRng(): crypto.getRandomValues(), read in blocks
+ *
+ * The seeded and crypto generators draw bounded integers without bias
+ * (Lemire's multiply-and-reject method).
+ */
+
+/**
+ * Random 32-bit words fetched per crypto.getRandomValues() call
+ * (Web Crypto allows at most 65536 bytes per call)
+ * @type {number}
+ */
+export const RANDOM_BLOCK_SIZE = 16384;
+
+const UINT32_RANGE = 4294967296;
+const FLOAT53_RANGE = 9007199254740992;
+
+// Largest bound for which word * bound is exact in a double (2^21 * 2^32 = 2^53)
+const EXACT_PRODUCT_BOUND = 0x200000;
+
+/**
+ * Draw an unbiased integer in [0, bound) from 32-bit words
+ * Lemire's method: the high word of word * bound, rejecting the few low words
+ * that would over-represent some results.
+ * @param {Function} nextUint32 - Source of uniform 32-bit words
+ * @param {number} bound - Exclusive upper bound (1 to 2^32)
+ * @returns {number} - Integer in [0, bound)
+ */
+function boundedInt(nextUint32, bound) {
+    if (bound <= EXACT_PRODUCT_BOUND) {
+        let product = nextUint32() * bound;
+        let high = Math.floor(product / UINT32_RANGE);
+        let low = product - high * UINT32_RANGE;
+
+        if (low < bound) {
+            const threshold = (UINT32_RANGE - bound) % bound;
+            while (low < threshold) {
+                product = nextUint32() * bound;
+                high = Math.floor(product / UINT32_RANGE);
+                low = product - high * UINT32_RANGE;
+            }
+        }
+        return high;
+    }
+
+    // The product no longer fits in a double: reject words past the last full run instead
+    const limit = UINT32_RANGE - (UINT32_RANGE % bound);
+    let word = nextUint32();
+    while (word >= limit) {
+        word = nextUint32();
+    }
+    return word % bound;
+}
+
+/**
+ * Build the rng interface around a 32-bit word source
+ * @param {Function} nextUint32 - Source of uniform 32-bit words
+ * @param {Object} [extra] - Additional properties (fill, seed, state accessors)
+ * @returns {Object} - rng
+ */
+function createRngFromWords(nextUint32, extra = {}) {
+    return {
+        nextUint32,
+        nextFloat() {
+            // 53 random bits: 27 from one word, 26 from the next
+            return ((nextUint32() >>> 5) * 67108864 + (nextUint32() >>> 6)) / FLOAT53_RANGE;
+        },
+        nextInt(bound) {
+            if (!Number.isInteger(bound) || bound < 1 || bound > UINT32_RANGE) {
+                throw new Error(`Invalid bound: ${bound}. Must be an integer from 1 to 2^32.`);
+            }
+            return boundedInt(nextUint32, bound);
+        },
+        fill(array) {
+            for (let i = 0; i < array.length; i++) {
+                array[i] = nextUint32();
+            }
+            return array;
+        },
+        ...extra
+    };
+}
+
+/**
+ * Generator backed by Math.random(), with the same float scaling the rollers
+ * have always used (Math.floor(Math.random() * bound)).
+ * @type {Object}
+ */
+export const mathRandomRng = {
+    nextUint32() {
+        return Math.floor(Math.random() * UINT32_RANGE);
+    },
+    nextFloat() {
+        return Math.random();
+    },
+    nextInt(bound) {
+        return Math.floor(Math.random() * bound);
+    },
+    fill(array) {
+        for (let i = 0; i < array.length; i++) {
+            array[i] = Math.floor(Math.random() * UINT32_RANGE);
+        }
+        return array;
+    }
+};
+
+/**
+ * Expand a 32-bit value into a stream of well-mixed words (SplitMix32)
+ * @param {number} seed - 32-bit seed
+ * @returns {Function} - Returns the next word
+ */
+function splitMix32(seed) {
+    let state = seed >>> 0;
+    return function next() {
+        state = (state + 0x9e3779b9) | 0;
+        let z = state;
+        z = Math.imul(z ^ (z >>> 16), 0x85ebca6b);
+        z = Math.imul(z ^ (z >>> 13), 0xc2b2ae35);
+        return (z ^ (z >>> 16)) >>> 0;
+    };
+}
+
+/**
+ * Turn a number or string seed into a 32-bit value
+ * @param {number|string} seed - Seed
+ * @returns {number} - 32-bit seed
+ */
+function hashSeed(seed) {
+    if (typeof seed === 'number' && Number.isFinite(seed)) {
+        return Math.trunc(seed) >>> 0;
+    }
+    if (typeof seed === 'string') {
+        // FNV-1a
+        let hash = 0x811c9dc5;
+        for (let i = 0; i < seed.length; i++) {
+            hash = Math.imul(hash ^ seed.charCodeAt(i), 0x01000193);
+        }
+        return hash >>> 0;
+    }
+    throw new Error(`Invalid seed: ${seed}. Must be a number or string.`);
+}
+
+/**
+ * Create a fast, reproducible generator (xoshiro128**)
+ * The same seed always produces the same sequence, so a session can be replayed
+ * by recording its seed (or its getState() at any point).
+ * @param {number|string} [seed] - Seed (a random one is chosen if omitted)
+ * @returns {Object} - rng with seed, getState() and setState(state)
+ *
+ * @example
+ * const rng = createSeededRng('session-42');
+ * rollDice(3, 6, rng); // same rolls every time for this seed
+ */
+export function createSeededRng(seed = randomSeed()) {
+    const seedValue = hashSeed(seed);
+    const expand = splitMix32(seedValue);
+    let s0 = expand();
+    let s1 = expand();
+    let s2 = expand();
+    let s3 = expand();
+
+    function nextUint32() {
+        const result = Math.imul(rotl(Math.imul(s1, 5), 7), 9);
+        const t = s1 << 9;
+
+        s2 ^= s0;
+        s3 ^= s1;
+        s1 ^= s2;
+        s0 ^= s3;
+        s2 ^= t;
+        s3 = rotl(s3, 11);
+
+        return result >>> 0;
+    }
+
+    return createRngFromWords(nextUint32, {
+        seed,
+        getState() {
+            return [s0 >>> 0, s1 >>> 0, s2 >>> 0, s3 >>> 0];
+        },
+        setState(state) {
+            if (!Array.isArray(state) || state.length !== 4 || state.every(word => (word >>> 0) === 0)) {
+                throw new Error('Invalid state: expected four 32-bit words, not all zero');
+            }
+            [s0, s1, s2, s3] = state.map(word => word | 0);
+        }
+    });
+}
+
+/**
+ * Pick a seed for createSeededRng() when none is given
+ * @returns {number} - 32-bit seed
+ */
+function randomSeed() {
+    if (createCryptoRng.available()) {
+        return globalThis.crypto.getRandomValues(new Uint32Array(1))[0];
+    }
+    return mathRandomRng.nextUint32();
+}
+
+/**
+ * Rotate a 32-bit value left
+ * @param {number} x - Value
+ * @param {number} k - Bits to rotate
+ * @returns {number} - Rotated value
+ */
+function rotl(x, k) {
+    return (x << k) | (x >>> (32 - k));
+}
+
+/**
+ * Create a generator backed by crypto.getRandomValues()
+ * Words are fetched RANDOM_BLOCK_SIZE at a time; fill() writes straight into
+ * the caller's array.
+ * @returns {Object} - rng
+ * @throws {Error} - If Web Crypto is unavailable
+ */
+export function createCryptoRng() {
+    if (!createCryptoRng.available()) {
+        throw new Error('crypto.getRandomValues() is not available');
+    }
+
+    const block = new Uint32Array(RANDOM_BLOCK_SIZE);
+    let index = RANDOM_BLOCK_SIZE;
+
+    function nextUint32() {
+        if (index === RANDOM_BLOCK_SIZE) {
+            globalThis.crypto.getRandomValues(block);
+            index = 0;
+        }
+        return block[index++];
+    }
+
+    return createRngFromWords(nextUint32, {
+        fill(array) {
+            for (let start = 0; start < array.length; start += RANDOM_BLOCK_SIZE) {
+                globalThis.crypto.getRandomValues(array.subarray(start, start + RANDOM_BLOCK_SIZE));
+            }
+            return array;
+        }
+    });
+}
+
+/**
+ * Check whether createCryptoRng() can be used here
+ * @returns {boolean} - True if crypto.getRandomValues() exists
+ */
+createCryptoRng.available = function () {
+    return typeof globalThis.crypto !== 'undefined' && typeof globalThis.crypto.getRandomValues === 'function';
+};
+
+let defaultRng = mathRandomRng;
+
+/**
+ * Get the generator used when no rng argument is passed
+ * @returns {Object} - rng
+ */
+export function getDefaultRng() {
+    return defaultRng;
+}
+
+/**
+ * Set the generator used when no rng argument is passed
+ * Install a seeded generator to make a whole session replayable.
+ * @param {Object|null} rng - Generator, or null to go back to Math.random()
+ * @returns {Object} - The previous default generator
+ */
+export function setDefaultRng(rng) {
+    const previous = defaultRng;
+    defaultRng = rng || mathRandomRng;
+    return previous;
+}
@@ -0,0 +1,429 @@
+/**
+ * Simulation.js - Monte Carlo simulation on a worker pool
+ *
+ * Splits a large number of trials into chunks and runs them on Web Workers
+ * (worker_threads under Node), so big simulations never block the page.
+ * Every finished chunk is merged into one histogram and reported through
+ * onProgress(), so the UI can show results converging. Runs can be cancelled
+ * with an AbortSignal.
+ *
+ * Tasks describe what one trial measures:
+ *   { type: 'roll', options }        - rollDiceWithModifiers() options; total, or successCount when counting
+ *   { type: 'expression', expression } - A dice expression (see compileDiceExpression())
+ *   { type: 'blades', numDice }      - rollBladesDice() result 1-6, or 7 for a critical
+ *
+ * The worker entry point is SimulationWorker.js.
+ */
+
+import { rollBatch, rollExpressionBatch, compileDiceExpression } from './DiceLibrary.js';
+import { createSeededRng, createCryptoRng, getDefaultRng } from './Random.js';
+
+/**
+ * Trials per chunk handed to a worker (and per progress update)
+ * @type {number}
+ */
+export const SIMULATION_CHUNK_SIZE = 250000;
+
+/**
+ * Histogram value used for a critical success in 'blades' tasks
+ * @type {number}
+ */
+export const BLADES_CRITICAL_VALUE = 7;
+
+const WORKER_URL = new URL('./SimulationWorker.js', import.meta.url);
+
+const isNode = typeof process !== 'undefined' && process.versions != null && process.versions.node != null;
+
+/**
+ * Check that a task can be simulated
+ * @param {Object} task - Simulation task
+ * @throws {Error} - If the task is invalid
+ */
+export function validateSimulationTask(task) {
+    if (!task || typeof task !== 'object') {
+        throw new Error('Task must be an object');
+    }
+
+    switch (task.type) {
+        case 'roll':
+            // Tasks are cloned to workers, and an rng holds functions
+            if (task.options && task.options.rng !== undefined) {
+                throw new Error('Invalid task: options.rng cannot be sent to a worker. Pass options.seed to run() instead.');
+            }
+            // rollBatch() validates the options; one trial is enough to surface errors
+            rollBatch(task.options, 1);
+            break;
+        case 'expression':
+            compileDiceExpression(task.expression);
+            break;
+        case 'blades':
+            if (!Number.isInteger(task.numDice) || task.numDice < 0) {
+                throw new Error(`Invalid number of dice: ${task.numDice}. Must be a non-negative integer.`);
+            }
+            break;
+        default:
+            throw new Error(`Invalid task type: ${task.type}. Must be 'roll', 'expression' or 'blades'.`);
+    }
+}
+
+/**
+ * Roll a Blades pool trials times, writing one histogram value per trial
+ * Same rules as rollBladesDice(), without building per-roll objects.
+ * @param {number} numDice - Pool size (0 rolls two dice and keeps the lowest)
+ * @param {number} trials - Number of trials
+ * @param {Object} rng - Random number generator
+ * @returns {Int32Array} - Result (1-6), or BLADES_CRITICAL_VALUE for a critical
+ */
+function simulateBlades(numDice, trials, rng) {
+    const values = new Int32Array(trials);
+
+    for (let t = 0; t < trials; t++) {
+        if (numDice === 0) {
+            values[t] = Math.min(rng.nextInt(6), rng.nextInt(6)) + 1;
+            continue;
+        }
+
+        let highest = 0;
+        let sixes = 0;
+        for (let d = 0; d < numDice; d++) {
+            const roll = rng.nextInt(6) + 1;
+            if (roll > highest) highest = roll;
+            if (roll === 6) sixes++;
+        }
+        values[t] = sixes > 1 ? BLADES_CRITICAL_VALUE : highest;
+    }
+
+    return values;
+}
+
+/**
+ * Count how often each value occurs
+ * @param {Int32Array|Uint32Array} values - Per-trial values
+ * @returns {Object} - Histogram { min: number, counts: Float64Array }
+ */
+function buildHistogram(values) {
+    let min = Infinity;
+    let max = -Infinity;
+    for (let i = 0; i < values.length; i++) {
+        if (values[i] < min) min = values[i];
+        if (values[i] > max) max = values[i];
+    }
+
+    const counts = new Float64Array(max - min + 1);
+    for (let i = 0; i < values.length; i++) {
+        counts[values[i] - min]++;
+    }
+    return { min, counts };
+}
+
+/**
+ * Run one chunk of a simulation on the current thread
+ * Used by the workers; also handy for small runs and tests.
+ * @param {Object} task - Simulation task (see the top of this file)
+ * @param {number} trials - Number of trials
+ * @param {number|string|null} [seed] - Seed for a reproducible chunk (Web Crypto if omitted)
+ * @returns {Object} - { trials, min, counts: Float64Array }
+ * @throws {Error} - If the task or trials is invalid
+ */
+export function simulateChunk(task, trials, seed = null) {
+    if (!Number.isInteger(trials) || trials < 1) {
+        throw new Error(`Invalid number of trials: ${trials}. Must be a positive integer.`);
+    }
+
+    const rng = seed === null || seed === undefined ? undefined : createSeededRng(seed);
+    let values;
+
+    switch (task && task.type) {
+        case 'roll': {
+            const batch = rollBatch({ ...task.options, rng }, trials);
+            values = batch.successCounts || batch.totals;
+            break;
+        }
+        case 'expression':
+            values = rollExpressionBatch(task.expression, trials, { rng }).totals;
+            break;
+        case 'blades':
+            validateSimulationTask(task);
+            values = simulateBlades(task.numDice, trials, rng || (createCryptoRng.available() ? createCryptoRng() : getDefaultRng()));
+            break;
+        default:
+            validateSimulationTask(task);
+    }
+
+    const { min, counts } = buildHistogram(values);
+    return { trials, min, counts };
+}
+
+/**
+ * Add a chunk's histogram into a running histogram
+ * @param {Object} total - Running histogram { min, counts } (counts may be empty)
+ * @param {Object} chunk - Chunk histogram { min, counts }
+ * @returns {Object} - The merged histogram (a new object when the range grows)
+ */
+function mergeHistogram(total, chunk) {
+    if (total.counts.length === 0) {
+        return { min: chunk.min, counts: Float64Array.from(chunk.counts) };
+    }
+
+    const min = Math.min(total.min, chunk.min);
+    const max = Math.max(total.min + total.counts.length, chunk.min + chunk.counts.length) - 1;
+    let merged = total;
+    if (min !== total.min || max - min + 1 !== total.counts.length) {
+        merged = { min, counts: new Float64Array(max - min + 1) };
+        merged.counts.set(total.counts, total.min - min);
+    }
+
+    const offset = chunk.min - merged.min;
+    for (let i = 0; i < chunk.counts.length; i++) {
+        merged.counts[offset + i] += chunk.counts[i];
+    }
+    return merged;
+}
+
+/**
+ * Summarize a histogram
+ * @param {Object} histogram - { min, counts }
+ * @param {number} trials - Requested number of trials
+ * @returns {Object} - { completed, trials, mean, variance, min, max, histogram }
+ */
+function summarizeHistogram(histogram, trials) {
+    let completed = 0;
+    let sum = 0;
+    let squares = 0;
+    let lowest = null;
+    let highest = null;
+
+    histogram.counts.forEach((count, i) => {
+        if (count === 0) return;
+        const value = histogram.min + i;
+        completed += count;
+        sum += count * value;
+        squares += count * value * value;
+        if (lowest === null) lowest = value;
+        highest = value;
+    });
+
+    const mean = completed ? sum / completed : 0;
+    return {
+        completed,
+        trials,
+        mean,
+        variance: completed ? Math.max(0, squares / completed - mean * mean) : 0,
+        min: lowest,
+        max: highest,
+        histogram: { min: histogram.min, counts: histogram.counts.slice() }
+    };
+}
+
+/**
+ * Start a worker running SimulationWorker.js
+ * @returns {Promise<Object>} - { post(message), hold(busy), listen(onMessage, onError), terminate() }
+ */
+async function spawnWorker() {
+    if (isNode) {
+        const { Worker } = await import('node:worker_threads');
+        const worker = new Worker(WORKER_URL);
+        return {
+            post: message => worker.postMessage(message),
+            // Only busy workers keep the process alive
+            hold: busy => (busy ? worker.ref() : worker.unref()),
+            listen(onMessage, onError) {
+                worker.removeAllListeners('message');
+                worker.removeAllListeners('error');
+                worker.on('message', onMessage);
+                worker.on('error', onError);
+            },
+            terminate: () => worker.terminate()
+        };
+    }
+
+    const worker = new Worker(WORKER_URL, { type: 'module' });
+    return {
+        post: message => worker.postMessage(message),
+        hold: () => {},
+        listen(onMessage, onError) {
+            worker.onmessage = event => onMessage(event.data);
+            worker.onerror = event => {
+                event.preventDefault();
+                onError(new Error(event.message));
+            };
+        },
+        terminate: () => worker.terminate()
+    };
+}
+
+/**
+ * Number of workers to use when no size is given
+ * @returns {number} - Logical CPU count (4 if unknown)
+ */
+function defaultPoolSize() {
+    const cores = globalThis.navigator && globalThis.navigator.hardwareConcurrency;
+    return Number.isInteger(cores) && cores > 0 ? cores : 4;
+}
+
+/**
+ * Create a reusable pool of simulation workers
+ * Workers start on the first run and stay alive until terminate() (or a
+ * cancelled run, which stops them mid-chunk).
+ *
+ * @param {number} [size] - Number of workers (defaults to the CPU count)
+ * @returns {Object} - { size, run(task, trials, options), terminate() }
+ */
+export function createSimulationPool(size = defaultPoolSize()) {
+    if (!Number.isInteger(size) || size < 1) {
+        throw new Error(`Invalid pool size: ${size}. Must be a positive integer.`);
+    }
+
+    let workers = [];
+    let running = false;
+
+    function terminate() {
+        workers.forEach(worker => worker.terminate());
+        workers = [];
+    }
+
+    /**
+     * Run a simulation on the pool
+     * @param {Object} task - Simulation task (see the top of this file)
+     * @param {number} trials - Total number of trials
+     * @param {Object} [options] - Optional settings
+     * @param {number} [options.chunkSize=SIMULATION_CHUNK_SIZE] - Trials per chunk
+     * @param {number|string} [options.seed] - Makes the run reproducible (for any pool size)
+     * @param {Function} [options.onProgress] - Called with a summary after every chunk
+     * @param {AbortSignal} [options.signal] - Aborting stops the workers and rejects
+     * @returns {Promise<Object>} - { completed, trials, mean, variance, min, max, histogram: { min, counts } }
+     */
+    async function run(task, trials, options = {}) {
+        const { chunkSize = SIMULATION_CHUNK_SIZE, seed, onProgress, signal } = options;
+
+        validateSimulationTask(task);
+        if (!Number.isInteger(trials) || trials < 1) {
+            throw new Error(`Invalid number of trials: ${trials}. Must be a positive integer.`);
+        }
+        if (!Number.isInteger(chunkSize) || chunkSize < 1) {
+            throw new Error(`Invalid chunk size: ${chunkSize}. Must be a positive integer.`);
+        }
+        if (running) {
+            throw new Error('This pool is already running a simulation');
+        }
+        if (signal && signal.aborted) {
+            throw signal.reason;
+        }
+
+        const chunkCount = Math.ceil(trials / chunkSize);
+        running = true;
+        try {
+            while (workers.length < Math.min(size, chunkCount)) {
+                workers.push(await spawnWorker());
+            }
+        } catch (error) {
+            running = false;
+            throw error;
+        }
+        const active = workers.slice(0, chunkCount);
+
+        return new Promise((resolve, reject) => {
+            let histogram = { min: 0, counts: new Float64Array(0) };
+            let nextChunk = 0;
+            let finishedChunks = 0;
+            let settled = false;
+
+            const finish = (error, summary) => {
+                if (settled) return;
+                settled = true;
+                running = false;
+                workers.forEach(worker => worker.hold(false));
+                if (signal) signal.removeEventListener('abort', onAbort);
+                if (error) {
+                    reject(error);
+                } else {
+                    resolve(summary);
+                }
+            };
+
+            const onAbort = () => {
+                terminate();
+                finish(signal.reason);
+            };
+
+            const dispatch = worker => {
+                if (nextChunk >= chunkCount) return;
+                const index = nextChunk++;
+                try {
+                    worker.post({
+                        task,
+                        trials: Math.min(chunkSize, trials - index * chunkSize),
+                        // Seeding per chunk (not per worker) keeps results independent of scheduling
+                        seed: seed === undefined ? null : `${seed}:${index}`
+                    });
+                } catch (error) {
+                    // e.g. DataCloneError: the pool must not stay marked as running
+                    terminate();
+                    finish(error);
+                }
+            };
+
+            if (signal) {
+                signal.addEventListener('abort', onAbort);
+                // Aborted while the workers were spawning
+                if (signal.aborted) {
+                    onAbort();
+                    return;
+                }
+            }
+
+            active.forEach(worker => {
+                worker.hold(true);
+                worker.listen(message => {
+                    if (settled) return;
+                    if (message.error) {
+                        terminate();
+                        finish(new Error(message.error));
+                        return;
+                    }
+
+                    histogram = mergeHistogram(histogram, message);
+                    finishedChunks++;
+                    const summary = summarizeHistogram(histogram, trials);
+
+                    if (onProgress) {
+                        onProgress(summary);
+                    }
+                    if (finishedChunks === chunkCount) {
+                        finish(null, summary);
+                    } else {
+                        dispatch(worker);
+                    }
+                }, error => {
+                    terminate();
+                    finish(error);
+                });
+                if (!settled) {
+                    dispatch(worker);
+                }
+            });
+        });
+    }
+
+    return { size, run, terminate };
+}
+
+/**
+ * Run one simulation on a temporary worker pool
+ * Same arguments and result as pool.run(); options.workers sets the pool size.
+ *
+ * @example
+ * const controller = new AbortController();
+ * const result = await runSimulation(
+ *     { type: 'expression', expression: '4d6kh3' }, 1e8,
+ *     { onProgress: summary => showMean(summary.mean), signal: controller.signal }
+ * );
+ */
+export async function runSimulation(task, trials, options = {}) {
+    const pool = createSimulationPool(options.workers);
+    try {
+        return await pool.run(task, trials, options);
+    } finally {
+        pool.terminate();
+    }
+}
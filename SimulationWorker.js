@@ -0,0 +1,27 @@
+/**
+ * SimulationWorker.js - Worker entry point for Simulation.js
+ *
+ * Runs one chunk per message ({ task, trials, seed }) and replies with its
+ * histogram ({ trials, min, counts }) or { error }. Works as a module Web
+ * Worker and as a Node worker_threads worker.
+ */
+
+import { simulateChunk } from './Simulation.js';
+
+const isWebWorker = typeof self !== 'undefined' && typeof self.postMessage === 'function';
+const port = isWebWorker ? self : (await import('node:worker_threads')).parentPort;
+
+function handleMessage({ task, trials, seed }) {
+    try {
+        const chunk = simulateChunk(task, trials, seed);
+        port.postMessage(chunk, [chunk.counts.buffer]);
+    } catch (error) {
+        port.postMessage({ error: error.message });
+    }
+}
+
+if (isWebWorker) {
+    self.onmessage = event => handleMessage(event.data);
+} else {
+    port.on('message', handleMessage);
+}
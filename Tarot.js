@@ -7,7 +7,16 @@
  * Includes full 78-card deck: 22 Major Arcana + 56 Minor Arcana
  */
 
-import { createDeck, shuffleDeck, drawCard } from './CardLibrary.js';
+import {
+    createDeck,
+    drawCard,
+    createCardTable,
+    createIndexedDeck,
+    partialShuffleIndexedDeck,
+    drawIndex,
+    isIndexReversed
+} from './CardLibrary.js';
+import { getDefaultRng } from './Random.js';
 
 // Major Arcana cards (0-21) with meanings
 export const majorArcana = [
@@ -165,31 +174,63 @@ suits.forEach(suit => {
     });
 });
 
+// Shared card tables for indexed decks, one per deck type
+const tarotCardTables = {
+    major: createCardTable(majorArcana),
+    minor: createCardTable(minorArcana),
+    both: createCardTable([...majorArcana, ...minorArcana])
+};
+
+/**
+ * Get the shared, frozen card table for a deck type
+ * @param {string} [deckType='major'] - 'major', 'minor', or 'both'
+ * @returns {Array} - Card table (unknown types get the Major Arcana)
+ */
+export function getTarotCardTable(deckType = 'major') {
+    return tarotCardTables[deckType] || tarotCardTables.major;
+}
+
 /**
  * Create a tarot deck based on type
  * @param {string} [deckType='major'] - 'major', 'minor', or 'both'
  * @returns {Array} - Array of card objects
  */
 export function createTarotDeck(deckType = 'major') {
-    switch (deckType) {
-        case 'both':
-            return createDeck([...majorArcana, ...minorArcana]);
-        case 'major':
-            return createDeck(majorArcana);
-        case 'minor':
-            return createDeck(minorArcana);
-        default:
-            return createDeck(majorArcana);
+    return createDeck(getTarotCardTable(deckType));
+}
+
+/**
+ * Create an indexed tarot deck (see CardLibrary.js) over the shared card table
+ * Reuse it with resetIndexedDeck() for large numbers of readings.
+ * @param {string} [deckType='major'] - 'major', 'minor', or 'both'
+ * @param {boolean} [allowReversed=false] - Whether shuffles pick card orientations
+ * @returns {Object} - Indexed deck
+ */
+export function createIndexedTarotDeck(deckType = 'major', allowReversed = false) {
+    return createIndexedDeck(getTarotCardTable(deckType), allowReversed);
+}
+
+/**
+ * Draw the top card of an indexed tarot deck
+ * @param {Object} deck - Indexed tarot deck
+ * @returns {Object|null} - A copy of the card with isReversed, or null if the deck is empty
+ */
+export function drawIndexedTarotCard(deck) {
+    const index = drawIndex(deck);
+    if (index === -1) {
+        return null;
     }
+    return { ...deck.table[index], isReversed: isIndexReversed(deck, index) };
 }
 
 /**
  * Draw a tarot card with optional reversed orientation
  * @param {Array} deck - The deck to draw from
  * @param {boolean} [allowReversed=false] - Whether cards can be reversed
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object|null} - The drawn card with isReversed property, or null if deck empty
  */
-export function drawTarotCard(deck, allowReversed = false) {
+export function drawTarotCard(deck, allowReversed = false, rng = getDefaultRng()) {
     const card = drawCard(deck);
 
     if (!card) {
@@ -200,7 +241,7 @@ export function drawTarotCard(deck, allowReversed = false) {
     // 50% chance of card being reversed if option is enabled
     return {
         ...card,
-        isReversed: allowReversed && Math.random() < 0.5
+        isReversed: allowReversed && rng.nextFloat() < 0.5
     };
 }
 
@@ -208,14 +249,16 @@ export function drawTarotCard(deck, allowReversed = false) {
  * Perform a three-card spread (Past, Present, Future)
  * @param {string} [deckType='major'] - Type of deck to use
  * @param {boolean} [allowReversed=false] - Whether to allow reversed cards
+ * @param {Object} [rng] - Random number generator (see Random.js)
  * @returns {Object} - { past: Object, present: Object, future: Object }
  */
-export function performThreeCardSpread(deckType = 'major', allowReversed = false) {
-    const deck = shuffleDeck(createTarotDeck(deckType));
+export function performThreeCardSpread(deckType = 'major', allowReversed = false, rng = getDefaultRng()) {
+    // Only the three cards drawn need shuffling
+    const deck = partialShuffleIndexedDeck(createIndexedTarotDeck(deckType, allowReversed), 3, rng);
 
-    const past = drawTarotCard(deck, allowReversed);
-    const present = drawTarotCard(deck, allowReversed);
-    const future = drawTarotCard(deck, allowReversed);
+    const past = drawIndexedTarotCard(deck);
+    const present = drawIndexedTarotCard(deck);
+    const future = drawIndexedTarotCard(deck);
 
     return { past, present, future };
 }
@@ -243,19 +286,77 @@ export function formatTarotCard(card) {
     return cardName;
 }
 
+// ============================================================================
+// CARD IMAGES
+// ============================================================================
+//
+// build_images.py writes resized WebP/AVIF variants of every card under
+// img/Tarot/w<width>/ and describes them in img/Tarot/manifest.json. Until a
+// manifest is loaded (or if the build has not been run) every helper falls
+// back to the full-size PNG.
+
 /**
- * Get the image path for a tarot card
+ * Where build_images.py writes the card image manifest
+ * @type {string}
+ */
+export const CARD_IMAGE_MANIFEST_URL = 'img/Tarot/manifest.json';
+
+const CARD_IMAGE_MANIFEST_VERSION = 1;
+
+const IMAGE_MIME_TYPES = {
+    avif: 'image/avif',
+    webp: 'image/webp'
+};
+
+let cardImageManifest = null;
+
+/**
+ * Use a card image manifest for getCardImagePath() and getCardImageSources()
+ * @param {Object|null} manifest - Parsed manifest.json, or null to use the PNGs again
+ * @returns {Object|null} - The previous manifest
+ */
+export function setCardImageManifest(manifest) {
+    if (manifest !== null && (!manifest || manifest.version !== CARD_IMAGE_MANIFEST_VERSION)) {
+        throw new Error(`Invalid card image manifest version: ${manifest && manifest.version}. Must be ${CARD_IMAGE_MANIFEST_VERSION}.`);
+    }
+    const previous = cardImageManifest;
+    cardImageManifest = manifest;
+    return previous;
+}
+
+/**
+ * Fetch and install the card image manifest
+ * A missing or unreadable manifest is not an error: the PNGs are used instead.
+ * @param {string} [url] - Manifest URL
+ * @returns {Promise<Object|null>} - The manifest, or null if none could be loaded
+ */
+export async function loadCardImageManifest(url = CARD_IMAGE_MANIFEST_URL) {
+    try {
+        const response = await fetch(url);
+        if (!response.ok) {
+            return null;
+        }
+        const manifest = await response.json();
+        setCardImageManifest(manifest);
+        return manifest;
+    } catch (error) {
+        return null;
+    }
+}
+
+/**
+ * Get the base file name of a card's image
  * @param {Object} card - The card object
- * @returns {string} - Path to the card image
+ * @returns {string} - e.g. "00-TheFool" or "Wands01"
  */
-export function getCardImagePath(card) {
+function getCardImageName(card) {
     if (card.type === 'major') {
-        // Major Arcana: e.g., "00-TheFool.png"
+        // Major Arcana: e.g., "00-TheFool"
         const number = String(card.number).padStart(2, '0');
         const name = card.name.replace(/\s+/g, ''); // Remove spaces
-        return `img/Tarot/${number}-${name}.png`;
+        return `${number}-${name}`;
     } else {
-        // Minor Arcana: e.g., "Wands01.png", "Cups11.png"
+        // Minor Arcana: e.g., "Wands01", "Cups11"
         const rankNumbers = {
             "Ace": "01", "Two": "02", "Three": "03", "Four": "04",
             "Five": "05", "Six": "06", "Seven": "07", "Eight": "08",
@@ -263,10 +364,106 @@ export function getCardImagePath(card) {
             "Queen": "13", "King": "14"
         };
         const number = rankNumbers[card.rank];
-        return `img/Tarot/${card.suit}${number}.png`;
+        return `${card.suit}${number}`;
     }
 }
 
+/**
+ * Pick the smallest manifest width that covers a display width
+ * @param {number[]} widths - Available widths, ascending
+ * @param {number} displayWidth - Width needed, in device pixels
+ * @returns {number} - Chosen width (the largest if none is wide enough)
+ */
+function pickVariantWidth(widths, displayWidth) {
+    for (const width of widths) {
+        if (width >= displayWidth) {
+            return width;
+        }
+    }
+    return widths[widths.length - 1];
+}
+
+/**
+ * Get the image path for a tarot card
+ * With a manifest loaded (see loadCardImageManifest()) and a display width,
+ * returns the smallest resized variant that covers it; otherwise the full-size PNG.
+ * @param {Object} card - The card object
+ * @param {number} [displayWidth=0] - Width the card is drawn at, in device pixels (0 for full size)
+ * @param {string} [format] - 'avif' or 'webp' (defaults to the most widely supported format built)
+ * @returns {string} - Path to the card image
+ */
+export function getCardImagePath(card, displayWidth = 0, format = null) {
+    const name = getCardImageName(card);
+    const manifest = cardImageManifest;
+
+    if (!displayWidth || !manifest || !manifest.cards[name] || manifest.widths.length === 0) {
+        return `img/Tarot/${name}.png`;
+    }
+
+    const chosenFormat = manifest.formats.includes(format) ? format : manifest.formats[manifest.formats.length - 1];
+    const width = pickVariantWidth(manifest.widths, displayWidth);
+    return `img/Tarot/w${width}/${name}.${chosenFormat}`;
+}
+
+/**
+ * Get responsive image sources for a card, for a <picture> element
+ * Sources are listed best format first, each with every built width, so the
+ * browser picks both the format it supports and the size for its pixel density.
+ * @param {Object} card - The card object
+ * @param {number} displayWidth - Width the card is drawn at, in CSS pixels
+ * @returns {Object} - { src, sizes, width, height, sources: [{ type, srcset }] }
+ */
+export function getCardImageSources(card, displayWidth) {
+    const name = getCardImageName(card);
+    const manifest = cardImageManifest;
+    const size = manifest && manifest.cards[name];
+
+    if (!size || manifest.widths.length === 0) {
+        return { src: getCardImagePath(card), sizes: `${displayWidth}px`, width: null, height: null, sources: [] };
+    }
+
+    const sources = manifest.formats.map(format => ({
+        type: IMAGE_MIME_TYPES[format],
+        srcset: manifest.widths.map(width => `img/Tarot/w${width}/${name}.${format} ${width}w`).join(', ')
+    }));
+
+    return {
+        src: getCardImagePath(card, displayWidth),
+        sizes: `${displayWidth}px`,
+        width: size[0],
+        height: size[1],
+        sources
+    };
+}
+
+/**
+ * Get CSS for showing a card's thumbnail from the manifest's sprite
+ * Useful as a placeholder while the full image loads: one small download
+ * covers every card. Sizes and positions are percentages, so the thumbnail
+ * fills whatever box the card image is laid out in.
+ * @param {Object} card - The card object
+ * @returns {Object|null} - { backgroundImage, backgroundPosition, backgroundSize }, or null without a sprite
+ */
+export function getCardSpriteStyle(card) {
+    const sprite = cardImageManifest && cardImageManifest.sprite;
+    const index = sprite ? sprite.cards.indexOf(getCardImageName(card)) : -1;
+    if (index === -1) {
+        return null;
+    }
+
+    const columns = sprite.columns;
+    const rows = Math.round(sprite.height / sprite.cellHeight);
+    // A percentage position p aligns the image's p% point with the box's p% point
+    const x = columns > 1 ? (index % columns) * 100 / (columns - 1) : 0;
+    const y = rows > 1 ? Math.floor(index / columns) * 100 / (rows - 1) : 0;
+
+    return {
+        backgroundImage: `url(${sprite.src})`,
+        backgroundPosition: `${x}% ${y}%`,
+        backgroundSize: `${columns * 100}% ${rows * 100}%`
+    };
+}
+
 /**
  * Get the meaning of a tarot card
  * @param {Object} card - The card object
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Build step that writes resized WebP/AVIF variants of the card and background art
+
+The Tarot page only ever shows cards at 120-250 CSS pixels, but the source
+PNGs are full size. This script writes one file per (width, format) next to
+the sources, a thumbnail sprite with every card, and a manifest that
+getCardImagePath() in Tarot.js reads to pick a variant:
+
+    img/Tarot/
+        manifest.json           Widths, formats, card sizes, sprite layout, backgrounds
+        w120/00-TheFool.avif    One directory per width, one file per format
+        w120/00-TheFool.webp
+        ...
+        sprite-60.webp          All 78 cards as 60px thumbnails, in manifest order
+    img/Background/
+        w1024/gotham.webp       Theme backgrounds
+        ...
+
+Variants are stamped with their source file's mtime; up-to-date variants are
+skipped, so re-running after changing one card only re-encodes that card.
+Widths larger than a source image are not written (no upscaling).
+
+Requires Pillow (pip install Pillow). AVIF needs Pillow 11.3+ or the
+pillow-avif-plugin package; without it only WebP variants are written.
+
+Usage:
+    python3 build_images.py [--widths 120,180,240,300] [--quality 80]
+                            [--sprite-width 60] [--no-sprite]
+"""
+
+import argparse
+import json
+import os
+import sys
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:  # Reported in main()
+    Image = None
+
+try:
+    import pillow_avif  # noqa: F401  Registers the AVIF plugin on older Pillow
+except ImportError:
+    pass
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+TAROT_DIR = os.path.join('img', 'Tarot')
+BACKGROUND_DIR = os.path.join('img', 'Background')
+MANIFEST_FILE = 'manifest.json'
+MANIFEST_VERSION = 1
+
+DEFAULT_CARD_WIDTHS = (120, 180, 240, 300)
+DEFAULT_BACKGROUND_WIDTHS = (768, 1024)
+DEFAULT_QUALITY = 80
+DEFAULT_SPRITE_WIDTH = 60
+SPRITE_COLUMNS = 13
+
+# Preferred first: browsers pick the first <source> type they support
+FORMAT_OPTIONS = {
+    'avif': {'format': 'AVIF', 'quality_offset': -20},
+    'webp': {'format': 'WEBP', 'quality_offset': 0},
+}
+
+
+def available_formats():
+    """Output formats this Pillow build can encode, in preference order"""
+    Image.init()
+    formats = []
+    if 'AVIF' in Image.SAVE:
+        formats.append('avif')
+    if features.check('webp'):
+        formats.append('webp')
+    return formats
+
+
+def is_current(variant, source_mtime_ns):
+    """True if variant exists and was written from this version of its source"""
+    try:
+        return os.stat(variant).st_mtime_ns == source_mtime_ns
+    except OSError:
+        return False
+
+
+def save_variant(image, path, fmt, quality, source_stat):
+    """Encode image to path and stamp it with the source's mtime"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    options = FORMAT_OPTIONS[fmt]
+    image.save(path, options['format'], quality=max(quality + options['quality_offset'], 1))
+    os.utime(path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    return os.path.getsize(path)
+
+
+def load_rgba(path):
+    """Open an image, applying any EXIF rotation, in a mode every encoder accepts"""
+    with Image.open(path) as image:
+        image = ImageOps.exif_transpose(image)
+        return image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+
+def build_variants(root, directory, widths, formats, quality):
+    """Write every (width, format) variant for the PNGs in directory
+
+    Returns ({name: [width, height]}, widths actually written, bytes written).
+    """
+    source_dir = os.path.join(root, directory)
+    names = sorted(f for f in os.listdir(source_dir) if f.lower().endswith('.png'))
+    sizes = {}
+    written_bytes = 0
+
+    for filename in names:
+        path = os.path.join(source_dir, filename)
+        with Image.open(path) as image:
+            sizes[os.path.splitext(filename)[0]] = list(image.size)
+
+    # Only widths every source can provide, so the manifest holds for all of them
+    min_width = min((size[0] for size in sizes.values()), default=0)
+    usable = [w for w in widths if w <= min_width]
+
+    for filename in names:
+        name = os.path.splitext(filename)[0]
+        path = os.path.join(source_dir, filename)
+        st = os.stat(path)
+        image = None
+
+        for width in usable:
+            for fmt in formats:
+                variant = os.path.join(source_dir, f'w{width}', f'{name}.{fmt}')
+                if is_current(variant, st.st_mtime_ns):
+                    continue
+
+                if image is None:
+                    image = load_rgba(path)
+                height = round(image.height * width / image.width)
+                resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                written_bytes += save_variant(resized, variant, fmt, quality, st)
+                print(f"  {os.path.relpath(variant, root)}")
+
+    return sizes, usable, written_bytes
+
+
+def build_sprite(root, sizes, cell_width, fmt, quality):
+    """Pack a thumbnail of every card into one image, row-major in sorted name order"""
+    names = sorted(sizes)
+    first = sizes[names[0]]
+    cell_height = round(first[1] * cell_width / first[0])
+    columns = min(SPRITE_COLUMNS, len(names))
+    rows = -(-len(names) // columns)
+
+    filename = f'sprite-{cell_width}.{fmt}'
+    path = os.path.join(root, TAROT_DIR, filename)
+    newest = max((os.stat(os.path.join(root, TAROT_DIR, f'{n}.png')) for n in names),
+                 key=lambda st: st.st_mtime_ns)
+    size = 0
+
+    if not is_current(path, newest.st_mtime_ns):
+        sprite = Image.new('RGBA', (columns * cell_width, rows * cell_height), (0, 0, 0, 0))
+        for i, name in enumerate(names):
+            card = load_rgba(os.path.join(root, TAROT_DIR, f'{name}.png'))
+            thumb = ImageOps.fit(card, (cell_width, cell_height), Image.LANCZOS)
+            sprite.paste(thumb, ((i % columns) * cell_width, (i // columns) * cell_height))
+        size = save_variant(sprite, path, fmt, quality, newest)
+        print(f"  {os.path.relpath(path, root)}")
+
+    return {
+        'src': '/'.join([TAROT_DIR.replace(os.sep, '/'), filename]),
+        'cellWidth': cell_width,
+        'cellHeight': cell_height,
+        'columns': columns,
+        'width': columns * cell_width,
+        'height': rows * cell_height,
+        'cards': names,
+    }, size
+
+
+def build_images(root=ROOT_DIR, card_widths=DEFAULT_CARD_WIDTHS, quality=DEFAULT_QUALITY,
+                 sprite_width=DEFAULT_SPRITE_WIDTH):
+    """Write all card and background variants plus img/Tarot/manifest.json
+
+    Pass sprite_width=0 to skip the thumbnail sprite. Returns the manifest.
+    """
+    formats = available_formats()
+    if not formats:
+        raise RuntimeError("This Pillow build cannot encode WebP or AVIF")
+    if 'avif' not in formats:
+        print("AVIF encoder not available - writing WebP variants only (pip install pillow-avif-plugin)")
+
+    cards, widths, card_bytes = build_variants(root, TAROT_DIR, card_widths, formats, quality)
+    backgrounds, background_widths, background_bytes = build_variants(
+        root, BACKGROUND_DIR, DEFAULT_BACKGROUND_WIDTHS, formats, quality)
+
+    manifest = {
+        'version': MANIFEST_VERSION,
+        'formats': formats,
+        'widths': widths,
+        'cards': cards,
+        'backgrounds': {'widths': background_widths, 'images': backgrounds},
+    }
+
+    sprite_bytes = 0
+    if sprite_width and cards:
+        manifest['sprite'], sprite_bytes = build_sprite(root, cards, sprite_width, formats[-1], quality)
+
+    with open(os.path.join(root, TAROT_DIR, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f, indent=2)
+        f.write('\n')
+
+    written = card_bytes + background_bytes + sprite_bytes
+    print(f"✓ {len(cards)} cards x {len(widths)} widths x {len(formats)} formats "
+          f"({written // 1024:,} KiB written)")
+    return manifest
+
+
+def width_list(value):
+    """argparse type for a comma-separated list of positive widths"""
+    try:
+        widths = sorted({int(part) for part in value.split(',') if part.strip()})
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated integers, got {value}")
+    if not widths or widths[0] < 1:
+        raise argparse.ArgumentTypeError(f"widths must be positive integers, got {value}")
+    return widths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write resized WebP/AVIF variants of the card art.')
+    parser.add_argument('--widths', type=width_list, default=list(DEFAULT_CARD_WIDTHS),
+                        help='card widths in pixels (default: %(default)s)')
+    parser.add_argument('--quality', type=int, default=DEFAULT_QUALITY,
+                        help=f'WebP quality, AVIF uses 20 less (default: {DEFAULT_QUALITY})')
+    parser.add_argument('--sprite-width', type=int, default=DEFAULT_SPRITE_WIDTH,
+                        help=f'thumbnail width in the card sprite (default: {DEFAULT_SPRITE_WIDTH})')
+    parser.add_argument('--no-sprite', action='store_true',
+                        help='do not write the thumbnail sprite')
+    parser.add_argument('--directory', default=ROOT_DIR,
+                        help='repository root (default: the directory of this script)')
+    args = parser.parse_args(argv)
+
+    if Image is None:
+        print("Pillow is required: pip install Pillow", file=sys.stderr)
+        return 1
+
+    build_images(args.directory, args.widths, args.quality,
+                 0 if args.no_sprite else args.sprite_width)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,667 @@
 #!/usr/bin/env python3
+"""
+Local development server for the Dice Roller pages.
+
+Serves the repository over HTTP/1.1 with keep-alive. Each connection is
+handed to a bounded pool of worker threads, so one slow download (names.db,
+a Tarot PNG) no longer stalls every other browser at the table.
+
+File bodies are kept in an in-memory LRU cache keyed by path and refreshed
+when the file's mtime changes. Responses carry strong ETags and
+Last-Modified headers, and conditional requests are answered with 304.
+
+Text and database assets can be precompressed ahead of time; the handler
+then serves the .br/.gz sibling that best matches the client's
+Accept-Encoding.
+
+Single byte ranges (Range/If-Range) are answered with 206 Partial Content,
+and files too large for the cache are pushed with sendfile() so their bytes
+never pass through Python.
+
+GET /api/names?genders=...&sources=...&count=N returns a JSON batch of
+generated names, computed by Names/name_generator.py over a pool of
+read-only SQLite connections.
+
+Usage:
+    python3 server.py [--port PORT] [--bind ADDRESS] [--workers N]
+                      [--cache-mb MB] [--names-db PATH] [--quiet]
+    python3 server.py --precompress    # write .gz (and .br) asset variants
+"""
+
+import argparse
+import email.utils
+import gzip
+import hashlib
 import http.server
-import socketserver
+import io
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+try:
+    import brotli
+except ImportError:  # Optional; gzip variants are always available
+    brotli = None
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.join(ROOT_DIR, 'Names'))
+import name_generator  # noqa: E402
 
 # For some reason, Port 8000 gets messed up
 PORT = 8114
 
-# Fixes local mime type issues
+# Each keep-alive connection holds a worker until it goes idle, so size the
+# pool for "browsers x ~6 connections each" rather than for CPU count.
+DEFAULT_WORKERS = 64
+
+# Seconds an idle keep-alive connection is held open before its worker is freed
+KEEP_ALIVE_TIMEOUT = 5
+
+# Memory budget for cached file bodies
+DEFAULT_CACHE_MB = 64
+
+# Larger files are sent with sendfile() straight from the OS page cache;
+# only their ETag is kept in memory
+MAX_CACHED_FILE_BYTES = 1024 * 1024
+
+# Assets worth precompressing (text, plus the SQLite names database and bundle shards)
+COMPRESSIBLE_EXTENSIONS = ('.html', '.js', '.css', '.csv', '.json', '.svg', '.txt', '.db', '.bin')
+
+# Content-Encoding -> sibling file suffix, in server preference order
+ENCODING_SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+
+API_NAMES_PATH = '/api/names'
+
+# Upper bound on names generated by a single /api/names request
+MAX_API_NAMES = 1000
+
+DEFAULT_NAMES_DB = os.path.join(ROOT_DIR, 'Names', 'names.db')
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be satisfied for the file's size"""
+
+# data is None for files too large to hold in memory
+CachedAsset = namedtuple('CachedAsset', ['data', 'etag', 'mtime', 'mtime_ns', 'size'])
+
+
+class AssetCache:
+    """Thread-safe LRU cache of file bodies and hashes, refreshed on mtime change"""
+
+    def __init__(self, max_bytes=DEFAULT_CACHE_MB * 1024 * 1024,
+                 max_file_bytes=MAX_CACHED_FILE_BYTES):
+        self.max_bytes = max_bytes
+        self.max_file_bytes = max_file_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, path):
+        """Return the CachedAsset for path, (re)loading it if missing or stale
+
+        Raises OSError if the file cannot be opened.
+        """
+        st = os.stat(path)
+
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry and entry.mtime_ns == st.st_mtime_ns and entry.size == st.st_size:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry
+            self.misses += 1
+
+        entry = self._load(path)
+
+        with self._lock:
+            old = self._entries.pop(path, None)
+            if old and old.data is not None:
+                self._bytes -= old.size
+            self._entries[path] = entry
+            if entry.data is not None:
+                self._bytes += entry.size
+            self._evict()
+
+        return entry
+
+    def _load(self, path):
+        """Read (or for large files, stream-hash) a file into a CachedAsset"""
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            digest = hashlib.sha256()
+
+            if st.st_size > min(self.max_file_bytes, self.max_bytes):
+                data = None
+                for chunk in iter(partial(f.read, 1024 * 1024), b''):
+                    digest.update(chunk)
+            else:
+                data = f.read()
+                digest.update(data)
+
+        etag = f'"{digest.hexdigest()[:32]}"'
+        size = st.st_size if data is None else len(data)
+        return CachedAsset(data, etag, st.st_mtime, st.st_mtime_ns, size)
+
+    def _evict(self):
+        """Drop least recently used bodies until the cache fits its budget"""
+        while self._bytes > self.max_bytes:
+            path, entry = self._entries.popitem(last=False)
+            if entry.data is not None:
+                self._bytes -= entry.size
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
+
+
+class DiceRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """Static file handler with HTTP/1.1 keep-alive and a request/latency log"""
+
+    protocol_version = 'HTTP/1.1'
+    timeout = KEEP_ALIVE_TIMEOUT
+    # Headers and body go out in separate writes; don't let Nagle hold the body
+    disable_nagle_algorithm = True
+
+    # Fixes local mime type issues
+    extensions_map = {
+        **http.server.SimpleHTTPRequestHandler.extensions_map,
+        '.js': 'application/javascript',
+        '.css': 'text/css',
+        '.csv': 'text/csv',
+        '.db': 'application/vnd.sqlite3',
+        '.bin': 'application/octet-stream',
+        '.webp': 'image/webp',
+        '.avif': 'image/avif',
+    }
+
+    def handle_one_request(self):
+        """Handle one request, then log it with its total latency"""
+        self._started = time.perf_counter()
+        self._logged = None
+        self._content_length = '-'
+        self._body_range = None
+        super().handle_one_request()
+
+        if self._logged is not None:
+            code, size = self._logged
+            if size == '-':
+                size = self._content_length
+            elapsed_ms = (time.perf_counter() - self._started) * 1000
+            self.log_message('"%s" %s %s %.1fms', self.requestline, code, size, elapsed_ms)
+
+    def log_request(self, code='-', size='-'):
+        """Defer the access log line until the response body has been sent"""
+        if isinstance(code, http.HTTPStatus):
+            code = code.value
+        self._logged = (str(code), str(size))
+
+    def send_header(self, keyword, value):
+        if keyword.lower() == 'content-length':
+            self._content_length = str(value)
+        super().send_header(keyword, value)
+
+    def log_message(self, format, *args):
+        if self.server.quiet:
+            return
+        super().log_message(format, *args)
+
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == API_NAMES_PATH:
+            self._send_generated_names()
+        else:
+            super().do_GET()
+
+    def _send_generated_names(self):
+        """Handle GET /api/names with a JSON batch of generated names
+
+        Query parameters mirror the Random Generator page: genders and sources
+        are comma-separated ('any' is always included, as in random.html),
+        count defaults to 1, and nicknameFrequency/titleFrequency are optional.
+        """
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(self.path).query)
+
+        def param(name, default=''):
+            return query.get(name, [default])[0]
+
+        try:
+            count = int(param('count', '1'))
+            nickname_frequency = float(param('nicknameFrequency',
+                                             name_generator.DEFAULT_NICKNAME_FREQUENCY))
+            title_frequency = float(param('titleFrequency',
+                                          name_generator.DEFAULT_TITLE_FREQUENCY))
+        except ValueError:
+            self._send_json(http.HTTPStatus.BAD_REQUEST,
+                            {'error': 'count and frequencies must be numbers'})
+            return
+
+        if not 1 <= count <= MAX_API_NAMES:
+            self._send_json(http.HTTPStatus.BAD_REQUEST,
+                            {'error': f'count must be between 1 and {MAX_API_NAMES}'})
+            return
+
+        genders = ['any'] + [g for g in param('genders').split(',') if g and g != 'any']
+        sources = [s for s in param('sources').split(',') if s]
+
+        try:
+            pool = self.server.get_name_pool()
+            with pool.connection() as conn:
+                names = name_generator.generate_random_names(
+                    conn, genders, sources, count,
+                    nickname_frequency=nickname_frequency,
+                    title_frequency=title_frequency
+                )
+        except ValueError as e:
+            self._send_json(http.HTTPStatus.BAD_REQUEST, {'error': str(e)})
+            return
+        except sqlite3.Error as e:
+            self.log_error("names database unavailable: %s", e)
+            self._send_json(http.HTTPStatus.SERVICE_UNAVAILABLE,
+                            {'error': 'names database unavailable'})
+            return
+
+        self._send_json(http.HTTPStatus.OK, {'count': len(names), 'names': names})
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_head(self):
+        """Serve files from the asset cache with ETag/Last-Modified validation
+
+        Directory listings, redirects and 404s are left to SimpleHTTPRequestHandler.
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            path = self._directory_index(path)
+            if path is None:
+                return super().send_head()
+        elif path.endswith('/'):
+            return super().send_head()
+
+        # Byte ranges always address the unencoded file
+        range_header = self.headers.get('Range')
+        if range_header is None:
+            encoding, body_path = self._select_variant(path)
+        else:
+            encoding, body_path = None, path
+
+        try:
+            entry = self.server.asset_cache.get(body_path)
+        except OSError:
+            self.send_error(http.HTTPStatus.NOT_FOUND, "File not found")
+            return None
+
+        if self._not_modified(entry):
+            self.send_response(http.HTTPStatus.NOT_MODIFIED)
+            self._send_validators(path, entry)
+            self.end_headers()
+            return None
+
+        byte_range = None
+        if range_header is not None and self._if_range_matches(entry):
+            try:
+                byte_range = parse_byte_range(range_header, entry.size)
+            except RangeNotSatisfiable:
+                self.send_response(http.HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header('Content-Range', f'bytes */{entry.size}')
+                self.send_header('Content-Length', '0')
+                self._send_validators(path, entry)
+                self.end_headers()
+                return None
+
+        if byte_range is None:
+            start, end = 0, entry.size - 1
+            self.send_response(http.HTTPStatus.OK)
+        else:
+            start, end = byte_range
+            self.send_response(http.HTTPStatus.PARTIAL_CONTENT)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{entry.size}')
+
+        self.send_header('Content-Type', self.guess_type(path))
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(end - start + 1))
+        self.send_header('Accept-Ranges', 'bytes')
+        self._send_validators(path, entry)
+        self.end_headers()
+
+        self._body_range = (start, end - start + 1)
+        if entry.data is None:
+            return open(body_path, 'rb')
+        return io.BytesIO(entry.data)
+
+    def copyfile(self, source, outputfile):
+        """Send the selected byte range of a body returned by send_head
+
+        Cached bodies are written straight from memory; files on disk go out
+        through socket.sendfile(), which uses os.sendfile() where available.
+        """
+        if self._body_range is None:
+            return super().copyfile(source, outputfile)
+
+        start, length = self._body_range
+        if length <= 0:
+            return
+        if isinstance(source, io.BytesIO):
+            outputfile.write(source.getbuffer()[start:start + length])
+        else:
+            self.connection.sendfile(source, start, length)
+
+    def _select_variant(self, path):
+        """Pick the precompressed sibling of path that best fits Accept-Encoding
+
+        Returns (content_encoding, file_path); content_encoding is None when the
+        file is served as-is. Variants whose mtime no longer matches the source
+        are stale and ignored.
+        """
+        if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+            return None, path
+
+        accepted = parse_accept_encoding(self.headers.get('Accept-Encoding', ''))
+        candidates = [
+            encoding for encoding in ENCODING_SUFFIXES
+            if accepted.get(encoding, accepted.get('*', 0)) > 0
+        ]
+        if not candidates:
+            return None, path
+
+        try:
+            source_mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None, path
+
+        # Stable sort keeps server preference order between equal q-values
+        candidates.sort(key=lambda e: accepted.get(e, accepted.get('*', 0)), reverse=True)
+        for encoding in candidates:
+            variant = path + ENCODING_SUFFIXES[encoding]
+            try:
+                if os.stat(variant).st_mtime_ns == source_mtime:
+                    return encoding, variant
+            except OSError:
+                continue
+
+        return None, path
+
+    def _directory_index(self, path):
+        """Return the index file for a directory URL ending in '/', else None"""
+        if not urllib.parse.urlsplit(self.path).path.endswith('/'):
+            return None
+        for index in ('index.html', 'index.htm'):
+            candidate = os.path.join(path, index)
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def _send_validators(self, path, entry):
+        if path.endswith(COMPRESSIBLE_EXTENSIONS):
+            self.send_header('Vary', 'Accept-Encoding')
+        self.send_header('ETag', entry.etag)
+        self.send_header('Last-Modified', self.date_time_string(entry.mtime))
+        # Always revalidate; an unchanged asset costs one 304 round trip
+        self.send_header('Cache-Control', 'no-cache')
+
+    def _if_range_matches(self, entry):
+        """Honor Range only if If-Range (when sent) still matches the file"""
+        if_range = self.headers.get('If-Range')
+        if if_range is None:
+            return True
+
+        if_range = if_range.strip()
+        if if_range.startswith(('"', 'W/')):
+            # If-Range requires a strong comparison
+            return if_range == entry.etag
+
+        try:
+            since = email.utils.parsedate_to_datetime(if_range)
+        except (TypeError, ValueError, IndexError, OverflowError):
+            return False
+        return since is not None and int(entry.mtime) == int(since.timestamp())
+
+    def _not_modified(self, entry):
+        """Check If-None-Match (preferred) or If-Modified-Since against entry"""
+        if_none_match = self.headers.get('If-None-Match')
+        if if_none_match is not None:
+            tags = [tag.strip() for tag in if_none_match.split(',')]
+            return '*' in tags or entry.etag in tags or f'W/{entry.etag}' in tags
+
+        if_modified_since = self.headers.get('If-Modified-Since')
+        if if_modified_since is not None:
+            try:
+                since = email.utils.parsedate_to_datetime(if_modified_since)
+            except (TypeError, ValueError, IndexError, OverflowError):
+                return False
+            if since is None or since.tzinfo is None:
+                return False
+            return int(entry.mtime) <= since.timestamp()
+
+        return False
+
+
+class PooledHTTPServer(http.server.HTTPServer):
+    """HTTP server that dispatches connections to a bounded thread pool"""
+
+    def __init__(self, server_address, handler_class, workers=DEFAULT_WORKERS,
+                 quiet=False, asset_cache=None, names_db=DEFAULT_NAMES_DB):
+        # Set before binding: a failed bind calls server_close(), which needs _pool
+        self.workers = workers
+        self.quiet = quiet
+        self.asset_cache = asset_cache if asset_cache is not None else AssetCache()
+        self.names_db = names_db
+        self._name_pool = None
+        self._name_pool_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dice-http')
+        super().__init__(server_address, handler_class)
+
+    def get_name_pool(self):
+        """Open the read-only names.db connection pool on first use"""
+        with self._name_pool_lock:
+            if self._name_pool is None:
+                self._name_pool = name_generator.ConnectionPool(self.names_db)
+            return self._name_pool
+
+    def process_request(self, request, client_address):
+        self._pool.submit(self._process_request_worker, request, client_address)
+
+    def _process_request_worker(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if self._name_pool is not None:
+            self._name_pool.close()
+
+
+def parse_byte_range(header, size):
+    """Parse a single-range 'bytes=' Range header for a body of size bytes
+
+    Returns an inclusive (start, end) tuple, or None when the header should be
+    ignored (malformed, another unit, or multiple ranges) and the whole body
+    sent with 200. Raises RangeNotSatisfiable if no byte of the range exists.
+    """
+    unit, _, spec = header.strip().partition('=')
+    if unit.strip().lower() != 'bytes' or ',' in spec:
+        return None
+
+    first, dash, last = spec.strip().partition('-')
+    first, last = first.strip(), last.strip()
+    if not dash or not (first or last) or not (first + last).isdigit():
+        return None
+
+    if not first:
+        # Suffix range: the final N bytes
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            raise RangeNotSatisfiable(header)
+        return max(size - suffix, 0), size - 1
+
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size:
+        raise RangeNotSatisfiable(header)
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+def parse_accept_encoding(header):
+    """Parse an Accept-Encoding header into {coding: q-value}"""
+    accepted = {}
+    for item in header.split(','):
+        coding, _, params = item.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def compress(data, encoding):
+    """Compress data for the given Content-Encoding at maximum effort"""
+    if encoding == 'gzip':
+        # mtime=0 keeps the output (and so its ETag) reproducible
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def precompress_assets(root=ROOT_DIR):
+    """Write .gz (and .br, if brotli is installed) siblings for compressible assets
+
+    Variants are stamped with their source file's mtime so the server can tell
+    when they are stale; up-to-date variants are skipped. A variant that would
+    not be smaller than its source is not written.
+    """
+    encodings = [e for e in ENCODING_SUFFIXES if e != 'br' or brotli is not None]
+    if brotli is None:
+        print("brotli not installed - writing gzip variants only (pip install brotli)")
+
+    written = 0
+    saved = 0
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith('.') and d != 'node_modules']
+
+        for filename in sorted(filenames):
+            if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+                continue
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+            data = None
+
+            for encoding in encodings:
+                variant = path + ENCODING_SUFFIXES[encoding]
+                try:
+                    if os.stat(variant).st_mtime_ns == st.st_mtime_ns:
+                        continue
+                except OSError:
+                    pass
+
+                if data is None:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                compressed = compress(data, encoding)
+
+                if len(compressed) >= len(data):
+                    if os.path.exists(variant):
+                        os.remove(variant)
+                    continue
+
+                with open(variant, 'wb') as f:
+                    f.write(compressed)
+                os.utime(variant, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+                written += 1
+                saved += len(data) - len(compressed)
+                print(f"  {os.path.relpath(variant, root)}: "
+                      f"{len(data):,} -> {len(compressed):,} bytes")
+
+    print(f"✓ Wrote {written} compressed variants ({saved // 1024:,} KiB saved)")
+    return written
+
+
+def positive_int(value):
+    """argparse type for strictly positive integers"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the Dice Roller pages locally.')
+    parser.add_argument('--port', type=int, default=PORT,
+                        help=f'port to listen on (default: {PORT})')
+    parser.add_argument('--bind', default='',
+                        help='address to bind to (default: all interfaces)')
+    parser.add_argument('--workers', type=positive_int, default=DEFAULT_WORKERS,
+                        help=f'worker threads serving connections (default: {DEFAULT_WORKERS})')
+    parser.add_argument('--directory', default=ROOT_DIR,
+                        help='directory to serve (default: the repository root)')
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_MB,
+                        help=f'memory budget for cached file bodies (default: {DEFAULT_CACHE_MB})')
+    parser.add_argument('--names-db', default=DEFAULT_NAMES_DB,
+                        help='SQLite database behind /api/names (default: Names/names.db)')
+    parser.add_argument('--quiet', action='store_true',
+                        help='disable the request/latency log')
+    parser.add_argument('--precompress', action='store_true',
+                        help='write .gz/.br variants of text and database assets, then exit')
+    args = parser.parse_args(argv)
+
+    if args.precompress:
+        precompress_assets(args.directory)
+        return 0
+
+    handler = partial(DiceRequestHandler, directory=args.directory)
+    asset_cache = AssetCache(max_bytes=max(args.cache_mb, 0) * 1024 * 1024)
+
+    with PooledHTTPServer((args.bind, args.port), handler, workers=args.workers,
+                          quiet=args.quiet, asset_cache=asset_cache,
+                          names_db=args.names_db) as httpd:
+        host = args.bind or 'localhost'
+        print(f"Server running at http://{host}:{args.port}/ ({args.workers} workers)")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            stats = asset_cache.stats()
+            print(f"\nShutting down. Asset cache: {stats['hits']} hits, "
+                  f"{stats['misses']} misses, {stats['bytes'] // 1024} KiB in memory.")
+
+    return 0
+
+
 if __name__ == '__main__':
-    http.server.SimpleHTTPRequestHandler.extensions_map['.js'] = 'application/javascript'
-    http.server.SimpleHTTPRequestHandler.extensions_map['.css'] = 'text/css'
-    http.server.test(port=PORT, HandlerClass=http.server.SimpleHTTPRequestHandler, protocol="HTTP/1.1")
-    
-with socketserver.TCPServer(("", PORT), Handler) as httpd:
-    print(f"Server running at http://localhost:{PORT}/")
-    httpd.serve_forever()
\ No newline at end of file
+    sys.exit(main())
@@ -14,8 +14,14 @@ import {
     getEffect,
     interpretBladesRoll
 } from '../Blades.js';
+import { createSeededRng } from '../Random.js';
 
 describe('rollBladesDice', () => {
+    it('uses the rng argument', () => {
+        expect(rollBladesDice(4, createSeededRng(8)).rolls).toEqual(rollBladesDice(4, createSeededRng(8)).rolls);
+        expect(rollBladesDice(0, createSeededRng(8)).rolls).toEqual(rollBladesDice(0, createSeededRng(8)).rolls);
+    });
+
     it('rolls specified number of dice', () => {
         const result = rollBladesDice(3);
 
@@ -180,9 +186,28 @@ describe('getBladesProbabilities', () => {
         expect(probs.critical).toBe(0);
     });
 
+    it('is exact', () => {
+        const probs = getBladesProbabilities(2);
+
+        expect(probs.failure).toBeCloseTo(9 / 36, 12);
+        expect(probs.mixed).toBeCloseTo(16 / 36, 12);
+        expect(probs.success).toBeCloseTo(10 / 36, 12);
+        expect(probs.critical).toBeCloseTo(1 / 36, 12);
+        expect(getBladesProbabilities(0).success).toBeCloseTo(1 / 36, 12);
+    });
+
+    it('supports pools larger than 6 dice', () => {
+        const probs = getBladesProbabilities(10);
+        const sum = probs.failure + probs.mixed + probs.success + probs.critical;
+
+        expect(probs.failure).toBeCloseTo(Math.pow(0.5, 10), 12);
+        expect(probs.critical).toBeGreaterThan(getBladesProbabilities(6).critical);
+        expect(sum).toBeCloseTo(1.0, 12);
+    });
+
     it('throws error for invalid dice count', () => {
         expect(() => getBladesProbabilities(-1)).toThrow('Invalid number of dice');
-        expect(() => getBladesProbabilities(7)).toThrow('Invalid number of dice');
+        expect(() => getBladesProbabilities(1.5)).toThrow('Invalid number of dice');
     });
 });
 
@@ -18,8 +18,23 @@ import {
     addCardToTop,
     returnCards,
     cutDeck,
-    dealHands
+    dealHands,
+    createCardTable,
+    createIndexedDeck,
+    resetIndexedDeck,
+    getIndexedDeckSize,
+    partialShuffleIndexedDeck,
+    shuffleIndexedDeck,
+    drawIndex,
+    peekIndex,
+    drawIndexedCard,
+    drawIndices,
+    isIndexReversed,
+    returnIndexedCards,
+    cutIndexedDeck,
+    dealIndexedHands
 } from '../CardLibrary.js';
+import { createSeededRng } from '../Random.js';
 
 describe('createDeck', () => {
     it('creates a copy of the card array', () => {
@@ -36,6 +51,14 @@ describe('createDeck', () => {
 });
 
 describe('shuffleDeck', () => {
+    it('gives the same order for the same seeded rng', () => {
+        const first = shuffleDeck([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], createSeededRng('deck'));
+        const second = shuffleDeck([1, 2, 3, 4, 5, 6, 7, 8, 9, 10], createSeededRng('deck'));
+
+        expect(second).toEqual(first);
+        expect([...first].sort((a, b) => a - b)).toEqual([1, 2, 3, 4, 5, 6, 7, 8, 9, 10]);
+    });
+
     it('returns the same deck reference', () => {
         const deck = [1, 2, 3, 4, 5];
         const shuffled = shuffleDeck(deck);
@@ -292,3 +315,115 @@ describe('dealHands', () => {
         expect(() => dealHands(deck, 2, 0)).toThrow('Invalid cards per hand');
     });
 });
+
+describe('indexed decks', () => {
+    const table = createCardTable([{ id: 0 }, { id: 1 }, { id: 2 }, { id: 3 }, { id: 4 }, { id: 5 }]);
+
+    it('freezes a copy of the card table', () => {
+        expect(Object.isFrozen(table)).toBe(true);
+        expect(() => createCardTable('not an array')).toThrow('Cards must be an array');
+    });
+
+    it('starts in table order and draws from the top', () => {
+        const deck = createIndexedDeck(table);
+
+        expect(deck.order).toBeInstanceOf(Uint8Array);
+        expect(peekIndex(deck)).toBe(0);
+        expect(drawIndexedCard(deck)).toBe(table[0]);
+        expect(drawIndex(deck)).toBe(1);
+        expect(getIndexedDeckSize(deck)).toBe(4);
+    });
+
+    it('returns -1 and null when empty', () => {
+        const deck = createIndexedDeck(table);
+        drawIndices(deck, 6);
+
+        expect(drawIndex(deck)).toBe(-1);
+        expect(peekIndex(deck)).toBe(-1);
+        expect(drawIndexedCard(deck)).toBeNull();
+    });
+
+    it('uses Uint16Array order for decks over 256 cards', () => {
+        const deck = createIndexedDeck(createCardTable(Array.from({ length: 300 }, (_, i) => i)));
+
+        expect(deck.order).toBeInstanceOf(Uint16Array);
+        expect(deck.order[299]).toBe(299);
+    });
+
+    it('shuffles to a reproducible permutation', () => {
+        const first = shuffleIndexedDeck(createIndexedDeck(table), createSeededRng('indexed'));
+        const second = shuffleIndexedDeck(createIndexedDeck(table), createSeededRng('indexed'));
+
+        expect(Array.from(second.order)).toEqual(Array.from(first.order));
+        expect(Array.from(first.order).sort()).toEqual([0, 1, 2, 3, 4, 5]);
+    });
+
+    it('partial shuffle only touches the cards it needs', () => {
+        const deck = createIndexedDeck(table);
+        drawIndex(deck);
+        partialShuffleIndexedDeck(deck, 2, createSeededRng(3));
+
+        expect(deck.order[0]).toBe(0);
+        expect(Array.from(deck.order).sort()).toEqual([0, 1, 2, 3, 4, 5]);
+        expect(() => partialShuffleIndexedDeck(deck, 6)).toThrow('Invalid count');
+    });
+
+    it('picks orientations only for reversible decks', () => {
+        const upright = shuffleIndexedDeck(createIndexedDeck(table), createSeededRng(1));
+        const reversible = createIndexedDeck(createCardTable(Array.from({ length: 64 }, (_, i) => i)), true);
+        shuffleIndexedDeck(reversible, createSeededRng(1));
+
+        let reversedCount = 0;
+        for (let i = 0; i < 64; i++) {
+            reversedCount += isIndexReversed(reversible, i) ? 1 : 0;
+        }
+
+        expect(upright.reversed).toBeNull();
+        expect(isIndexReversed(upright, 0)).toBe(false);
+        expect(reversedCount).toBeGreaterThan(0);
+        expect(reversedCount).toBeLessThan(64);
+
+        resetIndexedDeck(reversible);
+        expect(Array.from(reversible.reversed)).toEqual([0, 0]);
+    });
+
+    it('draws into a caller-provided buffer', () => {
+        const deck = createIndexedDeck(table);
+        const out = new Uint16Array(10);
+        const drawn = drawIndices(deck, 10, out);
+
+        expect(Array.from(drawn)).toEqual([0, 1, 2, 3, 4, 5]);
+        expect(drawn.buffer).toBe(out.buffer);
+        expect(() => drawIndices(deck, -1)).toThrow('Invalid count');
+    });
+
+    it('returns drawn cards to the top', () => {
+        const deck = createIndexedDeck(table);
+        drawIndices(deck, 3);
+        returnIndexedCards(deck, 2);
+
+        expect(drawIndex(deck)).toBe(1);
+        expect(returnIndexedCards(deck).cursor).toBe(0);
+        expect(() => returnIndexedCards(deck, 1)).toThrow('Invalid count');
+    });
+
+    it('cuts the remaining cards in place', () => {
+        const deck = createIndexedDeck(table);
+        drawIndex(deck);
+        cutIndexedDeck(deck, 2);
+
+        expect(Array.from(deck.order)).toEqual([0, 3, 4, 5, 1, 2]);
+        expect(() => cutIndexedDeck(deck, 6)).toThrow('Invalid cut position');
+    });
+
+    it('deals hands round-robin style', () => {
+        const deck = createIndexedDeck(table);
+        const hands = dealIndexedHands(deck, 2, 3);
+
+        expect(Array.from(hands[0])).toEqual([0, 2, 4]);
+        expect(Array.from(hands[1])).toEqual([1, 3, 5]);
+        expect(() => dealIndexedHands(createIndexedDeck(table), 4, 2)).toThrow('Not enough cards');
+        expect(() => dealIndexedHands(deck, 0, 2)).toThrow('Invalid number of hands');
+        expect(() => dealIndexedHands(deck, 2, 0)).toThrow('Invalid cards per hand');
+    });
+});
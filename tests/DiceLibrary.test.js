@@ -6,6 +6,24 @@
 
 import { describe, it, expect, vi } from 'vitest';
 import { rollSingleDie, rollSingleExplodingDie, rollDice, formatDiceRoll, parseDiceNotation, dropDice, countSuccesses, rollDiceWithModifiers, rollWithAdvantage } from '../DiceLibrary.js';
+import {
+    getRollDistribution,
+    getAdvantageDistribution,
+    explodingDieDistribution,
+    faceDistribution,
+    getFacesSumDistribution,
+    getProbability,
+    getProbabilityAtLeast,
+    getDistributionStats,
+    clearDistributionCache,
+    rollBatch,
+    compileDiceExpression,
+    clearExpressionCache,
+    rollExpression,
+    rollExpressionBatch,
+    getExpressionDistribution
+} from '../DiceLibrary.js';
+import { createSeededRng } from '../Random.js';
 
 describe('rollSingleDie', () => {
     it('returns a value between 1 and sides', () => {
@@ -233,6 +251,14 @@ describe('rollSingleExplodingDie', () => {
 });
 
 describe('rollDiceWithModifiers', () => {
+    it('uses options.rng for every die, including explosions', () => {
+        const options = { numDice: 6, diceType: 4, exploding: true, explodingMode: 'compound', rng: createSeededRng('mods') };
+        const first = rollDiceWithModifiers(options);
+        const second = rollDiceWithModifiers({ ...options, rng: createSeededRng('mods') });
+
+        expect(second.rolls).toEqual(first.rolls);
+    });
+
     it('rolls basic dice without modifiers', () => {
         const mockRandom = vi.spyOn(Math, 'random');
         mockRandom.mockReturnValueOnce(0.5);  // 4
@@ -482,3 +508,349 @@ describe('rollWithAdvantage', () => {
         expect(() => rollWithAdvantage('ADVANTAGE', { numDice: 1, diceType: 6 })).toThrow();
     });
 });
+
+describe('getRollDistribution', () => {
+    // Enumerate every outcome of numDice dice and score it with the rolling helpers
+    function bruteForce(numDice, diceType, scoreRolls) {
+        const counts = new Map();
+        const rolls = new Array(numDice).fill(1);
+        const total = Math.pow(diceType, numDice);
+        for (let n = 0; n < total; n++) {
+            let rest = n;
+            for (let i = 0; i < numDice; i++) {
+                rolls[i] = (rest % diceType) + 1;
+                rest = Math.floor(rest / diceType);
+            }
+            const score = scoreRolls(rolls);
+            counts.set(score, (counts.get(score) || 0) + 1);
+        }
+        return new Map([...counts].map(([score, count]) => [score, count / total]));
+    }
+
+    function expectMatches(pmf, expected) {
+        const sum = pmf.probs.reduce((a, b) => a + b, 0);
+        expect(sum).toBeCloseTo(1, 12);
+        expected.forEach((probability, value) => {
+            expect(getProbability(pmf, value)).toBeCloseTo(probability, 12);
+        });
+    }
+
+    it('computes NdX sums exactly', () => {
+        const pmf = getRollDistribution({ numDice: 3, diceType: 6 });
+
+        expect(pmf.min).toBe(3);
+        expect(pmf.probs).toHaveLength(16);
+        expect(getProbability(pmf, 10)).toBeCloseTo(27 / 216, 12);
+        expect(getDistributionStats(pmf).mean).toBeCloseTo(10.5, 12);
+    });
+
+    it('matches dropDice for keep/drop highest and lowest', () => {
+        [['lowest', 1], ['highest', 1], ['lowest', 2], ['highest', 3]].forEach(([dropType, dropCount]) => {
+            const pmf = getRollDistribution({ numDice: 4, diceType: 6, drop: true, dropType, dropCount });
+            expectMatches(pmf, bruteForce(4, 6, rolls => dropDice(rolls, dropCount, dropType).total));
+        });
+    });
+
+    it('gives the classic 4d6 drop lowest odds', () => {
+        const pmf = getRollDistribution({ numDice: 4, diceType: 6, drop: true, dropCount: 1 });
+
+        expect(getProbability(pmf, 18)).toBeCloseTo(21 / 1296, 12);
+        expect(getProbability(pmf, 3)).toBeCloseTo(1 / 1296, 12);
+    });
+
+    it('matches countSuccesses, including on kept dice', () => {
+        const plain = getRollDistribution({ numDice: 4, diceType: 8, countSuccesses: true, successThreshold: 6 });
+        expectMatches(plain, bruteForce(4, 8, rolls => countSuccesses(rolls, 6, '>=').successCount));
+
+        const kept = getRollDistribution({
+            numDice: 4, diceType: 8, drop: true, dropType: 'highest', dropCount: 2,
+            countSuccesses: true, successThreshold: 3, successComparison: '<='
+        });
+        expectMatches(kept, bruteForce(4, 8, rolls =>
+            countSuccesses(dropDice(rolls, 2, 'highest').keptRolls, 3, '<=').successCount));
+    });
+
+    it('computes advantage and disadvantage on a d20', () => {
+        const advantage = getAdvantageDistribution('advantage', { numDice: 1, diceType: 20 });
+        const disadvantage = getAdvantageDistribution('disadvantage', { numDice: 1, diceType: 20 });
+
+        expect(getProbability(advantage, 20)).toBeCloseTo(39 / 400, 12);
+        expect(getProbability(disadvantage, 1)).toBeCloseTo(39 / 400, 12);
+        expect(getDistributionStats(advantage).mean).toBeCloseTo(13.825, 12);
+        expect(getProbabilityAtLeast(advantage, 11)).toBeCloseTo(1 - 0.25, 12);
+        expect(() => getAdvantageDistribution('sideways', { numDice: 1, diceType: 20 })).toThrow('Invalid mode');
+    });
+
+    it('models standard exploding dice as one extra roll on the maximum', () => {
+        const pmf = explodingDieDistribution(6, 'standard');
+
+        expect(pmf.probs).toHaveLength(12);
+        expect(getProbability(pmf, 5)).toBeCloseTo(1 / 6, 12);
+        expect(getProbability(pmf, 6)).toBe(0);
+        expect(getProbability(pmf, 12)).toBeCloseTo(1 / 36, 12);
+    });
+
+    it('truncates compound explosions at the configured depth', () => {
+        const pmf = getRollDistribution({ numDice: 1, diceType: 6, exploding: true, explodingMode: 'compound', explosionDepth: 2 });
+
+        expect(pmf.probs).toHaveLength(18);
+        expect(getProbability(pmf, 12)).toBe(0);
+        expect(getProbability(pmf, 18)).toBeCloseTo(1 / 216, 12);
+        expect(pmf.probs.reduce((a, b) => a + b, 0)).toBeCloseTo(1, 12);
+
+        const deep = getRollDistribution({ numDice: 1, diceType: 6, exploding: true, explodingMode: 'compound' });
+        expect(getDistributionStats(deep).mean).toBeCloseTo(4.2, 10);
+    });
+
+    it('sums custom faces', () => {
+        expect(faceDistribution([-1, 0, 1]).probs).toHaveLength(3);
+        const pmf = getFacesSumDistribution([-1, 0, 1], 2);
+        expect(pmf.min).toBe(-2);
+        expect(getProbability(pmf, 0)).toBeCloseTo(3 / 9, 12);
+    });
+
+    it('memoizes distributions by options', () => {
+        clearDistributionCache();
+        const first = getRollDistribution({ numDice: 10, diceType: 10, drop: true, dropCount: 5 });
+        const second = getRollDistribution({ dropCount: 5, drop: true, diceType: 10, numDice: 10 });
+
+        expect(second).toBe(first);
+    });
+
+    it('handles large pools quickly', () => {
+        const start = Date.now();
+        const pmf = getRollDistribution({ numDice: 30, diceType: 10, drop: true, dropCount: 15 });
+
+        expect(pmf.probs.reduce((a, b) => a + b, 0)).toBeCloseTo(1, 9);
+        expect(Date.now() - start).toBeLessThan(1000);
+    });
+
+    it('throws on invalid options', () => {
+        expect(() => getRollDistribution({ numDice: 0, diceType: 6 })).toThrow('Invalid number of dice');
+        expect(() => getRollDistribution({ numDice: 2, diceType: 6, drop: true, dropCount: 2 })).toThrow('Cannot drop');
+        expect(() => getRollDistribution({ numDice: 2, diceType: 6, countSuccesses: true, successComparison: '!' })).toThrow('Invalid comparison');
+    });
+});
+
+describe('rollBatch', () => {
+    it('is reproducible with a seeded rng', () => {
+        const spec = { numDice: 4, diceType: 6, drop: true, exploding: true };
+        const first = rollBatch({ ...spec, rng: createSeededRng(3) }, 1000);
+        const second = rollBatch({ ...spec, rng: createSeededRng(3) }, 1000);
+
+        expect(Array.from(second.totals)).toEqual(Array.from(first.totals));
+        expect(second.explosions).toBe(first.explosions);
+    });
+
+    it('returns one total per trial within range', () => {
+        const result = rollBatch({ numDice: 3, diceType: 6 }, 10000);
+
+        expect(result.totals).toBeInstanceOf(Int32Array);
+        expect(result.totals).toHaveLength(10000);
+        expect(result.successCounts).toBeNull();
+        expect(result.totals.every(total => total >= 3 && total <= 18)).toBe(true);
+        expect(result.stats.total.min).toBeGreaterThanOrEqual(3);
+        expect(result.stats.total.max).toBeLessThanOrEqual(18);
+    });
+
+    it('matches the exact distribution on average', () => {
+        const spec = { numDice: 4, diceType: 6, drop: true, dropCount: 1 };
+        const { stats } = rollBatch(spec, 200000);
+        const exact = getDistributionStats(getRollDistribution(spec));
+
+        expect(Math.abs(stats.total.mean - exact.mean)).toBeLessThan(0.05);
+        expect(Math.abs(stats.total.variance - exact.variance)).toBeLessThan(0.2);
+    });
+
+    it('drops the highest dice', () => {
+        const { totals } = rollBatch({ numDice: 2, diceType: 20, drop: true, dropType: 'highest' }, 5000);
+        const { stats } = rollBatch({ numDice: 1, diceType: 20 }, 5000);
+
+        expect(totals.every(total => total >= 1 && total <= 20)).toBe(true);
+        expect(totals.reduce((a, b) => a + b, 0) / totals.length).toBeLessThan(stats.total.mean);
+    });
+
+    it('counts successes on kept dice', () => {
+        const result = rollBatch({
+            numDice: 5, diceType: 10, countSuccesses: true, successThreshold: 8, drop: true, dropCount: 2
+        }, 10000);
+
+        expect(result.successCounts).toBeInstanceOf(Uint32Array);
+        expect(result.successCounts.every(count => count <= 3)).toBe(true);
+        expect(result.stats.successes.max).toBeLessThanOrEqual(3);
+    });
+
+    it('explodes once in standard mode', () => {
+        const result = rollBatch({ numDice: 1, diceType: 2, exploding: true }, 10000);
+
+        expect(result.totals.every(total => total >= 1 && total <= 4)).toBe(true);
+        expect(result.explosions).toBeGreaterThan(0);
+    });
+
+    it('keeps exploding in compound mode', () => {
+        const result = rollBatch({ numDice: 1, diceType: 2, exploding: true, explodingMode: 'compound' }, 10000);
+
+        expect(result.stats.total.max).toBeGreaterThan(4);
+        expect(result.totals.every(total => total % 2 === 1)).toBe(true);
+    });
+
+    it('fills caller-supplied buffers', () => {
+        const totals = new Int32Array(100);
+        const result = rollBatch({ numDice: 1, diceType: 6 }, 50, { totals });
+
+        expect(result.totals.buffer).toBe(totals.buffer);
+        expect(result.totals).toHaveLength(50);
+        expect(totals.subarray(50).every(value => value === 0)).toBe(true);
+    });
+
+    it('throws on invalid trials or spec', () => {
+        expect(() => rollBatch({ numDice: 1, diceType: 6 }, 0)).toThrow('Invalid number of trials');
+        expect(() => rollBatch({ numDice: 0, diceType: 6 }, 10)).toThrow('Invalid number of dice');
+        expect(() => rollBatch({ numDice: 1, diceType: 1, exploding: true }, 10)).toThrow('at least 2');
+    });
+});
+
+describe('compileDiceExpression', () => {
+    it('compiles dice with keep, explode and constant terms', () => {
+        const plan = compileDiceExpression('4d6kh3 + 2d8! + 5');
+
+        expect(plan.expression).toBe('4d6kh3+2d8!+5');
+        expect(plan.terms.map(term => term.type)).toEqual(['dice', 'dice', 'constant']);
+        expect(plan.terms[0].options).toMatchObject({ numDice: 4, diceType: 6, drop: true, dropType: 'lowest', dropCount: 1 });
+        expect(plan.terms[1].options).toMatchObject({ numDice: 2, diceType: 8, exploding: true, explodingMode: 'compound' });
+        expect(plan.terms[2].value).toBe(5);
+    });
+
+    it('compiles success counts, advantage and subtraction', () => {
+        expect(compileDiceExpression('10d10>=7').terms[0].options)
+            .toMatchObject({ countSuccesses: true, successThreshold: 7, successComparison: '>=' });
+
+        const plan = compileDiceExpression('adv(d20)+3-1d4');
+        expect(plan.terms[0]).toMatchObject({ type: 'advantage', mode: 'advantage', sign: 1 });
+        expect(plan.terms[2]).toMatchObject({ type: 'dice', sign: -1 });
+    });
+
+    it('returns the cached plan for a repeated expression', () => {
+        clearExpressionCache();
+        const first = compileDiceExpression('3d6+2');
+
+        expect(compileDiceExpression('3d6+2')).toBe(first);
+
+        clearExpressionCache();
+        expect(compileDiceExpression('3d6+2')).not.toBe(first);
+    });
+
+    it('throws for malformed or invalid expressions', () => {
+        expect(() => compileDiceExpression('')).toThrow('Invalid dice expression');
+        expect(() => compileDiceExpression('4d')).toThrow('number of sides');
+        expect(() => compileDiceExpression('2d6kh3')).toThrow('cannot keep 3 of 2 dice');
+        expect(() => compileDiceExpression('adv(d20')).toThrow("expected ')'");
+        expect(() => compileDiceExpression('2x6')).toThrow('unexpected input');
+        expect(() => compileDiceExpression('d1!')).toThrow('at least 2');
+    });
+
+    it('rejects expressions beyond the dice and sides limits', () => {
+        expect(() => compileDiceExpression('99999999999d6')).toThrow('Invalid dice expression');
+        expect(() => compileDiceExpression('1001d6')).toThrow('Invalid dice expression');
+        expect(() => compileDiceExpression('d1000001')).toThrow('Invalid dice expression');
+        expect(() => rollExpression('1000d6+1000d1000000')).not.toThrow();
+
+        const manyTerms = Array(11).fill('1000d6').join('+');
+        expect(() => compileDiceExpression(manyTerms)).toThrow('dice in total');
+        expect(() => compileDiceExpression('adv(' + Array(6).fill('1000d6').join('+') + ')'))
+            .toThrow('dice in total');
+        expect(() => compileDiceExpression('adv('.repeat(20) + '1' + ')'.repeat(20)))
+            .toThrow('nested too deeply');
+    });
+});
+
+describe('rollExpression', () => {
+    it('adds signed terms', () => {
+        const rng = createSeededRng('expression');
+        for (let i = 0; i < 200; i++) {
+            const result = rollExpression('2d6-1d4+3', rng);
+            const [dice, minus, constant] = result.terms;
+
+            expect(result.total).toBe(dice.value - minus.value + constant.value);
+            expect(result.total).toBeGreaterThanOrEqual(1);
+            expect(result.total).toBeLessThanOrEqual(14);
+        }
+    });
+
+    it('uses the success count for success terms', () => {
+        const result = rollExpression('10d10>=7', createSeededRng(4));
+
+        expect(result.total).toBe(result.terms[0].result.successCount);
+        expect(result.total).toBe(result.terms[0].result.rolls.filter(roll => roll.value >= 7).length);
+    });
+
+    it('keeps the better inner roll for adv()', () => {
+        const result = rollExpression('adv(d20)+3', createSeededRng(9));
+        const { chosenRoll, otherRoll } = result.terms[0].result;
+
+        expect(chosenRoll.total).toBeGreaterThanOrEqual(otherRoll.total);
+        expect(result.total).toBe(chosenRoll.total + 3);
+    });
+
+    it('is reproducible with a seeded rng', () => {
+        expect(rollExpression('4d6kh3+2d8!', createSeededRng(1)))
+            .toEqual(rollExpression('4d6kh3+2d8!', createSeededRng(1)));
+    });
+});
+
+describe('getExpressionDistribution', () => {
+    it('shifts and negates term distributions', () => {
+        const pmf = getExpressionDistribution('2d6+1');
+        expect(getProbability(pmf, 13)).toBeCloseTo(1 / 36, 12);
+
+        const negative = getExpressionDistribution('-d4');
+        expect(negative.min).toBe(-4);
+        expect(getProbability(negative, -1)).toBeCloseTo(0.25, 12);
+    });
+
+    it('matches getRollDistribution for a single dice term', () => {
+        const pmf = getExpressionDistribution('4d6kh3');
+        const direct = getRollDistribution({ numDice: 4, diceType: 6, drop: true, dropCount: 1 });
+
+        expect(getProbability(pmf, 18)).toBeCloseTo(getProbability(direct, 18), 12);
+        expect(getDistributionStats(pmf).mean).toBeCloseTo(getDistributionStats(direct).mean, 12);
+    });
+
+    it('handles advantage', () => {
+        const pmf = getExpressionDistribution('adv(d20)+3');
+
+        expect(getProbability(pmf, 23)).toBeCloseTo(39 / 400, 12);
+    });
+
+    it('rejects expressions with too many terms', () => {
+        const expression = Array(101).fill('d6').join('+');
+
+        expect(() => rollExpression(expression)).not.toThrow();
+        expect(() => getExpressionDistribution(expression)).toThrow('Invalid dice expression');
+        expect(() => rollExpressionBatch('99999999999d6', 10)).toThrow('Invalid dice expression');
+    });
+});
+
+describe('rollExpressionBatch', () => {
+    it('agrees with the exact distribution', () => {
+        const expression = 'adv(d20)+2d6-1d4';
+        const { totals, stats } = rollExpressionBatch(expression, 100000);
+        const exact = getDistributionStats(getExpressionDistribution(expression));
+
+        expect(totals).toHaveLength(100000);
+        expect(Math.abs(stats.total.mean - exact.mean)).toBeLessThan(0.1);
+        expect(stats.total.min).toBeGreaterThanOrEqual(exact.min);
+        expect(stats.total.max).toBeLessThanOrEqual(exact.max);
+    });
+
+    it('is reproducible with a seeded rng', () => {
+        const first = rollExpressionBatch('3d6>=5+1', 500, { rng: createSeededRng(2) });
+        const second = rollExpressionBatch('3d6>=5+1', 500, { rng: createSeededRng(2) });
+
+        expect(Array.from(second.totals)).toEqual(Array.from(first.totals));
+    });
+
+    it('throws on invalid trials', () => {
+        expect(() => rollExpressionBatch('d6', 0)).toThrow('Invalid number of trials');
+    });
+});
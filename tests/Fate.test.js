@@ -14,6 +14,7 @@ import {
     interpretFateRoll,
     getFateProbabilities
 } from '../Fate.js';
+import { createSeededRng } from '../Random.js';
 
 describe('rollFateDie', () => {
     it('returns an object with value and symbol', () => {
@@ -56,6 +57,13 @@ describe('rollFateDie', () => {
 });
 
 describe('rollFateDice', () => {
+    it('uses the rng argument', () => {
+        const first = rollFateDice(8, createSeededRng(21));
+        const second = rollFateDice(8, createSeededRng(21));
+
+        expect(second.symbols).toBe(first.symbols);
+    });
+
     it('rolls 4 dice by default', () => {
         const result = rollFateDice();
 
@@ -213,7 +221,24 @@ describe('getFateProbabilities', () => {
         expect(probs['0']).toBeGreaterThan(probs['-1']);
     });
 
-    it('throws error for unsupported dice count', () => {
-        expect(() => getFateProbabilities(5)).toThrow('only implemented for 4dF');
+    it('is exact for 4dF', () => {
+        const probs = getFateProbabilities(4);
+
+        expect(probs['+4']).toBeCloseTo(1 / 81, 12);
+        expect(probs['0']).toBeCloseTo(19 / 81, 12);
+    });
+
+    it('supports any number of dice', () => {
+        const probs = getFateProbabilities(5);
+        const sum = Object.values(probs).reduce((a, b) => a + b, 0);
+
+        expect(Object.keys(probs)).toHaveLength(11);
+        expect(probs['+5']).toBeCloseTo(1 / 243, 12);
+        expect(sum).toBeCloseTo(1.0, 12);
+    });
+
+    it('throws error for invalid dice count', () => {
+        expect(() => getFateProbabilities(0)).toThrow('Invalid number of dice');
+        expect(() => getFateProbabilities(1.5)).toThrow('Invalid number of dice');
     });
 });
@@ -13,7 +13,12 @@ import {
     clearHistory,
     getHistoryCount,
     removeHistoryEntry,
-    getHistoryEntries
+    getHistoryEntries,
+    createHistoryStore,
+    createHistoryView,
+    renderHistoryEntry,
+    exportHistory,
+    persistHistory
 } from '../HistoryLog.js';
 
 describe('createHistoryEntry', () => {
@@ -271,3 +276,219 @@ describe('getHistoryEntries', () => {
         expect(entries).toEqual([]);
     });
 });
+
+describe('createHistoryStore', () => {
+    it('keeps entries most recent first with increasing ids', () => {
+        const store = createHistoryStore(10);
+        store.add({ text: 'first' });
+        const second = store.add({ text: 'second', data: { total: 7 } });
+
+        expect(store.size).toBe(2);
+        expect(store.get(0)).toBe(second);
+        expect(second).toMatchObject({ id: 2, text: 'second', html: null, className: 'history-entry', data: { total: 7 } });
+        expect(store.toArray().map(entry => entry.text)).toEqual(['second', 'first']);
+        expect(store.get(2)).toBeNull();
+    });
+
+    it('drops the oldest entries past capacity', () => {
+        const store = createHistoryStore(3);
+        const evicted = [];
+        store.subscribe(change => evicted.push(change.evicted && change.evicted.text));
+
+        for (let i = 1; i <= 5; i++) {
+            store.add({ text: `Entry ${i}` });
+        }
+
+        expect(store.size).toBe(3);
+        expect(store.toArray().map(entry => entry.text)).toEqual(['Entry 5', 'Entry 4', 'Entry 3']);
+        expect(evicted).toEqual([null, null, null, 'Entry 1', 'Entry 2']);
+    });
+
+    it('clears without reusing ids', () => {
+        const store = createHistoryStore(3);
+        store.add({ text: 'a' });
+        store.clear();
+
+        expect(store.size).toBe(0);
+        expect(store.add({ text: 'b' }).id).toBe(2);
+    });
+
+    it('restores older entries beneath current ones', () => {
+        const store = createHistoryStore(4);
+        store.add({ text: 'new' });
+
+        const renumbered = store.restore([
+            { id: 8, time: 1, text: 'old 1' },
+            { id: 9, time: 2, text: 'old 2' }
+        ]);
+
+        expect(store.toArray().map(entry => [entry.id, entry.text])).toEqual([[10, 'new'], [9, 'old 2'], [8, 'old 1']]);
+        expect(renumbered.map(entry => entry.id)).toEqual([10]);
+        expect(store.add({ text: 'next' }).id).toBe(11);
+    });
+
+    it('stops notifying after unsubscribe', () => {
+        const store = createHistoryStore();
+        let calls = 0;
+        const unsubscribe = store.subscribe(() => calls++);
+
+        store.add({ text: 'a' });
+        unsubscribe();
+        store.add({ text: 'b' });
+
+        expect(calls).toBe(1);
+    });
+
+    it('throws error for invalid capacity', () => {
+        expect(() => createHistoryStore(0)).toThrow('Invalid capacity');
+        expect(() => createHistoryStore(2.5)).toThrow('Invalid capacity');
+    });
+});
+
+describe('createHistoryView', () => {
+    function createContainer(height) {
+        const container = document.createElement('div');
+        Object.defineProperty(container, 'clientHeight', { value: height });
+        return container;
+    }
+
+    it('renders only the visible rows', () => {
+        const store = createHistoryStore(1000);
+        for (let i = 0; i < 1000; i++) {
+            store.add({ text: `Roll ${i}` });
+        }
+        const container = createContainer(200);
+        const view = createHistoryView(container, store, { rowHeight: 40, overscan: 2 });
+        view.flush();
+
+        const spacer = container.firstChild;
+        expect(spacer.style.height).toBe('40000px');
+        expect(spacer.children.length).toBe(7); // 5 visible + 2 overscan below (none above at the top)
+        expect(spacer.children[0].textContent).toBe('Roll 999');
+
+        view.destroy();
+    });
+
+    it('follows scrolling', () => {
+        const store = createHistoryStore(100);
+        for (let i = 0; i < 100; i++) {
+            store.add({ text: `Roll ${i}` });
+        }
+        const container = createContainer(200);
+        const view = createHistoryView(container, store, { rowHeight: 40, overscan: 0 });
+
+        container.scrollTop = 400;
+        view.flush();
+
+        const texts = Array.from(container.firstChild.children, row => row.textContent);
+        expect(texts).toEqual(['Roll 89', 'Roll 88', 'Roll 87', 'Roll 86', 'Roll 85']);
+        expect(container.firstChild.children[0].style.transform).toBe('translateY(400px)');
+
+        view.destroy();
+    });
+
+    it('batches adds and keeps the scrolled position', () => {
+        const store = createHistoryStore(100);
+        store.add({ text: 'first' });
+        const container = createContainer(200);
+        const view = createHistoryView(container, store, { rowHeight: 40, animate: true });
+        view.flush();
+        container.scrollTop = 40;
+
+        store.add({ text: 'second' });
+        store.add({ text: 'third' });
+        expect(container.firstChild.children.length).toBe(1); // Not rendered until the next frame
+
+        view.flush();
+        expect(container.scrollTop).toBe(120);
+        expect(container.firstChild.children.length).toBe(3);
+        expect(Array.from(container.firstChild.children).some(row => row.classList.contains('history-entry-new'))).toBe(true);
+
+        view.destroy();
+    });
+
+    it('positions rows by their measured heights', () => {
+        const store = createHistoryStore(10);
+        store.add({ text: 'short' });
+        store.add({ text: 'a long roll that wraps onto three lines' });
+        store.add({ text: 'short' });
+        const container = createContainer(400);
+        const renderEntry = entry => {
+            const element = renderHistoryEntry(entry);
+            Object.defineProperty(element, 'offsetHeight', { value: entry.text.length > 10 ? 100 : 40 });
+            return element;
+        };
+        const view = createHistoryView(container, store, { rowHeight: 40, renderEntry });
+        view.flush();
+
+        const transforms = Array.from(container.firstChild.children, row => row.style.transform);
+        expect(transforms).toEqual(['translateY(0px)', 'translateY(40px)', 'translateY(140px)']);
+        expect(container.firstChild.style.height).toBe('180px');
+
+        view.destroy();
+    });
+
+    it('empties when the store is cleared', () => {
+        const store = createHistoryStore(10);
+        store.add({ text: 'a' });
+        const container = createContainer(200);
+        const view = createHistoryView(container, store, { rowHeight: 40 });
+        view.flush();
+
+        store.clear();
+        view.flush();
+
+        expect(container.firstChild.children.length).toBe(0);
+        expect(container.firstChild.style.height).toBe('0px');
+
+        view.destroy();
+        expect(container.children.length).toBe(0);
+    });
+});
+
+describe('renderHistoryEntry', () => {
+    it('uses html when present, text otherwise', () => {
+        const store = createHistoryStore();
+        const text = renderHistoryEntry(store.add({ text: 'plain' }));
+        const html = renderHistoryEntry(store.add({ text: 'Hand 1', html: '<b>Hand 1</b>', className: 'history-hand' }));
+
+        expect(text.textContent).toBe('plain');
+        expect(html.title).toBe('Hand 1');
+        expect(html.innerHTML).toBe('<b>Hand 1</b>');
+        expect(html.className).toBe('history-hand');
+    });
+});
+
+describe('exportHistory', () => {
+    it('exports oldest first as JSON or text', () => {
+        const store = createHistoryStore();
+        store.add({ text: 'first', time: 0 });
+        store.add({ text: 'second', time: 1000 });
+
+        const json = JSON.parse(exportHistory(store));
+        expect(json.version).toBe(1);
+        expect(json.entries.map(entry => entry.text)).toEqual(['first', 'second']);
+
+        expect(exportHistory(store, 'text')).toBe(
+            '1970-01-01T00:00:00.000Z  first\n1970-01-01T00:00:01.000Z  second'
+        );
+    });
+
+    it('throws error for unknown formats', () => {
+        expect(() => exportHistory(createHistoryStore(), 'csv')).toThrow('Invalid format');
+    });
+});
+
+describe('persistHistory', () => {
+    it('resolves to null without IndexedDB', async () => {
+        const original = Object.getOwnPropertyDescriptor(globalThis, 'indexedDB');
+        delete globalThis.indexedDB;
+
+        expect(persistHistory.available()).toBe(false);
+        expect(await persistHistory(createHistoryStore())).toBeNull();
+
+        if (original) {
+            Object.defineProperty(globalThis, 'indexedDB', original);
+        }
+    });
+});
@@ -0,0 +1,144 @@
+/**
+ * Tests for Random.js - Pluggable random number generators
+ *
+ * Run with: npm test
+ */
+
+import { describe, it, expect, vi } from 'vitest';
+import {
+    RANDOM_BLOCK_SIZE,
+    mathRandomRng,
+    createSeededRng,
+    createCryptoRng,
+    getDefaultRng,
+    setDefaultRng
+} from '../Random.js';
+import { rollDice, rollSingleDie } from '../DiceLibrary.js';
+
+describe('createSeededRng', () => {
+    it('matches the xoshiro128** reference output', () => {
+        const rng = createSeededRng(0);
+        rng.setState([1, 2, 3, 4]);
+
+        const words = Array.from({ length: 6 }, () => rng.nextUint32());
+
+        expect(words).toEqual([11520, 0, 5927040, 70819200, 2031721883, 1637235492]);
+    });
+
+    it('produces the same sequence for the same seed', () => {
+        const a = createSeededRng('session-42');
+        const b = createSeededRng('session-42');
+        const c = createSeededRng('session-43');
+
+        const seqA = Array.from({ length: 20 }, () => a.nextInt(100));
+        const seqB = Array.from({ length: 20 }, () => b.nextInt(100));
+        const seqC = Array.from({ length: 20 }, () => c.nextInt(100));
+
+        expect(seqA).toEqual(seqB);
+        expect(seqA).not.toEqual(seqC);
+        expect(a.seed).toBe('session-42');
+    });
+
+    it('resumes from a saved state', () => {
+        const rng = createSeededRng(7);
+        rng.nextUint32();
+        const state = rng.getState();
+        const expected = [rng.nextUint32(), rng.nextUint32()];
+
+        rng.setState(state);
+
+        expect([rng.nextUint32(), rng.nextUint32()]).toEqual(expected);
+    });
+
+    it('rejects invalid seeds and states', () => {
+        expect(() => createSeededRng({})).toThrow('Invalid seed');
+        expect(() => createSeededRng(1).setState([0, 0, 0, 0])).toThrow('Invalid state');
+    });
+});
+
+describe('rng methods', () => {
+    it('keeps nextInt() in range and roughly uniform', () => {
+        const rng = createSeededRng(123);
+        const counts = new Array(6).fill(0);
+
+        for (let i = 0; i < 60000; i++) {
+            counts[rng.nextInt(6)]++;
+        }
+
+        for (const count of counts) {
+            expect(count).toBeGreaterThan(9500);
+            expect(count).toBeLessThan(10500);
+        }
+    });
+
+    it('handles bounds above 2^21 and up to 2^32', () => {
+        const rng = createSeededRng(5);
+
+        for (let i = 0; i < 1000; i++) {
+            const value = rng.nextInt(3000000000);
+            expect(value).toBeGreaterThanOrEqual(0);
+            expect(value).toBeLessThan(3000000000);
+        }
+        expect(rng.nextInt(1)).toBe(0);
+        expect(Number.isInteger(rng.nextInt(2 ** 32))).toBe(true);
+    });
+
+    it('rejects invalid bounds', () => {
+        const rng = createSeededRng(5);
+
+        expect(() => rng.nextInt(0)).toThrow('Invalid bound');
+        expect(() => rng.nextInt(2.5)).toThrow('Invalid bound');
+    });
+
+    it('returns floats in [0, 1)', () => {
+        const rng = createSeededRng(9);
+
+        for (let i = 0; i < 1000; i++) {
+            const value = rng.nextFloat();
+            expect(value).toBeGreaterThanOrEqual(0);
+            expect(value).toBeLessThan(1);
+        }
+    });
+
+    it('fill() continues the same word stream', () => {
+        const a = createSeededRng(11);
+        const b = createSeededRng(11);
+
+        const block = a.fill(new Uint32Array(8));
+
+        expect(Array.from(block)).toEqual(Array.from({ length: 8 }, () => b.nextUint32()));
+    });
+
+    it('crypto rng fills arrays larger than one block', () => {
+        const rng = createCryptoRng();
+        const words = rng.fill(new Uint32Array(RANDOM_BLOCK_SIZE * 2 + 5));
+
+        expect(words[RANDOM_BLOCK_SIZE * 2 + 4]).not.toBeUndefined();
+        expect(rng.nextInt(6)).toBeLessThan(6);
+    });
+});
+
+describe('default rng', () => {
+    it('is Math.random() with the legacy scaling', () => {
+        const mockRandom = vi.spyOn(Math, 'random');
+        mockRandom.mockReturnValue(0.5);
+
+        expect(getDefaultRng()).toBe(mathRandomRng);
+        expect(mathRandomRng.nextInt(6)).toBe(3);
+        expect(rollSingleDie(6)).toBe(4);
+
+        mockRandom.mockRestore();
+    });
+
+    it('can be replaced to replay a whole session', () => {
+        setDefaultRng(createSeededRng('replay'));
+        const first = rollDice(5, 20).rolls;
+
+        setDefaultRng(createSeededRng('replay'));
+        const second = rollDice(5, 20).rolls;
+
+        expect(second).toEqual(first);
+        expect(setDefaultRng(null)).not.toBe(mathRandomRng);
+        expect(getDefaultRng()).toBe(mathRandomRng);
+    });
+});
@@ -0,0 +1,167 @@
+/**
+ * Tests for Simulation.js - Monte Carlo simulation on a worker pool
+ *
+ * Run with: npm test
+ */
+
+import { describe, it, expect } from 'vitest';
+import {
+    simulateChunk,
+    runSimulation,
+    createSimulationPool,
+    validateSimulationTask,
+    BLADES_CRITICAL_VALUE
+} from '../Simulation.js';
+import { getExpressionDistribution, getDistributionStats } from '../DiceLibrary.js';
+import { createSeededRng } from '../Random.js';
+
+const sumCounts = histogram => histogram.counts.reduce((sum, count) => sum + count, 0);
+
+describe('validateSimulationTask', () => {
+    it('accepts the three task types', () => {
+        expect(() => validateSimulationTask({ type: 'roll', options: { numDice: 3, diceType: 6 } })).not.toThrow();
+        expect(() => validateSimulationTask({ type: 'expression', expression: 'adv(d20)+3' })).not.toThrow();
+        expect(() => validateSimulationTask({ type: 'blades', numDice: 0 })).not.toThrow();
+    });
+
+    it('rejects unknown or invalid tasks', () => {
+        expect(() => validateSimulationTask({ type: 'tarot' })).toThrow('Invalid task type');
+        expect(() => validateSimulationTask({ type: 'roll', options: { numDice: 0, diceType: 6 } })).toThrow('Invalid number of dice');
+        expect(() => validateSimulationTask({ type: 'blades', numDice: -1 })).toThrow('non-negative');
+    });
+
+    it('rejects an rng, which cannot be sent to a worker', () => {
+        const task = { type: 'roll', options: { numDice: 3, diceType: 6, rng: createSeededRng(1) } };
+
+        expect(() => validateSimulationTask(task)).toThrow('Pass options.seed');
+    });
+});
+
+describe('simulateChunk', () => {
+    it('returns a histogram covering every trial', () => {
+        const chunk = simulateChunk({ type: 'roll', options: { numDice: 3, diceType: 6 } }, 10000);
+
+        expect(chunk.trials).toBe(10000);
+        expect(chunk.min).toBeGreaterThanOrEqual(3);
+        expect(chunk.min + chunk.counts.length - 1).toBeLessThanOrEqual(18);
+        expect(sumCounts(chunk)).toBe(10000);
+    });
+
+    it('counts successes when the roll counts them', () => {
+        const chunk = simulateChunk({
+            type: 'roll',
+            options: { numDice: 5, diceType: 10, countSuccesses: true, successThreshold: 8 }
+        }, 1000);
+
+        expect(chunk.min).toBeGreaterThanOrEqual(0);
+        expect(chunk.min + chunk.counts.length - 1).toBeLessThanOrEqual(5);
+    });
+
+    it('is reproducible with a seed', () => {
+        const task = { type: 'expression', expression: '4d6kh3+2' };
+
+        expect(Array.from(simulateChunk(task, 2000, 'seed').counts))
+            .toEqual(Array.from(simulateChunk(task, 2000, 'seed').counts));
+    });
+
+    it('scores Blades criticals separately', () => {
+        const chunk = simulateChunk({ type: 'blades', numDice: 3 }, 20000, 3);
+        const criticals = chunk.counts[BLADES_CRITICAL_VALUE - chunk.min];
+
+        // P(two or more sixes in 3d6) = 16/216
+        expect(criticals / 20000).toBeGreaterThan(0.06);
+        expect(criticals / 20000).toBeLessThan(0.09);
+    });
+});
+
+describe('runSimulation', () => {
+    it('merges chunks from several workers and reports progress', async () => {
+        const progress = [];
+        const result = await runSimulation(
+            { type: 'expression', expression: '4d6kh3' },
+            400000,
+            { workers: 2, chunkSize: 100000, onProgress: summary => progress.push(summary.completed) }
+        );
+        const exact = getDistributionStats(getExpressionDistribution('4d6kh3'));
+
+        expect(result.completed).toBe(400000);
+        expect(sumCounts(result.histogram)).toBe(400000);
+        expect(progress).toEqual([100000, 200000, 300000, 400000]);
+        expect(Math.abs(result.mean - exact.mean)).toBeLessThan(0.02);
+        expect(Math.abs(result.variance - exact.variance)).toBeLessThan(0.1);
+    });
+
+    it('gives the same histogram for the same seed on any pool size', async () => {
+        const task = { type: 'blades', numDice: 2 };
+        const options = { seed: 'house-rule', chunkSize: 5000 };
+
+        const one = await runSimulation(task, 20000, { ...options, workers: 1 });
+        const three = await runSimulation(task, 20000, { ...options, workers: 3 });
+
+        expect(Array.from(three.histogram.counts)).toEqual(Array.from(one.histogram.counts));
+    });
+
+    it('stops when cancelled', async () => {
+        const controller = new AbortController();
+        const run = runSimulation({ type: 'roll', options: { numDice: 10, diceType: 10 } }, 1e9, {
+            workers: 2,
+            chunkSize: 10000,
+            signal: controller.signal,
+            onProgress: summary => {
+                if (summary.completed >= 20000) controller.abort();
+            }
+        });
+
+        await expect(run).rejects.toThrow();
+        expect(controller.signal.aborted).toBe(true);
+    });
+
+    it('stops when cancelled right after starting', async () => {
+        const controller = new AbortController();
+        const run = runSimulation({ type: 'roll', options: { numDice: 3, diceType: 6 } }, 4000000, {
+            workers: 2,
+            signal: controller.signal
+        });
+        controller.abort();
+
+        await expect(run).rejects.toThrow();
+    });
+
+    it('rejects invalid tasks before starting workers', async () => {
+        await expect(runSimulation({ type: 'roll', options: { numDice: 0, diceType: 6 } }, 10))
+            .rejects.toThrow('Invalid number of dice');
+    });
+});
+
+describe('createSimulationPool', () => {
+    it('reuses its workers across runs', async () => {
+        const pool = createSimulationPool(2);
+        try {
+            const first = await pool.run({ type: 'roll', options: { numDice: 1, diceType: 6 } }, 1000);
+            const second = await pool.run({ type: 'roll', options: { numDice: 1, diceType: 6 } }, 1000);
+
+            expect(first.completed).toBe(1000);
+            expect(second.completed).toBe(1000);
+        } finally {
+            pool.terminate();
+        }
+    });
+
+    it('stays usable after a task fails to reach the workers', async () => {
+        const pool = createSimulationPool(1);
+        try {
+            const uncloneable = { type: 'expression', expression: '1d6', label: () => 'd6' };
+
+            await expect(pool.run(uncloneable, 1000)).rejects.toThrow();
+            const result = await pool.run({ type: 'expression', expression: '1d6' }, 1000);
+
+            expect(result.completed).toBe(1000);
+        } finally {
+            pool.terminate();
+        }
+    });
+
+    it('rejects an invalid size', () => {
+        expect(() => createSimulationPool(0)).toThrow('Invalid pool size');
+    });
+});
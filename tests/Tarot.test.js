@@ -9,12 +9,20 @@ import {
     majorArcana,
     minorArcana,
     createTarotDeck,
+    getTarotCardTable,
+    createIndexedTarotDeck,
+    drawIndexedTarotCard,
     drawTarotCard,
     performThreeCardSpread,
     formatTarotCard,
     getCardImagePath,
+    getCardImageSources,
+    getCardSpriteStyle,
+    setCardImageManifest,
+    loadCardImageManifest,
     getCardMeaning
 } from '../Tarot.js';
+import { createSeededRng } from '../Random.js';
 
 describe('majorArcana', () => {
     it('has 22 cards', () => {
@@ -173,7 +181,38 @@ describe('drawTarotCard', () => {
     });
 });
 
+describe('indexed tarot decks', () => {
+    it('share one frozen card table per deck type', () => {
+        expect(getTarotCardTable('both')).toHaveLength(78);
+        expect(getTarotCardTable('both')).toBe(getTarotCardTable('both'));
+        expect(Object.isFrozen(getTarotCardTable('minor'))).toBe(true);
+        expect(getTarotCardTable('unknown')).toBe(getTarotCardTable('major'));
+    });
+
+    it('draws copies with orientation', () => {
+        const deck = createIndexedTarotDeck('major', false);
+        const card = drawIndexedTarotCard(deck);
+
+        expect(card).toMatchObject({ name: majorArcana[0].name, isReversed: false });
+        expect(card).not.toBe(majorArcana[0]);
+    });
+
+    it('returns null when empty', () => {
+        const deck = createIndexedTarotDeck('major');
+        deck.cursor = deck.order.length;
+
+        expect(drawIndexedTarotCard(deck)).toBeNull();
+    });
+});
+
 describe('performThreeCardSpread', () => {
+    it('replays the same spread for the same seeded rng', () => {
+        const first = performThreeCardSpread('both', true, createSeededRng(78));
+        const second = performThreeCardSpread('both', true, createSeededRng(78));
+
+        expect(second).toEqual(first);
+    });
+
     it('returns three cards', () => {
         const spread = performThreeCardSpread('major', false);
 
@@ -275,6 +314,91 @@ describe('getCardImagePath', () => {
     });
 });
 
+describe('card image manifest', () => {
+    const fool = { number: 0, name: 'The Fool', type: 'major' };
+    const aceWands = { rank: 'Ace', suit: 'Wands', type: 'minor' };
+    const manifest = {
+        version: 1,
+        formats: ['avif', 'webp'],
+        widths: [120, 180, 240, 300],
+        cards: { '00-TheFool': [300, 527], 'Wands01': [300, 527] },
+        sprite: {
+            src: 'img/Tarot/sprite-60.webp',
+            cellWidth: 60,
+            cellHeight: 105,
+            columns: 13,
+            width: 780,
+            height: 630,
+            cards: ['00-TheFool', 'Wands01']
+        }
+    };
+
+    it('picks the smallest variant covering the display width', () => {
+        setCardImageManifest(manifest);
+
+        expect(getCardImagePath(fool, 150)).toBe('img/Tarot/w180/00-TheFool.webp');
+        expect(getCardImagePath(fool, 500, 'avif')).toBe('img/Tarot/w300/00-TheFool.avif');
+        expect(getCardImagePath(fool)).toBe('img/Tarot/00-TheFool.png');
+
+        setCardImageManifest(null);
+    });
+
+    it('falls back to the PNG without a manifest or for unknown cards', () => {
+        expect(getCardImagePath(fool, 150)).toBe('img/Tarot/00-TheFool.png');
+
+        setCardImageManifest({ ...manifest, cards: {} });
+        expect(getCardImagePath(fool, 150)).toBe('img/Tarot/00-TheFool.png');
+        expect(getCardImageSources(fool, 150).sources).toEqual([]);
+
+        setCardImageManifest(null);
+    });
+
+    it('lists every width per format for <picture> sources', () => {
+        setCardImageManifest(manifest);
+        const image = getCardImageSources(fool, 150);
+
+        expect(image.src).toBe('img/Tarot/w180/00-TheFool.webp');
+        expect(image.sizes).toBe('150px');
+        expect([image.width, image.height]).toEqual([300, 527]);
+        expect(image.sources.map(source => source.type)).toEqual(['image/avif', 'image/webp']);
+        expect(image.sources[0].srcset).toBe(
+            'img/Tarot/w120/00-TheFool.avif 120w, img/Tarot/w180/00-TheFool.avif 180w, ' +
+            'img/Tarot/w240/00-TheFool.avif 240w, img/Tarot/w300/00-TheFool.avif 300w'
+        );
+
+        setCardImageManifest(null);
+    });
+
+    it('positions sprite thumbnails in percentages of the image box', () => {
+        expect(getCardSpriteStyle(aceWands)).toBeNull();
+
+        setCardImageManifest(manifest);
+        const fool = getCardSpriteStyle({ number: 0, name: 'The Fool', type: 'major' });
+        const style = getCardSpriteStyle(aceWands);
+
+        expect(style.backgroundImage).toBe('url(img/Tarot/sprite-60.webp)');
+        expect(fool.backgroundPosition).toBe('0% 0%');
+        expect(style.backgroundPosition).toBe(`${100 / 12}% 0%`);
+        expect(style.backgroundSize).toBe('1300% 600%');
+
+        setCardImageManifest(null);
+    });
+
+    it('rejects unknown manifest versions', () => {
+        expect(() => setCardImageManifest({ version: 2 })).toThrow('Invalid card image manifest version');
+    });
+
+    it('treats a missing manifest as no manifest', async () => {
+        const mockFetch = vi.spyOn(globalThis, 'fetch');
+        mockFetch.mockImplementation(async () => ({ ok: false }));
+
+        expect(await loadCardImageManifest()).toBeNull();
+        expect(getCardImagePath(fool, 150)).toBe('img/Tarot/00-TheFool.png');
+
+        mockFetch.mockRestore();
+    });
+});
+
 describe('getCardMeaning', () => {
     it('returns upright meaning for upright card', () => {
         const card = {
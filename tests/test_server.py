@@ -0,0 +1,30 @@
+import os
+import socket
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server  # noqa: E402
+
+
+class PooledHTTPServerTest(unittest.TestCase):
+    def test_binding_an_occupied_port_raises_oserror(self):
+        with socket.socket() as taken:
+            taken.bind(('127.0.0.1', 0))
+            taken.listen()
+            address = taken.getsockname()
+
+            with self.assertRaises(OSError):
+                server.PooledHTTPServer(address, server.DiceRequestHandler, quiet=True)
+
+    def test_server_close_releases_the_pool(self):
+        httpd = server.PooledHTTPServer(('127.0.0.1', 0), server.DiceRequestHandler, quiet=True)
+        httpd.server_close()
+
+        with self.assertRaises(RuntimeError):
+            httpd._pool.submit(print)
+
+
+if __name__ == '__main__':
+    unittest.main()